@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the MCP tools, using the offline stand-in providers.
+
+For every store size, a fresh store in a temporary directory is seeded with
+synthetic memories, then `remember`, `recall`, `recall_all` and `forget` are
+called through main.py and their p50/p95/p99 latency and throughput recorded.
+No network access or API key is needed; the stand-ins' artificial latency can
+be set to approximate the real providers.
+
+Run from the repository root:
+    uv run python benchmarks/latency.py --sizes 1000,10000,100000 --output latency.json
+
+Each size runs in its own process so stores and caches never leak between sizes.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Small vocabulary so hashed embeddings overlap like real text does
+WORDS = (
+    "python react docker pytest config cache index query vector memory agent error fix build "
+    "deploy async thread pool lock schema migration endpoint token retry timeout module import "
+    "function class test logging metrics latency batch stream queue worker client server"
+).split()
+SEED_BATCH = 5000  # below Chroma's maximum batch size
+
+
+def synthetic_text(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + f" #{rng.randrange(10**9)}"
+
+
+def percentiles(samples: list) -> dict:
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50) * 1000,
+        "p95_ms": pick(0.95) * 1000,
+        "p99_ms": pick(0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def seed_store(main, namespace, size: int, rng: random.Random) -> list:
+    """Insert `size` memories directly into Chroma (much faster than remember)"""
+    from ingest import insert_memories
+
+    client = namespace.client()
+    ids = []
+    for start in range(0, size, SEED_BATCH):
+        texts = [synthetic_text(rng) for _ in range(min(SEED_BATCH, size - start))]
+        vectors = [client.embedding_model.embed(text) for text in texts]
+        ids.extend(insert_memories(client, texts, vectors, namespace.user_id))
+    main.record_write(namespace)
+    return ids
+
+
+def warm_indexes(main, namespace):
+    """Build the in-memory indexes now, so the first timed call does not pay for it"""
+    if namespace.lexical_index is not None:
+        main.lexical_search(namespace, "warmup")
+    main.find_duplicate(namespace, "warmup")
+
+
+async def timed_calls(make_call, count: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await make_call(i)
+            latencies.append(time.perf_counter() - started)
+            if isinstance(result, str) and result.startswith("Error"):
+                raise RuntimeError(result)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    wall = time.perf_counter() - started
+    stats = percentiles(latencies)
+    stats["throughput_ops_per_s"] = count / wall if wall else 0.0
+    return stats
+
+
+async def run_size(size: int, ops: int, concurrency: int, seed: int) -> dict:
+    import main
+
+    rng = random.Random(seed)
+    namespace = main.get_namespace()
+    seed_started = time.perf_counter()
+    ids = seed_store(main, namespace, size, rng)
+    result = {"size": size, "seed_seconds": time.perf_counter() - seed_started}
+    index_started = time.perf_counter()
+    warm_indexes(main, namespace)
+    result["index_seconds"] = time.perf_counter() - index_started
+
+    queries = [" ".join(rng.sample(WORDS, 3)) + f" {i}" for i in range(ops)]
+    forget_ids = rng.sample(ids, min(ops, len(ids)))
+
+    result["remember"] = await timed_calls(lambda i: main.remember(synthetic_text(rng)), ops, concurrency)
+    result["recall"] = await timed_calls(lambda i: main.recall(queries[i]), ops, concurrency)
+    result["recall_all"] = await timed_calls(lambda i: main.recall_all(limit=100), ops, concurrency)
+    result["forget"] = await timed_calls(lambda i: main.forget([forget_ids[i]]), len(forget_ids), concurrency)
+    return result
+
+
+def run_single(args) -> dict:
+    """Child process: configure main.py for an isolated offline store, then measure"""
+    workdir = tempfile.mkdtemp(prefix="mem0-bench-")
+    os.environ.update({
+        "MEM0_MCP_PROVIDERS": "standin",
+        "MEM0_MCP_STANDIN_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "MEM0_MCP_STANDIN_EMBED_LATENCY_MS": str(args.embed_latency_ms),
+        "MEM0_MCP_DB_PATH": os.path.join(workdir, "db"),
+        "MEM0_MCP_LOG_FILE": os.path.join(workdir, "gemini_log.jsonl"),
+        "MEM0_MCP_EMBED_CACHE": os.path.join(workdir, "embedding_cache.sqlite3"),
+        "MEM0_MCP_RECALL_CACHE_SIZE": "0" if not args.recall_cache else os.environ.get("MEM0_MCP_RECALL_CACHE_SIZE", "256"),
+        "MEM0_MCP_PREWARM": "0",
+        "MEM0_TELEMETRY": "False",
+    })
+    sys.argv = [sys.argv[0]]  # main.py inspects argv for --stdio
+    sys.path.insert(0, REPO_ROOT)
+    import main
+
+    main.LOCAL_HYBRID_CONFIG["history_db_path"] = os.path.join(workdir, "history.db")
+    return asyncio.run(run_size(args.single_size, args.ops, args.concurrency, args.seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP tool latency with offline providers")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated store sizes")
+    parser.add_argument("--ops", type=int, default=200, help="Calls per tool per size")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent calls per tool")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="Artificial stand-in LLM latency")
+    parser.add_argument("--embed-latency-ms", type=float, default=0, help="Artificial stand-in embedder latency")
+    parser.add_argument("--recall-cache", action="store_true", help="Keep the recall cache enabled")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for synthetic data")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--single-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single_size is not None:
+        # main.py prints its own progress to stdout, so results go through a file
+        result = run_single(args)
+        with open(args.result_file, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "config": {
+            "ops": args.ops,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "embed_latency_ms": args.embed_latency_ms,
+            "recall_cache": args.recall_cache,
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"[Bench] size={size} ...", file=sys.stderr)
+        result_file = os.path.join(tempfile.mkdtemp(prefix="mem0-bench-result-"), "result.json")
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--single-size", str(size), "--result-file", result_file,
+             "--ops", str(args.ops),
+             "--concurrency", str(args.concurrency), "--llm-latency-ms", str(args.llm_latency_ms),
+             "--embed-latency-ms", str(args.embed_latency_ms), "--seed", str(args.seed)]
+            + (["--recall-cache"] if args.recall_cache else []),
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if child.returncode != 0:
+            print(child.stderr, file=sys.stderr)
+            sys.exit(child.returncode)
+        with open(result_file, "r", encoding="utf-8") as f:
+            size_result = json.load(f)
+        results["sizes"][str(size)] = size_result
+        for tool in ("remember", "recall", "recall_all", "forget"):
+            r = size_result[tool]
+            print(f"[Bench]   {tool:<10} p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms "
+                  f"p99={r['p99_ms']:.2f}ms {r['throughput_ops_per_s']:.1f} ops/s", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
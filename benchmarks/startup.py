@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for `main.py --stdio`.
+
+Measures, over several fresh processes:
+- import_seconds: time to `import main` in stdio mode
+- initialize_seconds: time from process spawn to the JSON-RPC `initialize` response,
+  with the background pre-warm on (the default) and off
+
+Each process gets an empty store in a temporary directory and the offline stand-in
+providers, so timings do not depend on the local store or the network.
+
+Run from the repository root:
+    uv run python benchmarks/startup.py --runs 5 --output startup.json
+    uv run python benchmarks/startup.py --baseline startup.json   # fail on regressions
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import sys, time; sys.argv = ['main.py', '--stdio']; "
+    "started = time.perf_counter(); import main; "
+    "sys.__stdout__.write(str(time.perf_counter() - started))"
+)
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+    },
+}
+
+
+def isolated_env(workdir: str, prewarm: bool = True) -> dict:
+    """Environment for one benchmarked process: a throwaway store and offline providers"""
+    return {
+        **os.environ,
+        "MEM0_MCP_PROVIDERS": "standin",
+        "MEM0_MCP_DB_PATH": os.path.join(workdir, "db"),
+        "MEM0_MCP_LOG_FILE": os.path.join(workdir, "gemini_log.jsonl"),
+        "MEM0_MCP_EMBED_CACHE": os.path.join(workdir, "embedding_cache.sqlite3"),
+        "MEM0_MCP_WRITE_JOURNAL": os.path.join(workdir, "remember_journal.jsonl"),
+        "MEM0_DIR": os.path.join(workdir, "mem0"),
+        "MEM0_MCP_PREWARM": "1" if prewarm else "0",
+        "MEM0_TELEMETRY": "False",
+    }
+
+
+def measure_import() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=REPO_ROOT,
+        env=isolated_env(tempfile.mkdtemp(prefix="mem0-startup-")),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def measure_initialize(timeout: float, prewarm: bool = True) -> float:
+    env = isolated_env(tempfile.mkdtemp(prefix="mem0-startup-"), prewarm)
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py", "--stdio"],
+        cwd=REPO_ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        proc.stdin.write(json.dumps(INITIALIZE_REQUEST) + "\n")
+        proc.stdin.flush()
+        while True:
+            line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError("server exited before answering initialize")
+            message = json.loads(line)
+            if message.get("id") == 1:
+                if "error" in message:
+                    raise RuntimeError(f"initialize failed: {message['error']}")
+                return time.perf_counter() - started
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("no initialize response")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "samples": samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark main.py --stdio startup")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for initialize")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed median slowdown vs. baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_seconds": summarize([measure_import() for _ in range(args.runs)]),
+        "initialize_seconds": summarize([measure_initialize(args.timeout) for _ in range(args.runs)]),
+        "initialize_seconds_no_prewarm": summarize(
+            [measure_initialize(args.timeout, prewarm=False) for _ in range(args.runs)]),
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = []
+        for metric in ("import_seconds", "initialize_seconds", "initialize_seconds_no_prewarm"):
+            if metric not in baseline:
+                continue
+            before = baseline[metric]["median"]
+            after = results[metric]["median"]
+            if after > before * (1 + args.tolerance):
+                regressions.append(f"{metric}: median {after:.3f}s vs baseline {before:.3f}s")
+        if regressions:
+            print("Startup regression: " + "; ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-namespace change feed for the memory manager UI.
+
+Every write this process makes is recorded as add/update/delete events with
+increasing sequence numbers, so a client that has loaded the list once only
+asks for the events after its last sequence number. Only the most recent
+events are kept; a client that fell behind, talks to a restarted server
+(different epoch) or missed a write this process could not describe (another
+process wrote to the store, or a filter delete) gets a reset and reloads.
+"""
+
+import itertools
+import threading
+import uuid
+from collections import deque
+
+ADD, UPDATE, DELETE, RESET = "add", "update", "delete", "reset"
+
+
+class ChangeLog:
+    """Bounded, sequence-numbered log of memory changes in one namespace"""
+
+    def __init__(self, max_events: int = 10000):
+        # Sequence numbers restart with the process; the epoch tells clients apart
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        # Store generation after the last recorded change; None until first seen
+        self.generation = None
+        self._events = deque(maxlen=max_events)  # (seq, op, memory_id)
+        # Writers hold this across the store generation bump and record(), so
+        # observe() never mistakes a write in progress for a foreign one
+        self.lock = threading.RLock()
+
+    def _append(self, op: str, memory_id: str = None):
+        self.seq += 1
+        self._events.append((self.seq, op, memory_id))
+
+    def record(self, previous: str, generation: str, added=(), updated=(), removed=(), known: bool = True):
+        """Record a write that moved the store from generation previous to generation.
+
+        known=False means the exact change is unknown, which logs a reset.
+        """
+        with self.lock:
+            if not known or (self.generation is not None and previous != self.generation):
+                self._append(RESET)
+            else:
+                for memory_id in added:
+                    self._append(ADD, memory_id)
+                for memory_id in updated:
+                    self._append(UPDATE, memory_id)
+                for memory_id in removed:
+                    self._append(DELETE, memory_id)
+            self.generation = generation
+
+    def observe(self, generation: str):
+        """Log a reset if the store changed without going through record()"""
+        with self.lock:
+            if self.generation is not None and generation != self.generation:
+                self._append(RESET)
+            self.generation = generation
+
+    def since(self, seq: int, epoch: str = None) -> tuple:
+        """Events after seq.
+
+        Returns:
+            (latest_seq, events, reset) where events are (seq, op, memory_id)
+            tuples; reset means the client must reload instead of applying them.
+        """
+        with self.lock:
+            latest = self.seq
+            if (epoch is not None and epoch != self.epoch) or seq > latest:
+                return latest, [], True
+            oldest = self._events[0][0] if self._events else latest + 1
+            if seq < oldest - 1:
+                return latest, [], True
+            # Walk back from the newest event: O(changes), not O(retained events)
+            events = list(itertools.takewhile(lambda event: event[0] > seq, reversed(self._events)))[::-1]
+        if any(op == RESET for _, op, _ in events):
+            return latest, [], True
+        return latest, events, False
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"epoch": self.epoch, "seq": self.seq, "retained": len(self._events)}
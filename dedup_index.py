@@ -0,0 +1,174 @@
+"""
+Duplicate index for `remember`.
+
+Agents often remember the same text again. Every text gets a content key (a
+hash of its lowercased words, so case, punctuation and spacing don't matter);
+a text whose key matches a stored memory, or the text a memory was extracted
+from, is a duplicate and can be skipped.
+
+Near-duplicates are only skipped when `max_distance` > 0. A small edit is often
+a correction ("Always use tabs" -> "Never use tabs", "Python 3.11" -> "3.12")
+that mem0 must see to update or delete the old memory, so fuzzy matching is
+opt-in, and even then only applies to texts of at least MIN_FEATURES features.
+It compares 64-bit SimHashes over word unigrams and bigrams; texts whose
+fingerprints differ in at most `max_distance` bits are near-duplicates. Lookups
+use the pigeonhole trick: the fingerprint is split into `max_distance + 1`
+bands, and two fingerprints within the distance must agree exactly on at least
+one band, so only memories sharing a band are compared.
+"""
+
+import hashlib
+import re
+import threading
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+BITS = 64
+# Words plus bigrams a text needs before near-duplicate matching applies to it
+MIN_FEATURES = 24
+
+
+def _words(text: str) -> list:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def content_key(text: str) -> int:
+    """64-bit hash of a text's lowercased words, in order"""
+    return int.from_bytes(hashlib.blake2b(" ".join(_words(text)).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of a text's lowercased words and word bigrams"""
+    words = _words(text)
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    weights = [0] * BITS
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class DedupIndex:
+    """Content keys and SimHash fingerprints of stored memories (and of the texts they came from)"""
+
+    def __init__(self, max_distance: int = 0):
+        self.max_distance = max(0, min(max_distance, BITS - 1))
+        bands = self.max_distance + 1
+        width = BITS // bands
+        # (shift, mask) per band; the last band takes the leftover bits
+        self._bands = [(i * width, (1 << (width if i < bands - 1 else BITS - i * width)) - 1) for i in range(bands)]
+        # Store generation the index reflects; None means it must be rebuilt
+        self.generation = None
+        self._tables = [{} for _ in self._bands]  # band value -> set of (doc_id, fingerprint)
+        self._by_content = {}  # content key -> set of doc_ids
+        self._docs = {}  # doc_id -> (user_id, fingerprints, content keys)
+        self._lock = threading.RLock()
+        self.checked = 0
+        self.duplicates = 0
+        self.avoided_llm_calls = 0
+        self.avoided_embed_calls = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _keys(self, fingerprint: int):
+        return [(fingerprint >> shift) & mask for shift, mask in self._bands]
+
+    def add(self, doc_id: str, text: str, user_id: str, fingerprints: tuple = (), keys: tuple = ()):
+        """Index a memory's text plus any extra fingerprints and content keys (e.g. of its source text)"""
+        with self._lock:
+            self._remove(doc_id)
+            self._insert(doc_id, user_id, {simhash(text), *fingerprints}, {content_key(text), *keys})
+
+    def add_source(self, doc_id: str, text: str):
+        """Attach the text an indexed memory was extracted from"""
+        with self._lock:
+            doc = self._docs.get(doc_id)
+            if doc is not None:
+                self._remove(doc_id)
+                self._insert(doc_id, doc[0], doc[1] | {simhash(text)}, doc[2] | {content_key(text)})
+
+    def _insert(self, doc_id: str, user_id: str, fingerprints: set, keys: set):
+        if self.max_distance:
+            for fingerprint in fingerprints:
+                for table, key in zip(self._tables, self._keys(fingerprint)):
+                    table.setdefault(key, set()).add((doc_id, fingerprint))
+        for key in keys:
+            self._by_content.setdefault(key, set()).add(doc_id)
+        self._docs[doc_id] = (user_id, fingerprints, keys)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        if self.max_distance:
+            for fingerprint in doc[1]:
+                for table, key in zip(self._tables, self._keys(fingerprint)):
+                    bucket = table.get(key)
+                    if bucket is not None:
+                        bucket.discard((doc_id, fingerprint))
+                        if not bucket:
+                            del table[key]
+        for key in doc[2]:
+            bucket = self._by_content.get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self._by_content[key]
+
+    def rebuild(self, rows, generation: str):
+        """Replace the contents with (doc_id, text, user_id, fingerprints, keys) rows.
+
+        Built aside and swapped in, like LexicalIndex.rebuild; the counters are kept.
+        """
+        fresh = DedupIndex(self.max_distance)
+        for doc_id, text, user_id, fingerprints, keys in rows:
+            fresh.add(doc_id, text, user_id, fingerprints, keys)
+        with self._lock:
+            self._tables, self._by_content, self._docs = fresh._tables, fresh._by_content, fresh._docs
+            self.generation = generation
+
+    def find(self, text: str, user_id: str):
+        """Id of a stored duplicate (or, if enabled, near-duplicate) of text for this user, or None"""
+        with self._lock:
+            self.checked += 1
+            for doc_id in self._by_content.get(content_key(text), ()):
+                if self._docs[doc_id][0] == user_id:
+                    return doc_id
+            if not self.max_distance or 2 * len(_words(text)) - 1 < MIN_FEATURES:
+                return None
+            fingerprint = simhash(text)
+            best, best_distance = None, self.max_distance + 1
+            for table, key in zip(self._tables, self._keys(fingerprint)):
+                for doc_id, candidate in table.get(key, ()):
+                    distance = hamming(fingerprint, candidate)
+                    if distance < best_distance and self._docs[doc_id][0] == user_id:
+                        best, best_distance = doc_id, distance
+        return best
+
+    def record_duplicate(self, llm_calls: int, embed_calls: int):
+        """Count a write that was short-circuited and the API calls it would have made"""
+        with self._lock:
+            self.duplicates += 1
+            self.avoided_llm_calls += llm_calls
+            self.avoided_embed_calls += embed_calls
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memories": len(self._docs),
+                "max_distance": self.max_distance,
+                "checked": self.checked,
+                "duplicates": self.duplicates,
+                "avoided_llm_calls": self.avoided_llm_calls,
+                "avoided_embed_calls": self.avoided_embed_calls,
+                "in_sync": self.generation is not None,
+            }
@@ -0,0 +1,138 @@
+"""
+Persistent, content-addressed cache for embedding vectors.
+
+Entries are keyed by a hash of (embedder model, request options, text) and
+stored in a small SQLite file, so repeated `recall` queries and re-remembered
+facts never reach the embedding API, even across restarts. The cache is capped
+at `max_entries` and evicts the least recently used entries.
+
+Hits only note their new recency in memory; the notes are written in one
+batch with the next `put`, or once enough of them have piled up, so the read
+path does not pay for a commit per hit.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU cache of embedding vectors"""
+
+    # Fraction of max_entries evicted at once, so eviction is not run on every insert
+    EVICT_FRACTION = 0.1
+    # Pending recency updates are written once there are this many, or they are this old
+    TOUCH_FLUSH_SIZE = 256
+    TOUCH_FLUSH_SECONDS = 30.0
+
+    def __init__(self, path: str, max_entries: int = 50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._count = 0
+        self._tick = 0  # monotonic "last used" clock, cheaper and stricter than wall time
+        self._touched = {}  # key -> tick of hits not yet written
+        self._touched_since = 0.0
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, model TEXT, vector BLOB, last_used INTEGER)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+            self._count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._tick = conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM embeddings").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, text: str, options: dict = None) -> str:
+        """Content address for a text embedded by a given model with given options"""
+        payload = json.dumps([model, options or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8") + b"\0" + text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached vector for a key, or None on a miss"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._tick += 1
+            if not self._touched:
+                self._touched_since = time.monotonic()
+            self._touched[key] = self._tick
+            if (len(self._touched) >= self.TOUCH_FLUSH_SIZE
+                    or time.monotonic() - self._touched_since >= self.TOUCH_FLUSH_SECONDS):
+                self._flush_touched(conn)
+                conn.commit()
+        return array("d", row[0]).tolist()
+
+    def _flush_touched(self, conn):
+        """Write pending recency updates (caller holds the lock and commits)"""
+        if self._touched:
+            conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                             [(tick, key) for key, tick in self._touched.items()])
+            self._touched.clear()
+
+    def put(self, key: str, model: str, vector):
+        """Store a vector, evicting least recently used entries past the cap"""
+        blob = array("d", vector).tobytes()
+        with self._lock:
+            conn = self._connect()
+            # Eviction below must see recent hits
+            self._flush_touched(conn)
+            self._tick += 1
+            exists = conn.execute("SELECT 1 FROM embeddings WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                (key, model, blob, self._tick),
+            )
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries:
+                evict = self._count - self.max_entries + int(self.max_entries * self.EVICT_FRACTION)
+                conn.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (evict,),
+                )
+                self.evictions += evict
+                self._count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._count,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touched(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
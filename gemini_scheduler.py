@@ -0,0 +1,206 @@
+"""
+Shared scheduler for Gemini API calls (LLM and embeddings).
+
+Every call goes through a per-model token bucket sized to the project's quota,
+so bursts queue briefly here instead of coming back as 429s. Calls that still
+fail with a retryable error (429, 500, 503, 504) are retried with jittered
+exponential backoff, or after the delay the server asked for (Retry-After
+header or gRPC RetryInfo). A 429 also pauses the model's bucket, so concurrent
+callers wait out the cooldown together instead of each hitting the limit.
+
+Waits run on the calling worker thread, so each call has a wait budget: once
+queueing and backoff would exceed it, the call fails instead of holding the
+worker for minutes.
+"""
+
+import email.utils
+import math
+import random
+import re
+import threading
+import time
+
+RETRYABLE_CODES = {429, 500, 503, 504}
+_RETRY_IN_RE = re.compile(r"retry in ([0-9.]+)\s*s", re.IGNORECASE)
+
+
+def parse_rates(spec: str) -> dict:
+    """Requests-per-minute limits from "model=rpm,model=rpm" ("*" or a bare number: every model)"""
+    rates = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model, _, rpm = item.rpartition("=")
+        rates[model.strip() or "*"] = float(rpm)
+    return rates
+
+
+def status_code(error) -> int | None:
+    """HTTP status of a google.api_core error (None for anything else)"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    # REST transport errors may only carry the HTTP response
+    code = getattr(getattr(error, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after_seconds(error) -> float | None:
+    """Delay the server asked for: Retry-After header, gRPC RetryInfo, or "retry in Ns" text"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    for detail in getattr(error, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None and hasattr(delay, "seconds"):
+            return delay.seconds + getattr(delay, "nanos", 0) / 1e9
+    match = _RETRY_IN_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate_per_minute <= 0 means unlimited"""
+
+    def __init__(self, rate_per_minute: float, burst: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)  # about one second of quota
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next `seconds` (server-side cooldown)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def reserve(self, max_wait: float = math.inf) -> float | None:
+        """Take a token and return how long to wait before using it, or take nothing
+        and return None if that would be longer than max_wait"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            if start - now > max_wait:
+                return None
+            if self.rate <= 0:
+                return start - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A negative balance is a queue: the token is earned -tokens/rate from now
+            wait = max(start - now, (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class GeminiScheduler:
+    """Rate limiting and retries shared by all Gemini calls of this process"""
+
+    def __init__(self, rates: dict = None, max_retries: int = 5, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0, max_wait: float = 30.0, sleep=time.sleep):
+        self.rates = dict(rates or {})
+        self.max_retries = max(0, max_retries)
+        self.max_wait = max_wait if max_wait and max_wait > 0 else math.inf  # per call, in seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, model: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(model)
+            if bucket is None:
+                bucket = self._buckets[model] = TokenBucket(self.rates.get(model, self.rates.get("*", 0)))
+                self._stats[model] = {
+                    "calls": 0, "throttled": 0, "retries": 0, "failures": 0,
+                    "queued": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+                }
+            return bucket
+
+    def _count(self, model: str, key: str, amount=1):
+        with self._lock:
+            self._stats[model][key] += amount
+
+    def _wait_turn(self, model: str, bucket: TokenBucket, budget: float) -> float | None:
+        """Wait for the bucket's next token; returns the seconds waited, or None when
+        the wait would exceed budget"""
+        wait = bucket.reserve(budget)
+        if wait is None or wait <= 0:
+            return wait
+        with self._lock:
+            stats = self._stats[model]
+            stats["queued"] += 1
+            stats["wait_seconds_total"] += wait
+            stats["wait_seconds_max"] = max(stats["wait_seconds_max"], wait)
+        try:
+            self._sleep(wait)
+        finally:
+            self._count(model, "queued", -1)
+        return wait
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry (0-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def call(self, model: str, func):
+        """Run func() as a call to `model`, waiting and retrying as needed.
+
+        Raises func's last error, or TimeoutError if the model's bucket is paused
+        or queued beyond the wait budget before the first attempt.
+        """
+        model = str(model)
+        bucket = self._bucket(model)
+        attempt = 0
+        budget = self.max_wait
+        last_error = None
+        while True:
+            waited = self._wait_turn(model, bucket, budget)
+            if waited is None:
+                self._count(model, "failures")
+                if last_error is not None:
+                    raise last_error
+                raise TimeoutError(f"Gemini calls to {model} are rate limited for longer than "
+                                   f"the {self.max_wait:g}s wait budget")
+            budget -= waited
+            self._count(model, "calls")
+            try:
+                return func()
+            except Exception as e:
+                code = status_code(e)
+                if code == 429:
+                    self._count(model, "throttled")
+                if code not in RETRYABLE_CODES or attempt >= self.max_retries:
+                    self._count(model, "failures")
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                elif code == 429:
+                    # Everyone calling this model waits out the cooldown, not just this caller
+                    bucket.pause(delay)
+                    delay = 0.0
+                if delay > budget:
+                    self._count(model, "failures")
+                    raise
+                self._count(model, "retries")
+                attempt += 1
+                last_error = e
+                if delay > 0:
+                    self._sleep(delay)
+                    budget -= delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {model: dict(stats, rpm=self.rates.get(model, self.rates.get("*", 0)))
+                    for model, stats in self._stats.items()}
@@ -0,0 +1,203 @@
+"""
+Bulk ingestion for seeding the memory store.
+
+`Memory.add` handles one text at a time: one fact-extraction LLM call, one
+embedding call per fact, one Chroma insert per memory. For bulk seeding this
+module pipelines the same steps per chunk of texts:
+
+1. fact extraction for every text in the chunk, in parallel under a concurrency cap
+2. one batched embedding request for all extracted facts
+3. one batched Chroma insert for the whole chunk
+
+Unlike `Memory.add`, bulk ingestion does not run mem0's UPDATE/DELETE
+reconciliation against existing memories; it is meant for seeding.
+
+`store_verbatim` skips the LLM entirely for content that should be kept as is
+(code blocks, logs): one embedding call and one Chroma insert. `looks_like_code`
+is the heuristic that routes such content there automatically.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytz
+from mem0.memory.utils import get_fact_retrieval_messages, parse_messages, remove_code_blocks
+
+from store_ops import CREATED_TS_KEY
+
+# Gemini's batchEmbedContents accepts at most 100 texts per request
+EMBED_BATCH_LIMIT = 100
+# Below Chroma's maximum batch size (5461 with the default SQLite backend)
+INSERT_BATCH_LIMIT = 5000
+
+# Lines that are almost never prose: declarations, imports, statement/block endings, deep indentation
+_CODE_LINE_RE = re.compile(
+    r"^\s*(def |class |import |from \S+ import |function |const |let |var |return\b|#include|package |"
+    r"public |private |fn |func |SELECT |INSERT |CREATE |@\w+)"
+    r"|[;{}]\s*$|^( {4}|\t)\S"
+)
+
+
+def iter_jsonl_texts(path: str):
+    """Stream texts from a JSONL file without loading it into memory.
+
+    Each line is either a JSON string or an object with a "text" (or "memory") field.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {e}") from e
+            text = record if isinstance(record, str) else (record.get("text") or record.get("memory"))
+            if text:
+                yield text
+
+
+def looks_like_code(text: str, min_lines: int = 3, threshold: float = 0.4) -> bool:
+    """Whether text is code-like enough to be stored verbatim instead of summarized"""
+    if "```" in text:
+        return True
+    lines = [line for line in text.splitlines() if line.strip()]
+    if len(lines) < min_lines:
+        return False
+    return sum(1 for line in lines if _CODE_LINE_RE.search(line)) / len(lines) >= threshold
+
+
+def extract_facts(client, text: str) -> list:
+    """Run mem0's fact-extraction prompt for one text"""
+    system_prompt, user_prompt = get_fact_retrieval_messages(parse_messages([{"role": "user", "content": text}]))
+    if client.custom_prompt:
+        system_prompt = client.custom_prompt
+    response = client.llm.generate_response(
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        response_format={"type": "json_object"},
+    )
+    return json.loads(remove_code_blocks(response))["facts"]
+
+
+def embed_batch(client, texts: list) -> list:
+    """Embed many texts with as few embedder requests as possible"""
+    try:
+        from mem0.embeddings.gemini import GoogleGenAIEmbedding
+    except ImportError:
+        GoogleGenAIEmbedding = None
+
+    embedder = client.embedding_model
+    if GoogleGenAIEmbedding is None or not isinstance(embedder, GoogleGenAIEmbedding):
+        return [embedder.embed(text) for text in texts]
+
+    import google.generativeai as genai
+
+    vectors = []
+    for start in range(0, len(texts), EMBED_BATCH_LIMIT):
+        # Same preprocessing as GoogleGenAIEmbedding.embed
+        chunk = [text.replace("\n", " ") for text in texts[start:start + EMBED_BATCH_LIMIT]]
+        vectors.extend(genai.embed_content(model=embedder.config.model, content=chunk)["embedding"])
+    return vectors
+
+
+def insert_memories(client, facts: list, vectors: list, user_id: str, metadata: dict = None) -> list:
+    """Write memories to the vector store in batches and record their history"""
+    now = datetime.now(pytz.timezone("US/Pacific"))
+    created_at = now.isoformat()
+    ids = [str(uuid.uuid4()) for _ in facts]
+    payloads = [
+        {
+            **(metadata or {}),
+            "data": fact,
+            "hash": hashlib.md5(fact.encode()).hexdigest(),
+            "created_at": created_at,
+            CREATED_TS_KEY: now.timestamp(),
+            "user_id": user_id,
+        }
+        for fact in facts
+    ]
+    for start in range(0, len(ids), INSERT_BATCH_LIMIT):
+        end = start + INSERT_BATCH_LIMIT
+        client.vector_store.insert(vectors=vectors[start:end], payloads=payloads[start:end], ids=ids[start:end])
+    for memory_id, fact in zip(ids, facts):
+        client.db.add_history(memory_id, None, fact, "ADD", created_at=created_at)
+    return ids
+
+
+def store_verbatim(client, texts: list, user_id: str, metadata: dict = None) -> list:
+    """Embed and store texts as they are, without LLM fact extraction"""
+    texts = [text for text in texts if text]
+    if not texts:
+        return []
+    return insert_memories(client, texts, embed_batch(client, texts), user_id, metadata)
+
+
+def ingest_texts(client, texts, user_id: str, concurrency: int = 8, batch_size: int = 64, progress=None,
+                 metadata: dict = None) -> dict:
+    """Ingest an iterable of texts in pipelined batches.
+
+    Args:
+        client: mem0 Memory instance
+        texts: any iterable of strings; consumed lazily, one chunk at a time
+        user_id: user id stored with every memory
+        concurrency: maximum parallel fact-extraction calls
+        batch_size: texts per chunk (one embedding batch and one Chroma insert per chunk)
+        progress: optional callable(stats_dict) invoked after every chunk
+        metadata: optional metadata stored with every memory
+
+    Returns:
+        Summary with counts, failures and throughput.
+    """
+    stats = {"texts": 0, "facts": 0, "memories": 0, "failed": 0, "errors": [], "seconds": 0.0}
+    started = time.perf_counter()
+    iterator = iter(texts)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="mem0-ingest") as executor:
+        while True:
+            chunk = list(itertools.islice(iterator, batch_size))
+            if not chunk:
+                break
+
+            facts = []
+            failed = set()
+            futures = [executor.submit(extract_facts, client, text) for text in chunk]
+            for offset, future in enumerate(futures):
+                try:
+                    facts.extend(f for f in future.result() if f)
+                except Exception as e:
+                    failed.add(offset)
+                    if len(stats["errors"]) < 20:
+                        stats["errors"].append(f"text {stats['texts'] + offset}: {e}")
+            stats["texts"] += len(chunk)
+
+            # Identical facts within one chunk would become duplicate memories
+            facts = list(dict.fromkeys(facts))
+            if facts:
+                try:
+                    vectors = embed_batch(client, facts)
+                    stats["memories"] += len(insert_memories(client, facts, vectors, user_id, metadata))
+                    stats["facts"] += len(facts)
+                except Exception as e:
+                    # Texts whose extraction already failed are counted once
+                    failed.update(range(len(chunk)))
+                    if len(stats["errors"]) < 20:
+                        stats["errors"].append(f"batch at text {stats['texts'] - len(chunk)}: {e}")
+            stats["failed"] += len(failed)
+
+            stats["seconds"] = time.perf_counter() - started
+            stats["texts_per_second"] = stats["texts"] / stats["seconds"] if stats["seconds"] else 0.0
+            if progress is not None:
+                progress(dict(stats))
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["texts_per_second"] = stats["texts"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
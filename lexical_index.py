@@ -0,0 +1,130 @@
+"""
+In-memory BM25 inverted index over the memory store.
+
+Embeddings are poor at exact identifiers (error codes, function names, CLI
+flags), so `recall` also ranks memories lexically and fuses both rankings.
+The index is updated incrementally from the results of writes in this process
+and rebuilt from Chroma when another process has written to the store.
+
+Tokens keep identifiers whole (`ERR_CONN_RESET`, `os.path.join`, `v1.2.3`) and
+also add their parts (`err`, `conn`, `reset`; camelCase is split too), so both
+the exact identifier and its words match.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+(?:[.\-:/][A-Za-z0-9_]+)*")
+_PART_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+
+
+def tokenize(text: str) -> list:
+    """Lowercased identifier-aware tokens of a text"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text or ""):
+        word = match.group()
+        tokens.append(word.lower())
+        parts = _PART_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def reciprocal_rank_fusion(rankings: list, k: int = 60) -> list:
+    """Fuse ranked id lists; ids ranked high in any list come first"""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+class LexicalIndex:
+    """BM25 index of memory texts, partitioned by user id at query time"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # Store generation the index reflects; None means it must be rebuilt
+        self.generation = None
+        self._postings = {}  # term -> {doc_id: term frequency}
+        self._docs = {}  # doc_id -> (user_id, length, unique terms)
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id: str, text: str, user_id: str):
+        """Index a memory, replacing any previous text for the same id"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            length = sum(counts.values())
+            self._docs[doc_id] = (user_id, length, tuple(counts))
+            self._total_length += length
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        _, length, terms = doc
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def rebuild(self, rows, generation: str):
+        """Replace the contents with (doc_id, text, user_id) rows.
+
+        The new index is built aside and swapped in, so searches and incremental
+        updates only wait for the swap.
+        """
+        fresh = LexicalIndex(self.k1, self.b)
+        for doc_id, text, user_id in rows:
+            fresh.add(doc_id, text, user_id)
+        with self._lock:
+            self._postings, self._docs, self._total_length = fresh._postings, fresh._docs, fresh._total_length
+            self.generation = generation
+
+    def search(self, query: str, user_id: str, limit: int = 100) -> list:
+        """Top (doc_id, score) pairs for a query, best first"""
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._docs:
+                return []
+            n_docs = len(self._docs)
+            avg_length = self._total_length / n_docs
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    doc_user, length, _ = self._docs[doc_id]
+                    if doc_user != user_id:
+                        continue
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "in_sync": self.generation is not None,
+            }
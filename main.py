@@ -4,21 +4,82 @@ from datetime import datetime
 import warnings
 import atexit
 import signal
+import asyncio
+import threading
+import time
+import contextlib
+import contextvars
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# Check if running in stdio mode (for VS Code/Copilot) - suppress print output
-STDIO_MODE = '--stdio' in sys.argv
+import io
+from collections import deque
+
+def stdio_requested(argv: list) -> bool:
+    """Whether the command line selects the stdio transport (--stdio or --transport stdio)"""
+    for i, arg in enumerate(argv):
+        if arg == "--stdio" or arg == "--transport=stdio":
+            return True
+        if arg == "--transport" and i + 1 < len(argv) and argv[i + 1] == "stdio":
+            return True
+    return False
+
+# Check if running in stdio mode (for VS Code/Copilot) - suppress print output.
+# Decided before anything logs, so argparse runs too late for this.
+STDIO_MODE = stdio_requested(sys.argv[1:])
+
+# Bounds for the stdio-mode stderr capture (lines kept, characters per line)
+STDERR_BUFFER_LINES = 1000
+STDERR_LINE_MAX_CHARS = 4000
+
+class StderrRingBuffer(io.TextIOBase):
+    """Keeps only the most recent stderr lines, so memory stays flat in long sessions"""
+
+    def __init__(self, max_lines: int = STDERR_BUFFER_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._partial = ""
+        self._lock = threading.Lock()
+        self.total_lines = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self._lock:
+            parts = (self._partial + text).split("\n")
+            self._partial = parts.pop()[:STDERR_LINE_MAX_CHARS]
+            for line in parts:
+                self._lines.append((datetime.now().isoformat(timespec="seconds"), line[:STDERR_LINE_MAX_CHARS]))
+                self.total_lines += 1
+        return len(text)
+
+    def recent(self, count: int) -> list:
+        """Most recent captured lines as "timestamp line" strings"""
+        with self._lock:
+            lines = list(self._lines)[-count:] if count > 0 else []
+            if self._partial:
+                lines.append((datetime.now().isoformat(timespec="seconds"), self._partial))
+        return [f"{ts} {line}" for ts, line in lines]
+
+stderr_buffer = None
 
 # In stdio mode, suppress all warnings to stderr as well
 if STDIO_MODE:
     warnings.filterwarnings("ignore")
-    # Redirect stderr to devnull to suppress library warnings
-    import io
-    sys.stderr = io.StringIO()
+    # stdout carries JSON-RPC and nothing drains stderr, so capture library output
+    # in a bounded ring buffer instead; the diagnostics tool dumps it
+    stderr_buffer = StderrRingBuffer()
+    sys.stderr = stderr_buffer
 
 def log_print(*args, **kwargs):
-    """Print only when not in stdio mode (stdio mode needs clean stdout for JSON-RPC)"""
+    """Print only when not in stdio mode (stdio mode needs clean stdout for JSON-RPC).
+
+    In stdio mode the message goes to the diagnostics buffer instead.
+    """
     if not STDIO_MODE:
         print(*args, **kwargs)
+    elif stderr_buffer is not None:
+        print(*args, file=stderr_buffer)
 
 # Fix for sqlite3 on Linux systems (must be before chromadb import)
 # Windows has sqlite3 bundled with Python, so this is only needed on Linux
@@ -29,17 +90,28 @@ if sys.platform == "linux":
     except ImportError:
         pass  # pysqlite3 not installed, use system sqlite3
 
-# Core imports (always needed)
-from mcp.server.fastmcp import FastMCP
+# Core imports (always needed). mem0 and google.generativeai are heavy and are
+# imported lazily by get_mem0_client()
+from mcp.server.fastmcp import FastMCP, Context
 from mcp.server import Server
-from mem0 import Memory
 from dotenv import load_dotenv
 import json
+from write_behind import WriteBehindQueue
+from embedding_cache import EmbeddingCache
+from recall_cache import RecallCache, SingleFlight, StoreGeneration
+from lexical_index import LexicalIndex, reciprocal_rank_fusion
+from dedup_index import DedupIndex, content_key, simhash
+from change_log import ChangeLog
+from request_log import RequestLogWriter
+from metrics import MetricsRegistry
+from gemini_scheduler import GeminiScheduler, parse_rates
+import store_ops
+import namespaces
 
 # SSE-only imports - loaded lazily only when SSE mode is used
 # This speeds up stdio mode startup significantly
 def get_sse_imports():
-    """Lazy load SSE-related imports only when needed"""
+    """Lazy load HTTP (SSE and Streamable HTTP) imports only when needed"""
     from starlette.applications import Starlette
     from mcp.server.sse import SseServerTransport
     from starlette.requests import Request
@@ -49,128 +121,365 @@ def get_sse_imports():
 
 load_dotenv()
 
+# ============== Metrics ==============
+# Prometheus-format counters and histograms, served at GET /metrics in SSE mode
+metrics = MetricsRegistry()
+tool_requests = metrics.counter("mem0_mcp_tool_requests_total", "MCP tool calls", ("tool",))
+tool_errors = metrics.counter("mem0_mcp_tool_errors_total", "MCP tool calls that returned an error", ("tool",))
+tool_duration = metrics.histogram("mem0_mcp_tool_duration_seconds", "MCP tool call latency", ("tool",))
+tool_in_flight = metrics.gauge("mem0_mcp_tool_in_flight", "MCP tool calls currently running", ("tool",))
+gemini_requests = metrics.counter("mem0_mcp_gemini_requests_total", "Gemini API calls", ("operation",))
+gemini_errors = metrics.counter("mem0_mcp_gemini_errors_total", "Failed Gemini API calls", ("operation",))
+gemini_duration = metrics.histogram("mem0_mcp_gemini_duration_seconds", "Gemini API call latency", ("operation",))
+chroma_duration = metrics.histogram("mem0_mcp_chroma_duration_seconds", "Chroma collection call latency", ("operation",))
+
+def instrumented(func):
+    """Count, time and track in-flight calls of an async MCP tool.
+
+    Tools report failures as "Error ..." strings rather than exceptions, so
+    both count as errors.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        tool_requests.inc(tool=name)
+        tool_in_flight.inc(tool=name)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await func(*args, **kwargs)
+            failed = isinstance(result, str) and result.startswith("Error")
+            return result
+        finally:
+            tool_duration.observe(time.perf_counter() - started, tool=name)
+            tool_in_flight.dec(tool=name)
+            if failed:
+                tool_errors.inc(tool=name)
+
+    return wrapper
+
+# Chroma collection methods timed by _instrument_chroma
+_CHROMA_TIMED_METHODS = ("query", "get", "add", "upsert", "update", "delete", "count")
+
+def _instrument_chroma(client):
+    """Time calls on the client's Chroma collection (covers mem0 and store_ops alike)"""
+    collection = getattr(client.vector_store, "collection", None)
+    if collection is None:
+        return
+
+    def timed(operation, method):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                chroma_duration.observe(time.perf_counter() - started, operation=operation)
+        return wrapper
+
+    for operation in _CHROMA_TIMED_METHODS:
+        method = getattr(collection, operation, None)
+        if method is not None:
+            setattr(collection, operation, timed(operation, method))
+
 # ============== Gemini API Logging ==============
-GEMINI_LOG_FILE = "./gemini_log.jsonl"
+# Entries are queued and written in batches by a background thread (request_log.py),
+# so LLM and embedding calls never wait on the log file.
+GEMINI_LOG_FILE = os.environ.get("MEM0_MCP_LOG_FILE", "./gemini_log.jsonl")
 
-def log_gemini_request(operation: str, input_data: dict, output_data: dict, error: str = None):
-    """Log Gemini API requests to a JSONL file"""
-    log_entry = {
+gemini_log = RequestLogWriter(
+    GEMINI_LOG_FILE,
+    max_bytes=int(os.environ.get("MEM0_MCP_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+    rotate_seconds=float(os.environ.get("MEM0_MCP_LOG_ROTATE_SECONDS", "0")),
+    backups=int(os.environ.get("MEM0_MCP_LOG_BACKUPS", "3")),
+    sample_rate=float(os.environ.get("MEM0_MCP_LOG_SAMPLE_RATE", "1.0")),
+    log=log_print,
+)
+
+def log_gemini_request(operation: str, input_data: dict, output_data: dict, error: str = None,
+                       duration_ms: float = None, bytes_in: int = None, bytes_out: int = None):
+    """Log a Gemini API request (with latency and payload sizes) to the JSONL log and metrics"""
+    gemini_requests.inc(operation=operation)
+    if error is not None:
+        gemini_errors.inc(operation=operation)
+    if duration_ms is not None:
+        gemini_duration.observe(duration_ms / 1000, operation=operation)
+    gemini_log.write({
         "timestamp": datetime.now().isoformat(),
         "operation": operation,
+        "duration_ms": round(duration_ms, 2) if duration_ms is not None else None,
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
         "input": input_data,
         "output": output_data,
         "error": error
-    }
+    })
+
+# ============== Embedding Cache ==============
+# Content-addressed cache in front of genai.embed_content (and thus in front of the
+# embedder configured in LOCAL_HYBRID_CONFIG). Hits never reach the network or the log.
+EMBED_CACHE_PATH = os.environ.get("MEM0_MCP_EMBED_CACHE", "./embedding_cache.sqlite3")
+EMBED_CACHE_SIZE = int(os.environ.get("MEM0_MCP_EMBED_CACHE_SIZE", "50000"))
+embedding_cache = EmbeddingCache(EMBED_CACHE_PATH, EMBED_CACHE_SIZE) if EMBED_CACHE_SIZE > 0 else None
+
+# Keyword arguments that change the resulting vector and therefore belong in the cache key
+_EMBED_KEY_OPTIONS = ("task_type", "title", "output_dimensionality")
+
+def get_embedding_cache_stats() -> dict:
+    """Hit/miss counters of the embedding cache, or an empty dict when disabled"""
+    return embedding_cache.stats() if embedding_cache is not None else {}
+
+# ============== Gemini Scheduler ==============
+# Every Gemini call (fact extraction and embeddings) is paced by a per-model token
+# bucket and retried on 429/5xx with jittered backoff or the server's Retry-After.
+# MEM0_MCP_GEMINI_RPM: "gemini-2.5-flash=1000,models/text-embedding-004=1500", or one
+# number for every model; unset means no client-side limit (retries still apply).
+gemini_scheduler = GeminiScheduler(
+    parse_rates(os.environ.get("MEM0_MCP_GEMINI_RPM", "")),
+    max_retries=int(os.environ.get("MEM0_MCP_GEMINI_MAX_RETRIES", "5")),
+    backoff_base=float(os.environ.get("MEM0_MCP_GEMINI_BACKOFF_BASE", "1.0")),
+    backoff_max=float(os.environ.get("MEM0_MCP_GEMINI_BACKOFF_MAX", "60")),
+    max_wait=float(os.environ.get("MEM0_MCP_GEMINI_MAX_WAIT", "30")),
+)
+
+# ============== Gemini Patches ==============
+# mem0 and google.generativeai take seconds to import, which would delay the stdio
+# handshake. They are imported, and the patches below applied, only right before
+# the mem0 client is first built (see get_mem0_client).
+_gemini_patched = False
+_gemini_patch_lock = threading.Lock()
+
+def _patch_gemini_llm():
+    """Fix mem0 Gemini bug for 2.5 Flash and log LLM calls"""
+    # Bug: tool_config is always set even when tools is None
+    # This causes "400 Function calling config is set without function_declarations"
     try:
-        with open(GEMINI_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False, default=str) + "\n")
-    except Exception as e:
-        log_print(f"[GeminiLog] Error writing log: {e}")
-
-# ============== Fix mem0 Gemini Bug for 2.5 Flash ==============
-# Bug: tool_config is always set even when tools is None
-# This causes "400 Function calling config is set without function_declarations"
-try:
-    from mem0.llms.gemini import GeminiLLM
-    from google.generativeai.types import content_types
-    import google.generativeai as genai
+        from mem0.llms.gemini import GeminiLLM
+        from google.generativeai.types import content_types
+        import google.generativeai as genai
     
-    _original_generate_response = GeminiLLM.generate_response
+        _original_generate_response = GeminiLLM.generate_response
     
-    def fixed_generate_response(self, messages, response_format=None, tools=None, tool_choice="auto"):
-        """Fixed version that only sets tool_config when tools are provided"""
-        params = {
-            "temperature": self.config.temperature,
-            "max_output_tokens": self.config.max_tokens,
-            "top_p": self.config.top_p,
-        }
+        def fixed_generate_response(self, messages, response_format=None, tools=None, tool_choice="auto"):
+            """Fixed version that only sets tool_config when tools are provided"""
+            params = {
+                "temperature": self.config.temperature,
+                "max_output_tokens": self.config.max_tokens,
+                "top_p": self.config.top_p,
+            }
 
-        if response_format is not None and response_format["type"] == "json_object":
-            params["response_mime_type"] = "application/json"
-            if "schema" in response_format:
-                params["response_schema"] = response_format["schema"]
+            if response_format is not None and response_format["type"] == "json_object":
+                params["response_mime_type"] = "application/json"
+                if "schema" in response_format:
+                    params["response_schema"] = response_format["schema"]
         
-        # FIX: Only set tool_config if tools are actually provided
-        tool_config = None
-        if tools and tool_choice:
-            tool_config = content_types.to_tool_config(
-                {
-                    "function_calling_config": {
-                        "mode": tool_choice,
-                        "allowed_function_names": (
-                            [tool["function"]["name"] for tool in tools] if tool_choice == "any" else None
-                        ),
+            # FIX: Only set tool_config if tools are actually provided
+            tool_config = None
+            if tools and tool_choice:
+                tool_config = content_types.to_tool_config(
+                    {
+                        "function_calling_config": {
+                            "mode": tool_choice,
+                            "allowed_function_names": (
+                                [tool["function"]["name"] for tool in tools] if tool_choice == "any" else None
+                            ),
+                        }
                     }
-                }
-            )
+                )
         
-        # Log the request
-        input_data = {
-            "model": self.client.model_name if hasattr(self.client, 'model_name') else str(self.client),
-            "messages": str(messages)[:2000],
-            "tools": str(tools)[:500] if tools else None,
-            "tool_choice": tool_choice
-        }
-        
-        try:
-            response = self.client.generate_content(
-                contents=self._reformat_messages(messages),
-                tools=self._reformat_tools(tools),
-                generation_config=genai.GenerationConfig(**params),
-                tool_config=tool_config,
-            )
-            
-            result = self._parse_response(response, tools)
-            
-            # Log the response
-            output_data = {
-                "response": str(result)[:2000]
+            # Log the request
+            input_data = {
+                "model": self.client.model_name if hasattr(self.client, 'model_name') else str(self.client),
+                "messages": str(messages)[:2000],
+                "tools": str(tools)[:500] if tools else None,
+                "tool_choice": tool_choice
             }
-            log_gemini_request("llm_generate", input_data, output_data)
-            
-            return result
-        except Exception as e:
-            log_gemini_request("llm_generate", input_data, {}, error=str(e))
-            raise
+        
+            bytes_in = sum(len(str(m.get("content", "")).encode("utf-8")) for m in messages)
+
+            def attempt():
+                # One API call, logged; retries and pacing happen in gemini_scheduler
+                started = time.perf_counter()
+                try:
+                    response = self.client.generate_content(
+                        contents=self._reformat_messages(messages),
+                        tools=self._reformat_tools(tools),
+                        generation_config=genai.GenerationConfig(**params),
+                        tool_config=tool_config,
+                    )
+                
+                    result = self._parse_response(response, tools)
+                    duration_ms = (time.perf_counter() - started) * 1000
+                
+                    # Log the response
+                    output_data = {
+                        "response": str(result)[:2000]
+                    }
+                    log_gemini_request("llm_generate", input_data, output_data, duration_ms=duration_ms,
+                                       bytes_in=bytes_in, bytes_out=len(str(result).encode("utf-8")))
+                
+                    return result
+                except Exception as e:
+                    log_gemini_request("llm_generate", input_data, {}, error=str(e),
+                                       duration_ms=(time.perf_counter() - started) * 1000, bytes_in=bytes_in)
+                    raise
+
+            return gemini_scheduler.call(self.config.model, attempt)
     
-    GeminiLLM.generate_response = fixed_generate_response
-    log_print("[GeminiFix] Patched mem0 GeminiLLM.generate_response for 2.5 Flash compatibility")
+        GeminiLLM.generate_response = fixed_generate_response
+        log_print("[GeminiFix] Patched mem0 GeminiLLM.generate_response for 2.5 Flash compatibility")
     
-except ImportError as e:
-    log_print(f"[GeminiFix] Could not patch mem0 GeminiLLM: {e}")
-except Exception as e:
-    log_print(f"[GeminiFix] Failed to patch: {e}")
-
-# Monkey-patch google.generativeai to intercept embedding API calls
-try:
-    import google.generativeai as genai
+    except ImportError as e:
+        log_print(f"[GeminiFix] Could not patch mem0 GeminiLLM: {e}")
+    except Exception as e:
+        log_print(f"[GeminiFix] Failed to patch: {e}")
+
+def _patch_embed_logging():
+    """Monkey-patch google.generativeai to intercept embedding API calls"""
+    try:
+        import google.generativeai as genai
     
-    # Patch embed_content function for logging
-    _original_embed_content = genai.embed_content
+        # Patch embed_content function for logging
+        _original_embed_content = genai.embed_content
     
-    def logged_embed_content(*args, **kwargs):
-        input_data = {
-            "args": [str(a)[:500] for a in args],
-            "kwargs": {k: str(v)[:500] for k, v in kwargs.items()}
-        }
-        try:
-            result = _original_embed_content(*args, **kwargs)
-            output_data = {
-                "embedding_length": len(result.get('embedding', [])) if isinstance(result, dict) else "N/A"
+        def _embed_payload_bytes(content) -> int:
+            if isinstance(content, str):
+                return len(content.encode("utf-8"))
+            if isinstance(content, (list, tuple)):
+                return sum(_embed_payload_bytes(c) for c in content)
+            return len(str(content).encode("utf-8"))
+
+        def logged_embed_content(*args, **kwargs):
+            input_data = {
+                "args": [str(a)[:500] for a in args],
+                "kwargs": {k: str(v)[:500] for k, v in kwargs.items()}
             }
-            log_gemini_request("embed_content", input_data, output_data)
-            return result
-        except Exception as e:
-            log_gemini_request("embed_content", input_data, {}, error=str(e))
-            raise
+            bytes_in = _embed_payload_bytes(kwargs.get("content", args[1] if len(args) > 1 else ""))
+            started = time.perf_counter()
+            try:
+                result = _original_embed_content(*args, **kwargs)
+                duration_ms = (time.perf_counter() - started) * 1000
+                embedding = result.get('embedding', []) if isinstance(result, dict) else []
+                # A batch is a list of vectors
+                batched = bool(embedding) and isinstance(embedding[0], list)
+                output_data = {
+                    "batch_size": len(embedding) if batched else 1,
+                    "embedding_length": (len(embedding[0]) if batched else len(embedding))
+                    if isinstance(result, dict) else "N/A",
+                }
+                # Vectors travel as float32
+                floats = sum(len(v) for v in embedding) if batched else len(embedding)
+                log_gemini_request("embed_content", input_data, output_data, duration_ms=duration_ms,
+                                   bytes_in=bytes_in, bytes_out=floats * 4)
+                return result
+            except Exception as e:
+                log_gemini_request("embed_content", input_data, {}, error=str(e),
+                                   duration_ms=(time.perf_counter() - started) * 1000, bytes_in=bytes_in)
+                raise
     
-    genai.embed_content = logged_embed_content
-    log_print(f"[GeminiLog] Embedding logging enabled -> {GEMINI_LOG_FILE}")
+        genai.embed_content = logged_embed_content
+        log_print(f"[GeminiLog] Embedding logging enabled -> {GEMINI_LOG_FILE}")
     
-except ImportError:
-    log_print("[GeminiLog] google.generativeai not found, logging disabled")
-except Exception as e:
-    log_print(f"[GeminiLog] Failed to patch embeddings: {e}")
+    except ImportError:
+        log_print("[GeminiLog] google.generativeai not found, logging disabled")
+    except Exception as e:
+        log_print(f"[GeminiLog] Failed to patch embeddings: {e}")
+
+def _patch_embed_scheduler():
+    """Route the (logged) genai.embed_content through gemini_scheduler"""
+    try:
+        import google.generativeai as genai
+
+        _unscheduled_embed_content = genai.embed_content
+
+        def scheduled_embed_content(*args, **kwargs):
+            model = kwargs.get("model", args[0] if args else "embedding")
+            return gemini_scheduler.call(model, lambda: _unscheduled_embed_content(*args, **kwargs))
+
+        genai.embed_content = scheduled_embed_content
+    except ImportError:
+        pass
+
+def _patch_genai_configure():
+    """Make repeated genai.configure calls with the same settings a no-op.
+
+    mem0's Gemini LLM and embedder (one pair per namespace client) each call
+    genai.configure, and every call drops genai's cached API clients and with them
+    their open connections. Same settings keep the pooled clients.
+    """
+    try:
+        import google.generativeai as genai
+
+        _original_configure = genai.configure
+        last = {}
+
+        def configure(**kwargs):
+            key = repr(sorted(kwargs.items()))
+            if last.get("key") == key:
+                return
+            _original_configure(**kwargs)
+            last["key"] = key
+
+        genai.configure = configure
+    except ImportError:
+        pass
+
+def _patch_embed_cache():
+    """Put the embedding cache in front of the (logged) genai.embed_content"""
+    if embedding_cache is None:
+        return
+    try:
+        import google.generativeai as genai
+
+        _uncached_embed_content = genai.embed_content
+
+        def cached_embed_content(*args, **kwargs):
+            # mem0 always calls with keywords; anything else goes straight through
+            if args or "model" not in kwargs or "content" not in kwargs:
+                return _uncached_embed_content(*args, **kwargs)
+            model = str(kwargs["model"])
+            content = kwargs["content"]
+            options = {k: kwargs[k] for k in _EMBED_KEY_OPTIONS if kwargs.get(k) is not None}
+
+            if isinstance(content, str):
+                key = EmbeddingCache.make_key(model, content, options)
+                vector = embedding_cache.get(key)
+                if vector is None:
+                    result = _uncached_embed_content(**kwargs)
+                    embedding_cache.put(key, model, result["embedding"])
+                    return result
+                return {"embedding": vector}
+
+            if isinstance(content, (list, tuple)) and all(isinstance(c, str) for c in content):
+                keys = [EmbeddingCache.make_key(model, c, options) for c in content]
+                vectors = [embedding_cache.get(key) for key in keys]
+                missing = [i for i, v in enumerate(vectors) if v is None]
+                if missing:
+                    result = _uncached_embed_content(**{**kwargs, "content": [content[i] for i in missing]})
+                    for i, vector in zip(missing, result["embedding"]):
+                        embedding_cache.put(keys[i], model, vector)
+                        vectors[i] = vector
+                return {"embedding": vectors}
+
+            return _uncached_embed_content(*args, **kwargs)
+
+        genai.embed_content = cached_embed_content
+        log_print(f"[EmbedCache] Embedding cache enabled -> {EMBED_CACHE_PATH} (max {EMBED_CACHE_SIZE} entries)")
+    except ImportError:
+        pass
+
+def apply_gemini_patches():
+    """Import the Gemini providers and apply all patches (idempotent, thread-safe)"""
+    global _gemini_patched
+    with _gemini_patch_lock:
+        if _gemini_patched:
+            return
+        _patch_genai_configure()
+        _patch_gemini_llm()
+        _patch_embed_logging()
+        _patch_embed_scheduler()
+        _patch_embed_cache()
+        _gemini_patched = True
 # ============== End Gemini Patches ==============
 
 # Initialize FastMCP server for mem0 tools
@@ -182,7 +491,7 @@ LOCAL_HYBRID_CONFIG = {
         "provider": "chroma",
         "config": {
             "collection_name": "agent_memory",
-            "path": "./local_mem0_db",  # Persistent local folder
+            "path": os.environ.get("MEM0_MCP_DB_PATH", "./local_mem0_db"),  # Persistent local folder
         }
     },
     "llm": {
@@ -201,22 +510,453 @@ LOCAL_HYBRID_CONFIG = {
     }
 }
 
-# Lazy-loaded mem0 client - initialized on first use
+# ============== Recall Cache ==============
+# Agents recall before every task, often with near-identical queries. Results are
+# cached per (namespace, normalized query) and invalidated by the namespace's store
+# write generation, which every write path bumps (including `--ingest` runs in
+# another process, via the marker file).
+DB_PATH = LOCAL_HYBRID_CONFIG["vector_store"]["config"]["path"]
+RECALL_CACHE_SIZE = int(os.environ.get("MEM0_MCP_RECALL_CACHE_SIZE", "256"))
+RECALL_CACHE_TTL = float(os.environ.get("MEM0_MCP_RECALL_CACHE_TTL", "300"))
+
+recall_cache = RecallCache(RECALL_CACHE_SIZE, RECALL_CACHE_TTL) if RECALL_CACHE_SIZE > 0 else None
+# A burst of agents asking the same thing before the cache is warm shares one
+# embed-and-search instead of each paying for it
+recall_flights = SingleFlight()
+search_flights = SingleFlight()
+
+# ============== Store Indexes ==============
+# In-memory indexes over each namespace, kept in step with its store generation:
+# - BM25 (lexical_index.py) for exact identifiers that embeddings miss
+# - content keys/SimHash (dedup_index.py) to short-circuit duplicate remembers
+# Writes made here are applied incrementally; a write from another process changes
+# the generation, and an index is then rebuilt from Chroma on its next use.
+LEXICAL_INDEX = os.environ.get("MEM0_MCP_LEXICAL_INDEX", "1").lower() not in ("0", "false", "no")
+RECALL_MODES = ("hybrid", "vector", "lexical")
+RECALL_LIMIT = 100  # mem0's default search limit
+RECALL_MAX_LIMIT = 500
+
+# Maximum SimHash distance (bits out of 64) for two texts to count as duplicates.
+# 0 only skips exact duplicates and leaves edits to mem0's update reconciliation;
+# -1 disables the check.
+DEDUP_DISTANCE = int(os.environ.get("MEM0_MCP_DEDUP_DISTANCE", "0"))
+# Payload keys holding the fingerprint and content key of the text a memory was extracted from
+SOURCE_FINGERPRINT_KEY = "source_simhash"
+SOURCE_CONTENT_KEY = "source_key"
+
+# "standin" swaps the Gemini LLM/embedder for deterministic offline providers
+# (standin_providers.py), e.g. for benchmarks; artificial latency is configurable
+PROVIDERS = os.environ.get("MEM0_MCP_PROVIDERS", "gemini").lower()
+STANDIN_LLM_LATENCY_MS = float(os.environ.get("MEM0_MCP_STANDIN_LLM_LATENCY_MS", "0"))
+STANDIN_EMBED_LATENCY_MS = float(os.environ.get("MEM0_MCP_STANDIN_EMBED_LATENCY_MS", "0"))
+
+# Lazy-loaded mem0 client for the default namespace - initialized on first use, or
+# pre-warmed at launch. Other namespaces share its LLM, embedder and history DB.
 _mem0_client = None
-DEFAULT_USER_ID = "cursor_mcp"
+_mem0_client_lock = threading.Lock()
 
-def get_mem0_client():
-    """Get or initialize the mem0 client (lazy loading for faster startup)"""
+def _init_mem0_client():
+    """Build the mem0 client once (imports providers, applies patches, opens Chroma)"""
     global _mem0_client
+    # Tools run on worker threads, so guard against double initialization
+    with _mem0_client_lock:
+        if _mem0_client is None:
+            log_print("[Mem0] Initializing memory client...")
+            from mem0 import Memory
+            if PROVIDERS == "standin":
+                from standin_providers import install_standin_providers
+                client = install_standin_providers(
+                    Memory.from_config(LOCAL_HYBRID_CONFIG),
+                    llm_latency_ms=STANDIN_LLM_LATENCY_MS,
+                    embed_latency_ms=STANDIN_EMBED_LATENCY_MS,
+                )
+                log_print("[Mem0] Using offline stand-in LLM and embedder")
+            else:
+                apply_gemini_patches()
+                client = Memory.from_config(LOCAL_HYBRID_CONFIG)
+            _instrument_chroma(client)
+            _mem0_client = client
+            log_print("[Mem0] Memory client ready!")
+    return _mem0_client
+
+def get_mem0_client():
+    """Get the mem0 client, waiting for the pre-warm if one is running"""
     if _mem0_client is None:
-        log_print("[Mem0] Initializing memory client...")
-        _mem0_client = Memory.from_config(LOCAL_HYBRID_CONFIG)
-        log_print("[Mem0] Memory client ready!")
+        future = _warmup_future
+        if future is not None:
+            try:
+                future.result()
+            except Exception:
+                pass  # warm-up failed; retry inline so the caller sees the real error
+        _init_mem0_client()
     return _mem0_client
 
+# ============== Namespaces ==============
+# Each namespace (namespaces.py) is its own Chroma collection with its own mem0
+# client, write generation and indexes. Tools take an explicit `namespace`; otherwise
+# the connection's namespace (SSE: ?namespace=...) or MEM0_MCP_NAMESPACE applies.
+DEFAULT_NAMESPACE = namespaces.validate(os.environ.get("MEM0_MCP_NAMESPACE"))
+
+connection_namespace = contextvars.ContextVar("connection_namespace", default=None)
+
+def request_namespace_param(request) -> str | None:
+    """Namespace named by an HTTP request: ?namespace=<name> or an X-Mem0-Namespace header"""
+    return request.query_params.get("namespace") or request.headers.get("x-mem0-namespace")
+
+def _mcp_request_namespace() -> str | None:
+    """Namespace of the HTTP request carrying the current tool call.
+
+    Streamable HTTP sessions run in the session manager's tasks, so the per-connection
+    contextvar set for SSE does not reach them; the request does.
+    """
+    from mcp.server.lowlevel.server import request_ctx
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        return None
+    return request_namespace_param(request) if request is not None and hasattr(request, "query_params") else None
+
+class Namespace:
+    """Per-namespace client, store generation, change feed and in-memory indexes"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.user_id = namespaces.user_id(name)
+        self.generation = StoreGeneration(namespaces.generation_path(DB_PATH, name))
+        self.lexical_index = LexicalIndex() if LEXICAL_INDEX else None
+        self.dedup_index = DedupIndex(DEDUP_DISTANCE) if DEDUP_DISTANCE >= 0 else None
+        self.change_log = ChangeLog()
+        self.index_lock = threading.Lock()
+        self.rebuild_lock = threading.Lock()  # one full index rebuild at a time
+        self.created_ts_backfilled = False
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def indexes(self) -> list:
+        return [index for index in (self.lexical_index, self.dedup_index) if index is not None]
+
+    def client(self):
+        """mem0 client bound to this namespace's collection"""
+        if self.name == namespaces.DEFAULT_NAMESPACE:
+            return get_mem0_client()
+        if self._client is None:
+            base = get_mem0_client()
+            with self._client_lock:
+                if self._client is None:
+                    from mem0 import Memory
+                    config = json.loads(json.dumps(LOCAL_HYBRID_CONFIG))
+                    config["vector_store"]["config"]["collection_name"] = namespaces.collection_name(self.name)
+                    client = Memory.from_config(config)
+                    client.llm, client.embedding_model = base.llm, base.embedding_model
+                    client.db.connection.close()
+                    client.db = base.db
+                    _instrument_chroma(client)
+                    self._client = client
+                    log_print(f"[Mem0] Namespace '{self.name}' ready")
+        return self._client
+
+    def loaded_client(self):
+        """The client if it has been built already (never triggers initialization)"""
+        return _mem0_client if self.name == namespaces.DEFAULT_NAMESPACE else self._client
+
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+
+def get_namespace(name: str | None = None) -> Namespace:
+    """Namespace by name: explicit, else the connection's, else the server default"""
+    name = namespaces.validate(name or connection_namespace.get() or _mcp_request_namespace() or DEFAULT_NAMESPACE)
+    namespace = _namespaces.get(name)
+    if namespace is None:
+        with _namespaces_lock:
+            namespace = _namespaces.setdefault(name, Namespace(name))
+    return namespace
+
+def record_write(namespace: Namespace, added=None, removed=None, updated=(), source: str = None):
+    """Bump a namespace's store generation and apply a write to its in-memory indexes
+    and change feed.
+
+    Args:
+        namespace: namespace that was written to
+        added: (memory_id, text) pairs that were added or updated
+        removed: memory ids that were deleted
+        updated: ids among added that were updates of existing memories
+        source: text the added memories were extracted from, for duplicate checks
+
+    Pass neither added nor removed when the exact change is unknown; the indexes
+    are then rebuilt on next use and change feed clients reload.
+    """
+    known = added is not None or removed is not None
+    with namespace.index_lock, namespace.change_log.lock:
+        previous = namespace.generation.current()
+        token = namespace.generation.bump()
+        updated = set(updated)
+        namespace.change_log.record(
+            previous, token,
+            added=[memory_id for memory_id, _ in added or () if memory_id not in updated],
+            updated=[memory_id for memory_id, _ in added or () if memory_id in updated],
+            removed=removed or (),
+            known=known,
+        )
+        for index in namespace.indexes:
+            # Someone else wrote since the index was synced: incremental updates would miss it
+            if not known or index.generation != previous:
+                index.generation = None
+                continue
+            for memory_id in removed or ():
+                index.remove(memory_id)
+            for memory_id, text in added or ():
+                index.add(memory_id, text, namespace.user_id)
+            index.generation = token
+        dedup_index = namespace.dedup_index
+        if source is not None and dedup_index is not None and dedup_index.generation == token:
+            for memory_id, _ in added or ():
+                dedup_index.add_source(memory_id, source)
+
+def add_result_changes(results) -> tuple:
+    """(added, removed, updated) from the result of mem0's Memory.add, for record_write"""
+    if results is None:
+        return None, None, ()
+    if isinstance(results, dict):
+        results = results.get("results", [])
+    added = [(r["id"], r["memory"]) for r in results if r.get("event") in ("ADD", "UPDATE")]
+    removed = [r["id"] for r in results if r.get("event") == "DELETE"]
+    updated = [r["id"] for r in results if r.get("event") == "UPDATE"]
+    return added, removed, updated
+
+def _sync_index(namespace: Namespace, index, rows, name: str):
+    """Rebuild an index from the store if the store changed since it was built.
+
+    The rebuild does not hold index_lock, so record_write is never stuck behind a
+    full scan. A write recorded meanwhile leaves the index at the older generation
+    (record_write only applies writes to an index at the previous one), so the next
+    sync rebuilds again rather than serving a copy that misses it.
+    """
+    if index.generation == namespace.generation.current():
+        return
+    with namespace.rebuild_lock:
+        generation = namespace.generation.current()
+        if index.generation == generation:
+            return
+        client = namespace.client()
+        started = time.perf_counter()
+        index.rebuild(rows(store_ops.iter_memories(client)), generation)
+        log_print(f"[{name}] Rebuilt '{namespace.name}' index: {len(index)} memories "
+                  f"in {time.perf_counter() - started:.2f}s")
+
+def _lexical_rows(memories):
+    for memory_id, payload in memories:
+        payload = payload or {}
+        yield memory_id, payload.get("data") or "", payload.get("user_id")
+
+def _dedup_rows(memories):
+    for memory_id, payload in memories:
+        payload = payload or {}
+        source = payload.get(SOURCE_FINGERPRINT_KEY)
+        source_key = payload.get(SOURCE_CONTENT_KEY)
+        yield (memory_id, payload.get("data") or "", payload.get("user_id"),
+               (int(source, 16),) if source else (), (int(source_key, 16),) if source_key else ())
+
+def lexical_search(namespace: Namespace, query: str, limit: int = RECALL_LIMIT) -> list:
+    """BM25 search, rebuilding the index first if the store changed elsewhere"""
+    _sync_index(namespace, namespace.lexical_index, _lexical_rows, "Lexical")
+    return namespace.lexical_index.search(query, namespace.user_id, limit)
+
+def find_duplicate(namespace: Namespace, text: str):
+    """Id of an existing duplicate memory of text, or None (also when dedup is off)"""
+    if namespace.dedup_index is None:
+        return None
+    _sync_index(namespace, namespace.dedup_index, _dedup_rows, "Dedup")
+    return namespace.dedup_index.find(text, namespace.user_id)
+
+def mem0_add(namespace: Namespace, text: str, metadata: dict = None):
+    """Memory.add that records the caller's metadata, the source text's fingerprints and
+    the creation time on the created memories"""
+    client = namespace.client()
+    results = client.add(text, user_id=namespace.user_id, metadata={
+        **(metadata or {}),
+        SOURCE_FINGERPRINT_KEY: format(simhash(text), "x"),
+        SOURCE_CONTENT_KEY: format(content_key(text), "x"),
+    })
+    added, _, _ = add_result_changes(results)
+    try:
+        store_ops.stamp_created_ts(client, [memory_id for memory_id, _ in added])
+    except Exception as e:
+        # The memories are stored; they just won't match date filters until the next backfill
+        log_print(f"[Search] Could not stamp {store_ops.CREATED_TS_KEY}: {e}")
+    return results
+
+# ============== Filtered Search ==============
+# recall and the manager search embed the query themselves and send limit, metadata
+# and creation-date filters to Chroma as one `where` clause, so filtering happens in
+# the index. Date filters use a numeric created_ts that every write path stamps;
+# memories from before it existed are backfilled on the first date-filtered search
+# or forget.
+
+def search_filter(namespace: Namespace, limit: int = None, metadata: dict = None,
+                  after: str = None, before: str = None) -> tuple:
+    """Validated (limit, where) for a search in a namespace"""
+    limit = RECALL_LIMIT if limit is None else max(1, min(int(limit), RECALL_MAX_LIMIT))
+    return limit, store_ops.build_where(namespace.user_id, metadata, after, before)
+
+def ensure_created_ts(namespace: Namespace):
+    """Backfill created_ts on older memories, once per namespace and process"""
+    if namespace.created_ts_backfilled:
+        return
+    with namespace.index_lock:
+        if not namespace.created_ts_backfilled:
+            stamped = store_ops.backfill_created_ts(namespace.client(), namespace.user_id)
+            if stamped:
+                log_print(f"[Search] Stamped {store_ops.CREATED_TS_KEY} on {stamped} older memories in '{namespace.name}'")
+            namespace.created_ts_backfilled = True
+
+def semantic_search(namespace: Namespace, query: str, where: dict, limit: int, min_score: float = None) -> list:
+    """Embed the query and return the nearest memories matching `where` (see store_ops.search)"""
+    client = namespace.client()
+    # Same call as Memory.search, so the embedding cache and scheduler apply
+    vector = client.embedding_model.embed(query)
+    return store_ops.search(client, vector, where, limit, min_score)
+
+# ============== Pre-warm ==============
+# Building the client (Chroma open, collection load, provider setup) takes seconds.
+# At launch it is started on a background thread so the first recall doesn't pay for it.
+PREWARM = os.environ.get("MEM0_MCP_PREWARM", "1").lower() not in ("0", "false", "no")
+
+_warmup_future = None
+_warmup_started_at = None
+_warmup_seconds = None
+
+def start_warmup():
+    """Start building the mem0 client in the background (no-op if already started)"""
+    global _warmup_future, _warmup_started_at
+    if _warmup_future is not None:
+        return _warmup_future
+    future = Future()
+
+    def warm():
+        global _warmup_seconds
+        try:
+            _init_mem0_client()
+            _warmup_seconds = time.perf_counter() - _warmup_started_at
+            log_print(f"[Mem0] Pre-warm finished in {_warmup_seconds:.2f}s")
+            future.set_result(True)
+        except Exception as e:
+            log_print(f"[Mem0] Pre-warm failed: {e}")
+            future.set_exception(e)
+
+    _warmup_started_at = time.perf_counter()
+    _warmup_future = future
+    threading.Thread(target=warm, name="mem0-prewarm", daemon=True).start()
+    return future
+
+def get_readiness() -> dict:
+    """Readiness of the mem0 client, for the /ready probe"""
+    future = _warmup_future
+    error = None
+    if future is not None and future.done() and future.exception() is not None:
+        error = str(future.exception())
+    return {
+        "ready": _mem0_client is not None,
+        "warming": future is not None and not future.done(),
+        "warmup_seconds": _warmup_seconds,
+        "error": error,
+    }
+
+# ============== Worker Pool ==============
+# mem0's Memory API is synchronous. Calling it directly from the async tools blocks
+# the event loop, so in SSE mode one slow `remember` would stall every client.
+# All mem0 calls are dispatched to this bounded pool instead.
+MEM0_WORKERS = max(1, int(os.environ.get("MEM0_MCP_WORKERS", "4")))
+
+_executor = ThreadPoolExecutor(max_workers=MEM0_WORKERS, thread_name_prefix="mem0-worker")
+_pool_lock = threading.Lock()
+_pool_stats = {
+    "queued": 0,           # submitted but not yet picked up by a worker
+    "running": 0,
+    "completed": 0,
+    "max_queued": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+}
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the mem0 worker pool without blocking the event loop"""
+    submitted = time.perf_counter()
+    with _pool_lock:
+        _pool_stats["queued"] += 1
+        _pool_stats["max_queued"] = max(_pool_stats["max_queued"], _pool_stats["queued"])
+
+    def job():
+        waited = time.perf_counter() - submitted
+        with _pool_lock:
+            _pool_stats["queued"] -= 1
+            _pool_stats["running"] += 1
+            _pool_stats["wait_seconds_total"] += waited
+            _pool_stats["wait_seconds_max"] = max(_pool_stats["wait_seconds_max"], waited)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with _pool_lock:
+                _pool_stats["running"] -= 1
+                _pool_stats["completed"] += 1
+
+    future = _executor.submit(job)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # The job never started, so it will never decrement the queue depth itself
+        if future.cancel():
+            with _pool_lock:
+                _pool_stats["queued"] -= 1
+        raise
+
+def get_pool_stats() -> dict:
+    """Snapshot of worker pool counters, used to size MEM0_MCP_WORKERS"""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    started = stats["completed"] + stats["running"]
+    stats["workers"] = MEM0_WORKERS
+    stats["wait_seconds_avg"] = stats["wait_seconds_total"] / started if started else 0.0
+    return stats
+
+# ============== Write-Behind Remember ==============
+# Opt-in: `remember` journals the text and returns a job id immediately, and a
+# background worker runs the mem0 pipeline. Pending jobs survive restarts.
+WRITE_BEHIND = os.environ.get("MEM0_MCP_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+WRITE_BEHIND_JOURNAL = os.environ.get("MEM0_MCP_WRITE_JOURNAL", "./remember_journal.jsonl")
+
+_write_behind = None
+_write_behind_lock = threading.Lock()
+
+def _write_behind_add(text: str, user_id: str, metadata: dict = None):
+    """Worker-side handler for queued remember jobs (the journal records the namespace's user id)"""
+    namespace = get_namespace(namespaces.namespace_of_user(user_id))
+    results = None
+    try:
+        results = mem0_add(namespace, text, metadata)
+    finally:
+        record_write(namespace, *add_result_changes(results), source=text)
+
+def get_write_behind() -> WriteBehindQueue:
+    """Get or start the write-behind queue (replays the journal on first use)"""
+    global _write_behind
+    if _write_behind is None:
+        with _write_behind_lock:
+            if _write_behind is None:
+                wb = WriteBehindQueue(WRITE_BEHIND_JOURNAL, _write_behind_add, log=log_print)
+                wb.start()
+                _write_behind = wb
+    return _write_behind
+
 def cleanup():
     """Cleanup function called on exit - closes ChromaDB connection properly"""
     global _mem0_client
+    if _write_behind is not None:
+        _write_behind.stop()
+    if embedding_cache is not None:
+        embedding_cache.close()
+    gemini_log.close()
+    _executor.shutdown(wait=False, cancel_futures=True)
     if _mem0_client is not None:
         log_print("[Mem0] Cleaning up...")
         try:
@@ -230,6 +970,144 @@ def cleanup():
         except Exception as e:
             log_print(f"[Mem0] Cleanup error (ignored): {e}")
 
+# ============== Bulk Ingestion ==============
+INGEST_CONCURRENCY = max(1, int(os.environ.get("MEM0_MCP_INGEST_CONCURRENCY", "8")))
+INGEST_BATCH_SIZE = max(1, int(os.environ.get("MEM0_MCP_INGEST_BATCH_SIZE", "64")))
+
+def ingest_memories(texts, namespace: Namespace = None, progress=None, metadata: dict = None) -> dict:
+    """Bulk-ingest an iterable of texts (see ingest.py) and invalidate cached recalls"""
+    from ingest import ingest_texts
+
+    namespace = namespace or get_namespace()
+    try:
+        return ingest_texts(
+            namespace.client(),
+            texts,
+            namespace.user_id,
+            concurrency=INGEST_CONCURRENCY,
+            batch_size=INGEST_BATCH_SIZE,
+            progress=progress,
+            metadata=metadata,
+        )
+    finally:
+        record_write(namespace)
+
+def ingest_jsonl_file(path: str, namespace: str = None) -> dict:
+    """CLI entry point: stream a JSONL file into the store, printing progress"""
+    from ingest import iter_jsonl_texts
+
+    def progress(stats):
+        log_print(f"[Ingest] {stats['texts']} texts -> {stats['memories']} memories, "
+                  f"{stats['failed']} failed, {stats['texts_per_second']:.1f} texts/s")
+
+    stats = ingest_memories(iter_jsonl_texts(path), get_namespace(namespace), progress=progress)
+    log_print(f"[Ingest] Done in {stats['seconds']:.1f}s: "
+              f"{json.dumps({k: v for k, v in stats.items() if k != 'errors'})}")
+    for error in stats["errors"]:
+        log_print(f"[Ingest] Error: {error}")
+    return stats
+
+# ============== Verbatim Remember ==============
+# Code blocks and logs should be stored as they are; running them through mem0's
+# fact-extraction and update prompts costs two LLM calls and loses detail. The
+# verbatim path is one embedding call and one Chroma insert (ingest.store_verbatim).
+RAW_AUTO = os.environ.get("MEM0_MCP_RAW_AUTO", "1").lower() not in ("0", "false", "no")
+
+def should_store_raw(text: str, raw: bool | None) -> bool:
+    """Explicit choice if given, otherwise the code-like heuristic (when enabled)"""
+    if raw is not None:
+        return raw
+    if not RAW_AUTO:
+        return False
+    from ingest import looks_like_code
+    return looks_like_code(text)
+
+def store_raw(namespace: Namespace, texts: list, metadata: dict = None) -> list:
+    """Store texts verbatim, skipping LLM fact extraction; returns the new memory ids"""
+    from ingest import store_verbatim
+
+    texts = [text for text in texts if text]
+    try:
+        ids = store_verbatim(namespace.client(), texts, namespace.user_id, metadata)
+    except Exception:
+        record_write(namespace)
+        raise
+    record_write(namespace, added=list(zip(ids, texts)))
+    return ids
+
+# ============== Shared Write and Search Paths ==============
+# Used by the MCP tools and the memory manager API alike
+
+def store_memory(namespace: Namespace, text: str, raw: bool | None = None, queue: bool = False,
+                 metadata: dict = None) -> dict:
+    """Store one text: duplicate check, then verbatim or through mem0.
+
+    Returns a dict with one of "duplicate_of" (existing id), "job_id" (queued in
+    write-behind mode, only when queue is true) or "ids" (new or updated memory ids),
+    plus "raw" telling whether the text was stored verbatim. Texts with metadata
+    skip the duplicate check, so the metadata is never silently dropped.
+    """
+    metadata = store_ops.check_write_metadata(metadata)
+    raw = should_store_raw(text, raw)
+    duplicate = None if metadata else find_duplicate(namespace, text)
+    if duplicate is not None:
+        # mem0 would have run fact extraction plus the update prompt, and embedded the facts
+        namespace.dedup_index.record_duplicate(llm_calls=0 if raw else 2, embed_calls=1)
+        return {"duplicate_of": duplicate, "raw": raw}
+    # Verbatim stores are a single embedding call, so they never go through write-behind
+    if raw:
+        return {"ids": store_raw(namespace, [text], metadata), "raw": True}
+    if queue:
+        return {"job_id": get_write_behind().submit(text, namespace.user_id, metadata), "raw": False}
+    results = None
+    try:
+        results = mem0_add(namespace, text, metadata)
+    finally:
+        added, removed, updated = add_result_changes(results)
+        record_write(namespace, added, removed, updated, source=text)
+    return {"ids": [memory_id for memory_id, _ in added], "raw": False}
+
+def delete_memories(namespace: Namespace, memory_ids: list = None, before: str = None, metadata: dict = None) -> tuple:
+    """Delete by ids, or by a before/metadata filter.
+
+    Returns:
+        (deleted_count, missing_ids)
+    """
+    client = namespace.client()
+    if memory_ids:
+        deleted, missing = store_ops.delete_by_ids(client, memory_ids)
+        if deleted:
+            record_write(namespace, removed=deleted)
+        return len(deleted), missing
+    if before:
+        ensure_created_ts(namespace)
+    deleted_count = store_ops.delete_by_filter(client, namespace.user_id, before, metadata)
+    if deleted_count:
+        record_write(namespace)
+    return deleted_count, []
+
+def namespace_sizes() -> list:
+    """Every namespace in the store with its number of memories"""
+    chroma = get_mem0_client().vector_store.client
+    return [
+        {"namespace": name, "memories": chroma.get_collection(namespaces.collection_name(name)).count()}
+        for name in namespaces.list_namespaces(chroma)
+    ]
+
+async def search_memories(namespace: Namespace, query: str, limit: int = None, min_score: float = None,
+                          metadata: dict = None, after: str = None, before: str = None) -> list:
+    """Filtered semantic search, shared with identical searches already in flight"""
+    limit, where = search_filter(namespace, limit, metadata, after, before)
+
+    async def search():
+        if after or before:
+            await run_blocking(ensure_created_ts, namespace)
+        return await run_blocking(semantic_search, namespace, query, where, limit, min_score)
+
+    key = RecallCache.make_key(query, namespace.user_id, namespace.name, limit, min_score,
+                               json.dumps(where, sort_keys=True), namespace.generation.current())
+    return await search_flights.run(key, search)
+
 # Register cleanup handlers
 atexit.register(cleanup)
 
@@ -254,83 +1132,193 @@ if sys.platform == "win32":
     - Detailed comments explaining the logic, especially for complex sections
     - Example usage or test cases demonstrating the code
     - Any known limitations, edge cases, or performance considerations
-    The memory will be indexed for semantic search and can be recalled later using natural language queries."""
+    The memory will be indexed for semantic search and can be recalled later using natural language queries.
+    Code-like content is stored verbatim (no summarization); set raw=true to force that for any text,
+    or raw=false to always extract facts.
+    If the server runs in write-behind mode, this returns a job id right away; check it with remember_status.
+    Attach metadata (e.g. {"project": "api", "kind": "decision"}) to filter on it later in recall and forget.
+    Pass namespace to store into a specific namespace (e.g. one per project); see list_namespaces."""
 )
-async def remember(text: str) -> str:
+@instrumented
+async def remember(
+    text: str,
+    raw: bool | None = None,
+    namespace: str | None = None,
+    metadata: dict[str, str | int | float | bool] | None = None,
+) -> str:
     """Remember information for future reference.
 
     Store code snippets, implementation patterns, programming knowledge, or any information.
     
     Args:
         text: The content to remember - code, documentation, preferences, or any knowledge
+        raw: Store the text verbatim (true) or extract facts with the LLM (false).
+            Omit to store code-like text verbatim automatically.
+        namespace: Memory namespace (e.g. a project); defaults to the connection's namespace.
+        metadata: Key/value pairs stored with the memory, for recall and forget filters.
     """
     try:
-        # Local Memory uses .add() directly with text content
-        client = get_mem0_client()
-        client.add(text, user_id=DEFAULT_USER_ID)
+        outcome = await run_blocking(store_memory, get_namespace(namespace), text, raw, WRITE_BEHIND, metadata)
+        if "duplicate_of" in outcome:
+            return f"Already remembered as memory {outcome['duplicate_of']}; skipped duplicate: {text[:100]}..."
+        if "job_id" in outcome:
+            return f"Queued memory for storage (job {outcome['job_id']}): {text[:100]}..."
+        if outcome["raw"]:
+            return f"Successfully added preference (stored verbatim): {text[:100]}..."
         return f"Successfully added preference: {text[:100]}..."
     except Exception as e:
         return f"Error adding preference: {str(e)}"
 
 @mcp.tool(
-    description="""Recall all stored memories. Call this tool when you need complete context of everything remembered.
+    description="""Remember many pieces of information in one call. Use this instead of repeated
+    remember calls when seeding knowledge, e.g. importing notes or documentation for a project.
+    Facts are extracted in parallel and embedded and stored in batches, which is much faster
+    than one remember call per item. Code-like items are stored verbatim, as with remember.
+    Metadata, if given, is stored with every memory. Returns a summary with counts and throughput."""
+)
+@instrumented
+async def remember_batch(texts: list[str], raw: bool | None = None, namespace: str | None = None,
+                         metadata: dict[str, str | int | float | bool] | None = None, ctx: Context = None) -> str:
+    """Remember many texts at once.
+
+    Args:
+        texts: The contents to remember, one memory source per item
+        raw: Store every item verbatim (true) or extract facts from every item (false).
+            Omit to store code-like items verbatim automatically.
+        namespace: Memory namespace (e.g. a project); defaults to the connection's namespace.
+        metadata: Key/value pairs stored with every memory, for recall and forget filters.
+    """
+    try:
+        ns = get_namespace(namespace)
+        metadata = store_ops.check_write_metadata(metadata)
+        loop = asyncio.get_running_loop()
+
+        def progress(stats):
+            if ctx is not None:
+                asyncio.run_coroutine_threadsafe(ctx.report_progress(stats["texts"], len(texts)), loop)
+
+        def classify():
+            verbatim, extracted, duplicates = [], [], 0
+            seen = set()
+            for text in texts:
+                as_raw = should_store_raw(text, raw)
+                # Repeats within the batch are collapsed by the same rule as exact duplicates
+                key = content_key(text) if ns.dedup_index is not None else text
+                if key in seen or (not metadata and find_duplicate(ns, text) is not None):
+                    if ns.dedup_index is not None:
+                        ns.dedup_index.record_duplicate(llm_calls=0 if as_raw else 1, embed_calls=1)
+                    duplicates += 1
+                else:
+                    seen.add(key)
+                    (verbatim if as_raw else extracted).append(text)
+            return verbatim, extracted, duplicates
+
+        verbatim, extracted, duplicates = await run_blocking(classify)
+        stats = {"texts": 0, "memories": 0, "failed": 0}
+        if extracted:
+            stats = await run_blocking(ingest_memories, extracted, ns, progress, metadata)
+        if verbatim:
+            ids = await run_blocking(store_raw, ns, verbatim, metadata)
+            stats["texts"] += len(verbatim)
+            stats["memories"] += len(ids)
+            stats["verbatim"] = len(ids)
+        stats["duplicates"] = duplicates
+        return json.dumps(stats, indent=2)
+    except Exception as e:
+        return f"Error adding memories: {str(e)}"
+
+@mcp.tool(
+    description="""Check the status of queued remember jobs (write-behind mode).
+    Pass the job ids returned by remember to get pending, done or failed per job.
+    Without ids, returns the number of jobs in each state."""
+)
+@instrumented
+async def remember_status(job_ids: list[str] | None = None) -> str:
+    """Report the status of write-behind remember jobs.
+
+    Args:
+        job_ids: Job ids returned by remember. Omit to get counts per status.
+    """
+    try:
+        if not WRITE_BEHIND:
+            return "Write-behind mode is disabled; remember stores memories synchronously."
+        wb = get_write_behind()
+        if not job_ids:
+            return json.dumps(wb.counts(), indent=2)
+        statuses = [wb.status(job_id) or {"job_id": job_id, "status": "unknown"} for job_id in job_ids]
+        return json.dumps(statuses, indent=2)
+    except Exception as e:
+        return f"Error getting job status: {str(e)}"
+
+@mcp.tool(
+    description="""Recall stored memories page by page. Call this tool when you need complete context of everything remembered.
     This is useful when:
     - You need to see all available knowledge
     - You want to review the full history of stored information
     - You want to ensure no relevant information is missed
-    Returns a comprehensive list of all memories in JSON format with metadata including memory IDs for deletion."""
+    Returns compact JSON: {"memories": [...], "next_cursor": ...}. Each memory includes its ID for deletion.
+    Pass next_cursor back to get the following page; it is null on the last page.
+    Use fields to pick what each memory contains (id, memory, created_at, updated_at, hash, metadata)."""
 )
-async def recall_all() -> str:
-    """Recall all stored memories.
+@instrumented
+async def recall_all(limit: int = 100, cursor: str | None = None, fields: list[str] | None = None,
+                     namespace: str | None = None) -> str:
+    """Recall stored memories, one page at a time.
 
-    Returns a JSON formatted list of all memories, including:
+    Returns compact JSON with a page of memories and the cursor for the next page.
+    By default each memory has:
     - Memory ID (for deletion with forget)
     - Memory content
     - Creation timestamp
+
+    Args:
+        limit: Maximum memories per page (1-500).
+        cursor: next_cursor from the previous page; omit for the first page.
+        fields: Fields to include per memory; defaults to id, memory and created_at.
+        namespace: Memory namespace (e.g. a project); defaults to the connection's namespace.
     """
     try:
-        client = get_mem0_client()
-        memories = client.get_all(user_id=DEFAULT_USER_ID)
-        # Handle both list and dict response formats - preserve full memory objects with IDs
-        if isinstance(memories, dict) and "results" in memories:
-            formatted_memories = [{"id": m.get("id"), "memory": m.get("memory"), "created_at": m.get("created_at")} for m in memories["results"]]
-        elif isinstance(memories, list):
-            formatted_memories = [{"id": m.get("id"), "memory": m.get("memory"), "created_at": m.get("created_at")} for m in memories]
-        else:
-            formatted_memories = memories
-        return json.dumps(formatted_memories, indent=2)
+        ns = get_namespace(namespace)
+        client = await run_blocking(ns.client)
+        memories, next_cursor = await run_blocking(store_ops.list_page, client, ns.user_id, limit, cursor, fields)
+        return json.dumps({"memories": memories, "next_cursor": next_cursor}, separators=(",", ":"), ensure_ascii=False)
     except Exception as e:
         return f"Error getting preferences: {str(e)}"
 
 @mcp.tool(
-    description="""Forget specific memories by their IDs. Use this tool to remove memories that are:
+    description="""Forget memories by their IDs or by a filter. Use this tool to remove memories that are:
     - No longer relevant or outdated
     - Incorrect or contain errors
     - Duplicates of other memories
     - Requested by the user to be forgotten
-    You can delete one or multiple memories at once by providing their IDs.
-    Use recall_all first to see available memories and their IDs."""
+    You can delete one or multiple memories at once by providing their IDs (use recall_all to find them).
+    Alternatively, delete everything created before a date (ISO format, e.g. "2025-01-31")
+    and/or matching exact metadata values, without listing the memories first."""
 )
-async def forget(memory_ids: list[str]) -> str:
-    """Forget specific memories by their IDs.
+@instrumented
+async def forget(
+    memory_ids: list[str] | None = None,
+    before: str | None = None,
+    metadata: dict[str, str | int | float | bool] | None = None,
+    namespace: str | None = None,
+) -> str:
+    """Forget memories by ID or by filter.
 
     Args:
         memory_ids: List of memory IDs to delete. Get IDs from recall_all.
+        before: Delete memories created before this ISO date/datetime.
+        metadata: Delete memories whose metadata matches all of these key/value pairs.
+        namespace: Memory namespace (e.g. a project); defaults to the connection's namespace.
     """
     try:
-        client = get_mem0_client()
-        deleted = []
-        errors = []
-        for memory_id in memory_ids:
-            try:
-                client.delete(memory_id)
-                deleted.append(memory_id)
-            except Exception as e:
-                errors.append(f"{memory_id}: {str(e)}")
+        if not memory_ids and not before and not metadata:
+            return "Error deleting memories: provide memory_ids, or a before/metadata filter."
+        deleted_count, missing = await run_blocking(
+            delete_memories, get_namespace(namespace), memory_ids, before, metadata)
         
-        result = f"Successfully deleted {len(deleted)} memory(ies)."
-        if errors:
-            result += f" Errors: {'; '.join(errors)}"
+        result = f"Successfully deleted {deleted_count} memory(ies)."
+        if missing:
+            result += f" Errors: {'; '.join(f'{memory_id}: not found' for memory_id in missing)}"
         return result
     except Exception as e:
         return f"Error deleting memories: {str(e)}"
@@ -344,39 +1332,279 @@ async def forget(memory_ids: list[str]) -> str:
     - Technical documentation and examples
     The search uses natural language understanding to find relevant matches, so you can
     describe what you're looking for in plain English. Always recall before providing answers
-    to ensure you leverage existing knowledge."""
+    to ensure you leverage existing knowledge.
+    By default semantic matches are combined with exact keyword matches, so identifiers such as
+    error codes, function names and CLI flags are found too. Use mode="lexical" for a fast
+    exact-token lookup, or mode="vector" for semantic search only.
+    Each result has the memory's id, text, created_at and similarity score (null for exact
+    keyword matches), so no follow-up recall_all is needed. Narrow the search with limit,
+    min_score, exact metadata values, or a creation-date range (after/before, ISO dates)."""
 )
-async def recall(query: str) -> str:
-    """Recall memories using semantic search.
+@instrumented
+async def recall(
+    query: str,
+    mode: str = "hybrid",
+    namespace: str | None = None,
+    limit: int | None = None,
+    min_score: float | None = None,
+    metadata: dict[str, str | int | float | bool] | None = None,
+    after: str | None = None,
+    before: str | None = None,
+) -> str:
+    """Recall memories using semantic and keyword search.
 
     The search is powered by natural language understanding, allowing you to find relevant
     stored knowledge. Results are ranked by relevance to your query.
 
     Args:
         query: What you're looking for - can be natural language or specific terms.
+        mode: "hybrid" (default), "vector" (semantic only) or "lexical" (exact tokens only).
+        namespace: Memory namespace (e.g. a project); defaults to the connection's namespace.
+        limit: Maximum number of memories to return (default 100).
+        min_score: Only memories with at least this semantic similarity (0-1); exact keyword
+            matches without one are left out. Not available with mode="lexical".
+        metadata: Only memories whose metadata matches all of these key/value pairs.
+        after: Only memories created at or after this ISO date/datetime.
+        before: Only memories created before this ISO date/datetime.
     """
     try:
-        client = get_mem0_client()
-        memories = client.search(query, user_id=DEFAULT_USER_ID)
-        # Handle both list and dict response formats
-        if isinstance(memories, dict) and "results" in memories:
-            flattened_memories = [memory.get("memory", memory) for memory in memories["results"]]
-        elif isinstance(memories, list):
-            flattened_memories = [memory.get("memory", memory) for memory in memories]
-        else:
-            flattened_memories = memories
-        return json.dumps(flattened_memories, indent=2)
+        if mode not in RECALL_MODES:
+            return f"Error searching preferences: mode must be one of {', '.join(RECALL_MODES)}"
+        ns = get_namespace(namespace)
+        if ns.lexical_index is None:
+            if mode == "lexical":
+                return "Error searching preferences: the lexical index is disabled (MEM0_MCP_LEXICAL_INDEX=0)"
+            mode = "vector"
+        if mode == "lexical" and min_score is not None:
+            return "Error searching preferences: min_score needs semantic scores; use mode hybrid or vector"
+        limit, where = search_filter(ns, limit, metadata, after, before)
+        filtered = bool(metadata or after or before)
+
+        # Read the generation before searching so a concurrent write invalidates this result
+        generation = ns.generation.current()
+        cache_key = RecallCache.make_key(query, ns.user_id, ns.name, mode, limit, min_score,
+                                         json.dumps(where, sort_keys=True))
+        if recall_cache is not None:
+            cached = recall_cache.get(cache_key, generation)
+            if cached is not None:
+                return cached
+
+        async def search() -> str:
+            if after or before:
+                await run_blocking(ensure_created_ts, ns)
+            memories, keyword_hits = [], []
+            if mode == "hybrid":
+                memories, keyword_hits = await asyncio.gather(
+                    run_blocking(semantic_search, ns, query, where, limit, min_score),
+                    run_blocking(lexical_search, ns, query, limit),
+                )
+            elif mode == "vector":
+                memories = await run_blocking(semantic_search, ns, query, where, limit, min_score)
+            else:
+                # No embedding call at all
+                keyword_hits = await run_blocking(lexical_search, ns, query, limit)
+
+            if mode == "vector":
+                results = memories
+            else:
+                # Reciprocal rank fusion of both rankings; keyword-only hits are read from
+                # Chroma, which also applies the filters to them, before the fused list is cut
+                # to limit. They have no similarity score, so with min_score keyword matches
+                # only re-rank the semantic matches above it.
+                found = {memory["id"]: memory for memory in memories}
+                semantic_ids = list(found)
+                keyword_ids = [memory_id for memory_id, _ in keyword_hits
+                               if min_score is None or memory_id in found]
+                missing = [memory_id for memory_id in keyword_ids if memory_id not in found]
+                if missing:
+                    client = await run_blocking(ns.client)
+                    extra = await run_blocking(store_ops.get_memories, client, missing,
+                                               ("id", "memory", "created_at"), where if filtered else None)
+                    found.update({memory_id: dict(memory, score=None) for memory_id, memory in extra.items()})
+                keyword_ids = [memory_id for memory_id in keyword_ids
+                               if memory_id in found and found[memory_id].get("memory") is not None]
+                ranked = reciprocal_rank_fusion([semantic_ids, keyword_ids])[:limit]
+                results = [found[memory_id] for memory_id in ranked]
+            result = json.dumps(results, indent=2)
+            if recall_cache is not None:
+                recall_cache.put(cache_key, generation, result)
+            return result
+
+        return await recall_flights.run(cache_key + (generation,), search)
     except Exception as e:
         return f"Error searching preferences: {str(e)}"
 
+@mcp.tool(
+    description="""List memory namespaces and how many memories each holds. Namespaces (e.g. one per
+    project or workspace) are stored and searched separately; pass a name as the namespace argument
+    of the other memory tools. Also shows which namespace this connection uses by default."""
+)
+@instrumented
+async def list_namespaces() -> str:
+    """List memory namespaces with their sizes."""
+    try:
+        current = get_namespace().name
+        return json.dumps({"current": current, "namespaces": await run_blocking(namespace_sizes)}, indent=2)
+    except Exception as e:
+        return f"Error listing namespaces: {str(e)}"
+
+# ============== HTTP Transports ==============
+# The HTTP server speaks Streamable HTTP at /mcp and legacy SSE at /sse. Streamable
+# HTTP clients make plain POSTs against a reusable session (Mcp-Session-Id) instead of
+# holding an event stream open, so one server can take a whole team's agents.
+# 0 means no limit (the session manager itself rejects anything but a positive number)
+MAX_SESSIONS = int(os.environ.get("MEM0_MCP_MAX_SESSIONS", "256"))
+MAX_SESSIONS = MAX_SESSIONS if MAX_SESSIONS > 0 else None
+SESSION_IDLE_TIMEOUT = float(os.environ.get("MEM0_MCP_SESSION_IDLE_TIMEOUT", "1800"))
+SESSION_IDLE_TIMEOUT = SESSION_IDLE_TIMEOUT if 0 < SESSION_IDLE_TIMEOUT < float("inf") else None
+# Answer tool calls with a JSON body instead of a short-lived SSE stream per request
+# (progress notifications of remember_batch are then not delivered)
+HTTP_JSON_RESPONSE = os.environ.get("MEM0_MCP_HTTP_JSON_RESPONSE", "").lower() in ("1", "true", "yes")
+# Agents call tools seconds apart; uvicorn's 5s default keeps reopening connections
+HTTP_KEEP_ALIVE = int(os.environ.get("MEM0_MCP_HTTP_KEEP_ALIVE", "75"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("MEM0_MCP_HTTP_MAX_CONNECTIONS", "0"))  # 0 = no limit
+
+_session_manager = None  # StreamableHTTPSessionManager of the running HTTP app
+
+def _http_sessions() -> int:
+    # The session manager keeps no public count of its open sessions
+    return len(getattr(_session_manager, "_server_instances", ()))
+
+def _loaded_namespaces() -> list:
+    with _namespaces_lock:
+        return list(_namespaces.values())
+
+def _store_size():
+    # Only namespaces whose client is built; a scrape must not trigger initialization
+    sizes = {}
+    for ns in _loaded_namespaces():
+        client = ns.loaded_client()
+        if client is not None:
+            sizes[(ns.name,)] = client.vector_store.collection.count()
+    return sizes or None
+
+def _dedup_avoided():
+    indexes = [ns.dedup_index for ns in _loaded_namespaces() if ns.dedup_index is not None]
+    return {("llm",): sum(index.avoided_llm_calls for index in indexes),
+            ("embedding",): sum(index.avoided_embed_calls for index in indexes)}
+
+def _scheduler_metric(key):
+    return lambda: {(model,): stats[key] for model, stats in gemini_scheduler.stats().items()} or None
+
+def _pool_metric(key):
+    return lambda: get_pool_stats()[key]
+
+def _coalesced_calls():
+    return {("recall",): recall_flights.collapsed, ("manager_search",): search_flights.collapsed}
+
+def _cache_metric(key):
+    return lambda: {("embedding",): get_embedding_cache_stats().get(key, 0),
+                    ("recall",): recall_cache.stats()[key] if recall_cache is not None else 0}
+
+metrics.callback("mem0_mcp_store_memories", "Memories per namespace collection", _store_size, ("namespace",))
+metrics.callback("mem0_mcp_pool_queued", "mem0 calls waiting for a worker thread", _pool_metric("queued"))
+metrics.callback("mem0_mcp_pool_running", "mem0 calls running on a worker thread", _pool_metric("running"))
+metrics.callback("mem0_mcp_pool_completed_total", "mem0 calls completed by the worker pool",
+                 _pool_metric("completed"), kind="counter")
+metrics.callback("mem0_mcp_cache_hits_total", "Cache hits", _cache_metric("hits"), ("cache",), kind="counter")
+metrics.callback("mem0_mcp_cache_misses_total", "Cache misses", _cache_metric("misses"), ("cache",), kind="counter")
+metrics.callback("mem0_mcp_coalesced_calls_total", "Searches that joined an identical search already in flight",
+                 _coalesced_calls, ("endpoint",), kind="counter")
+metrics.callback("mem0_mcp_dedup_avoided_calls_total", "API calls avoided by skipping duplicate remembers",
+                 _dedup_avoided, ("kind",), kind="counter")
+metrics.callback("mem0_mcp_gemini_throttled_total", "Gemini calls rejected with 429",
+                 _scheduler_metric("throttled"), ("model",), kind="counter")
+metrics.callback("mem0_mcp_gemini_retries_total", "Gemini calls retried after a 429 or 5xx",
+                 _scheduler_metric("retries"), ("model",), kind="counter")
+metrics.callback("mem0_mcp_gemini_queued", "Gemini calls waiting for the rate limiter",
+                 _scheduler_metric("queued"), ("model",))
+metrics.callback("mem0_mcp_gemini_queue_wait_seconds_total", "Time Gemini calls spent waiting for the rate limiter",
+                 _scheduler_metric("wait_seconds_total"), ("model",), kind="counter")
+metrics.callback("mem0_mcp_http_sessions", "Open Streamable HTTP sessions", _http_sessions)
+metrics.callback("mem0_mcp_ready", "1 once the mem0 client is initialized", lambda: int(_mem0_client is not None))
+
+def get_server_stats() -> dict:
+    """Counters from the worker pool, caches and request log"""
+    return {
+        "pool": get_pool_stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "recall_cache": recall_cache.stats() if recall_cache is not None else {},
+        "single_flight": {"recall": recall_flights.stats(), "manager_search": search_flights.stats()},
+        "namespaces": {
+            ns.name: {
+                "lexical_index": ns.lexical_index.stats() if ns.lexical_index is not None else {},
+                "dedup": ns.dedup_index.stats() if ns.dedup_index is not None else {},
+                "change_log": ns.change_log.stats(),
+            }
+            for ns in _loaded_namespaces()
+        },
+        "gemini_log": gemini_log.stats(),
+        "readiness": get_readiness(),
+        "gemini_scheduler": gemini_scheduler.stats(),
+        "http_sessions": {"open": _http_sessions(), "max": MAX_SESSIONS},
+    }
+
+@mcp.tool(
+    description="""Show recent server diagnostics: captured warnings and errors (stdio mode),
+    plus worker pool, cache and log counters. Use this when memory tools misbehave."""
+)
+@instrumented
+async def diagnostics(lines: int = 100) -> str:
+    """Dump recent diagnostics.
+
+    Args:
+        lines: Number of most recent stderr lines to include.
+    """
+    report = get_server_stats()
+    if stderr_buffer is not None:
+        report["stderr_total_lines"] = stderr_buffer.total_lines
+        report["stderr"] = stderr_buffer.recent(max(0, min(lines, STDERR_BUFFER_LINES)))
+    return json.dumps(report, indent=2, default=str)
+
 def create_starlette_app(mcp_server: Server, *, debug: bool = False):
-    """Create a Starlette application that can serve the provided mcp server with SSE."""
+    """Create a Starlette application that serves the provided mcp server over
+    Streamable HTTP (/mcp) and SSE (/sse)."""
+    global _session_manager
     # Lazy load SSE imports only when this function is called
     Starlette, SseServerTransport, Request, Mount, Route, _ = get_sse_imports()
+    from starlette.responses import JSONResponse, Response
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
     
     sse = SseServerTransport("/messages/")
+    session_manager = _session_manager = StreamableHTTPSessionManager(
+        app=mcp_server,
+        json_response=HTTP_JSON_RESPONSE,
+        session_idle_timeout=SESSION_IDLE_TIMEOUT,
+        max_sessions=MAX_SESSIONS,
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
 
-    async def handle_sse(request) -> None:
+    async def handle_stats(request):
+        return JSONResponse(get_server_stats())
+
+    async def handle_metrics(request):
+        # Rendering calls Chroma (store size); a thread of its own keeps scrapes
+        # working even when the mem0 worker pool is saturated
+        body = await asyncio.to_thread(metrics.render)
+        return Response(body, media_type=MetricsRegistry.CONTENT_TYPE)
+
+    async def handle_ready(request):
+        readiness = get_readiness()
+        return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+    async def handle_sse(request):
+        # Per-connection namespace: /sse?namespace=<name> or an X-Mem0-Namespace header.
+        # Tool calls of this session run inside this context and inherit it.
+        namespace = request_namespace_param(request)
+        if namespace:
+            try:
+                connection_namespace.set(namespaces.validate(namespace))
+            except ValueError as e:
+                return JSONResponse({"error": str(e)}, status_code=400)
         async with sse.connect_sse(
                 request.scope,
                 request.receive,
@@ -387,12 +1615,44 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False):
                 write_stream,
                 mcp_server.create_initialization_options(),
             )
+        return Response()
+
+    class StreamableHTTPEndpoint:
+        """/mcp; a class instance, so Route hands it the raw ASGI call"""
+
+        async def __call__(self, scope, receive, send):
+            # Same namespace selection as /sse, read again by each tool call (get_namespace)
+            namespace = request_namespace_param(Request(scope, receive))
+            if namespace:
+                try:
+                    namespaces.validate(namespace)
+                except ValueError as e:
+                    await JSONResponse({"error": str(e)}, status_code=400)(scope, receive, send)
+                    return
+            await session_manager.handle_request(scope, receive, send)
+
+    # Memory Manager UI and REST API on the same warm client (see manager_api.py)
+    from manager_api import create_manager_app
+    manager_app = create_manager_app(
+        get_namespace=get_namespace,
+        run_blocking=run_blocking,
+        store_memory=store_memory,
+        delete_memories=delete_memories,
+        namespace_sizes=namespace_sizes,
+        search_memories=search_memories,
+    )
 
     return Starlette(
         debug=debug,
+        lifespan=lifespan,
         routes=[
+            Route("/mcp", endpoint=StreamableHTTPEndpoint(), methods=["GET", "POST", "DELETE"]),
             Route("/sse", endpoint=handle_sse),
+            Route("/stats", endpoint=handle_stats),
+            Route("/ready", endpoint=handle_ready),
+            Route("/metrics", endpoint=handle_metrics),
             Mount("/messages/", app=sse.handle_post_message),
+            Mount("/manager", app=manager_app),
         ],
     )
 
@@ -401,18 +1661,39 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description='Run MCP server')
-    parser.add_argument('--host', default='0.0.0.0', help='Host to bind to (SSE mode)')
-    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (SSE mode)')
-    parser.add_argument('--stdio', action='store_true', help='Run in stdio mode for VS Code integration')
+    parser.add_argument('--host', default='0.0.0.0', help='Host to bind to (HTTP mode)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (HTTP mode)')
+    parser.add_argument('--transport', choices=['http', 'stdio'], default='http',
+                        help='http: Streamable HTTP at /mcp plus SSE at /sse (default); stdio: for VS Code integration')
+    parser.add_argument('--stdio', action='store_true', help='Same as --transport stdio')
+    parser.add_argument('--ingest', metavar='FILE', help='Bulk-import memories from a JSONL file and exit')
+    parser.add_argument('--namespace', help='Namespace for --ingest (default: MEM0_MCP_NAMESPACE or "default")')
     args = parser.parse_args()
 
-    if args.stdio:
+    if args.ingest:
+        stats = ingest_jsonl_file(args.ingest, args.namespace)
+        sys.exit(1 if stats["failed"] else 0)
+
+    if PREWARM:
+        start_warmup()
+
+    if WRITE_BEHIND:
+        # Start draining jobs left over from a previous run right away
+        get_write_behind()
+
+    if args.stdio or args.transport == 'stdio':
         # Run in stdio mode (for VS Code/Copilot integration)
         mcp.run(transport='stdio')
     else:
-        # Run in SSE mode (for HTTP-based clients)
-        # Load SSE imports only in SSE mode
+        # Run in HTTP mode (Streamable HTTP and SSE clients)
+        # Load HTTP imports only in HTTP mode
         _, _, _, _, _, uvicorn = get_sse_imports()
         mcp_server = mcp._mcp_server
         starlette_app = create_starlette_app(mcp_server, debug=True)
-        uvicorn.run(starlette_app, host=args.host, port=args.port)
+        uvicorn.run(
+            starlette_app,
+            host=args.host,
+            port=args.port,
+            timeout_keep_alive=HTTP_KEEP_ALIVE,
+            limit_concurrency=HTTP_MAX_CONNECTIONS or None,
+        )
@@ -0,0 +1,994 @@
+"""
+Memory Manager REST API and web UI, served by the MCP server process.
+
+`create_starlette_app` in main.py mounts this app at /manager, so the manager
+reads and writes through the server's warm mem0 client instead of opening a
+second Chroma handle on the same store. The UI uses relative URLs and works
+both under /manager/ and behind the `memory_manager.py` proxy.
+
+Listings carry a strong ETag derived from the namespace's store write
+generation (plus the query and the content coding actually sent), and
+`If-None-Match` is answered with 304 before the store is touched, so refreshing
+the UI over an unchanged store costs one marker-file read. Large responses are
+gzipped.
+
+After the first load the UI follows `/api/memories/changes?since=<seq>`, a
+feed of add/update/delete events (change_log.py), so each add, delete or
+poll costs O(changes) rather than a reload of the store.
+"""
+
+import hashlib
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+import namespaces
+import store_ops
+from change_log import DELETE
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Memory Manager - Mem0 MCP</title>
+    <style>
+        * {
+            box-sizing: border-box;
+            margin: 0;
+            padding: 0;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+            min-height: 100vh;
+            color: #e4e4e4;
+            padding: 20px;
+        }
+        .container {
+            max-width: 900px;
+            margin: 0 auto;
+        }
+        h1 {
+            text-align: center;
+            margin-bottom: 30px;
+            color: #00d9ff;
+            font-size: 2.5em;
+            text-shadow: 0 0 20px rgba(0, 217, 255, 0.3);
+        }
+        .card {
+            background: rgba(255, 255, 255, 0.05);
+            border-radius: 16px;
+            padding: 24px;
+            margin-bottom: 20px;
+            backdrop-filter: blur(10px);
+            border: 1px solid rgba(255, 255, 255, 0.1);
+        }
+        .card h2 {
+            color: #00d9ff;
+            margin-bottom: 16px;
+            font-size: 1.3em;
+        }
+        .add-memory-form {
+            display: flex;
+            gap: 12px;
+        }
+        .add-memory-form textarea {
+            flex: 1;
+            padding: 12px 16px;
+            border: 2px solid rgba(255, 255, 255, 0.1);
+            border-radius: 12px;
+            background: rgba(0, 0, 0, 0.3);
+            color: #fff;
+            font-size: 14px;
+            resize: vertical;
+            min-height: 80px;
+            transition: border-color 0.3s;
+        }
+        .add-memory-form textarea:focus {
+            outline: none;
+            border-color: #00d9ff;
+        }
+        .add-memory-form textarea::placeholder {
+            color: rgba(255, 255, 255, 0.4);
+        }
+        .btn {
+            padding: 12px 24px;
+            border: none;
+            border-radius: 12px;
+            cursor: pointer;
+            font-size: 14px;
+            font-weight: 600;
+            transition: all 0.3s;
+        }
+        .btn-primary {
+            background: linear-gradient(135deg, #00d9ff, #0099cc);
+            color: #000;
+        }
+        .btn-primary:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 8px 20px rgba(0, 217, 255, 0.3);
+        }
+        .btn-danger {
+            background: linear-gradient(135deg, #ff4757, #cc3344);
+            color: #fff;
+        }
+        .btn-danger:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 8px 20px rgba(255, 71, 87, 0.3);
+        }
+        .btn-secondary {
+            background: rgba(255, 255, 255, 0.1);
+            color: #fff;
+            border: 1px solid rgba(255, 255, 255, 0.2);
+        }
+        .btn-secondary:hover {
+            background: rgba(255, 255, 255, 0.2);
+        }
+        .memory-list {
+            height: 60vh;
+            overflow-y: auto;
+        }
+        .memory-spacer {
+            position: relative;
+        }
+        .memory-item {
+            position: absolute;
+            left: 0;
+            right: 0;
+            overflow: hidden;
+            background: rgba(0, 0, 0, 0.3);
+            border-radius: 12px;
+            padding: 16px;
+            display: flex;
+            align-items: flex-start;
+            gap: 16px;
+            border: 1px solid rgba(255, 255, 255, 0.05);
+            transition: all 0.3s;
+        }
+        .memory-item:hover {
+            border-color: rgba(0, 217, 255, 0.3);
+            background: rgba(0, 0, 0, 0.4);
+        }
+        .memory-checkbox {
+            width: 20px;
+            height: 20px;
+            accent-color: #00d9ff;
+            cursor: pointer;
+            margin-top: 2px;
+        }
+        .memory-content {
+            flex: 1;
+        }
+        .memory-text {
+            color: #fff;
+            line-height: 1.5;
+            word-break: break-word;
+            white-space: pre-wrap;
+            /* Fixed row height for windowing; the full text is in the tooltip */
+            display: -webkit-box;
+            -webkit-line-clamp: 2;
+            -webkit-box-orient: vertical;
+            overflow: hidden;
+        }
+        .memory-meta {
+            font-size: 12px;
+            color: rgba(255, 255, 255, 0.4);
+            margin-top: 8px;
+        }
+        .memory-id {
+            font-family: monospace;
+            background: rgba(0, 217, 255, 0.1);
+            padding: 2px 6px;
+            border-radius: 4px;
+            color: #00d9ff;
+        }
+        .actions-bar {
+            display: flex;
+            gap: 12px;
+            margin-bottom: 16px;
+            flex-wrap: wrap;
+            align-items: center;
+        }
+        .select-all-container {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            color: rgba(255, 255, 255, 0.6);
+        }
+        .empty-state {
+            text-align: center;
+            padding: 40px;
+            color: rgba(255, 255, 255, 0.4);
+        }
+        .empty-state svg {
+            width: 64px;
+            height: 64px;
+            margin-bottom: 16px;
+            opacity: 0.3;
+        }
+        .loading {
+            text-align: center;
+            padding: 40px;
+            color: rgba(255, 255, 255, 0.6);
+        }
+        .spinner {
+            width: 40px;
+            height: 40px;
+            border: 3px solid rgba(255, 255, 255, 0.1);
+            border-top-color: #00d9ff;
+            border-radius: 50%;
+            animation: spin 1s linear infinite;
+            margin: 0 auto 16px;
+        }
+        @keyframes spin {
+            to { transform: rotate(360deg); }
+        }
+        .toast {
+            position: fixed;
+            bottom: 20px;
+            right: 20px;
+            padding: 16px 24px;
+            border-radius: 12px;
+            color: #fff;
+            font-weight: 500;
+            z-index: 1000;
+            animation: slideIn 0.3s ease;
+        }
+        .toast.success {
+            background: linear-gradient(135deg, #00d9ff, #0099cc);
+            color: #000;
+        }
+        .toast.error {
+            background: linear-gradient(135deg, #ff4757, #cc3344);
+        }
+        @keyframes slideIn {
+            from {
+                transform: translateX(100%);
+                opacity: 0;
+            }
+            to {
+                transform: translateX(0);
+                opacity: 1;
+            }
+        }
+        .search-box {
+            display: flex;
+            gap: 12px;
+            margin-bottom: 16px;
+        }
+        .search-box input {
+            flex: 1;
+            padding: 12px 16px;
+            border: 2px solid rgba(255, 255, 255, 0.1);
+            border-radius: 12px;
+            background: rgba(0, 0, 0, 0.3);
+            color: #fff;
+            font-size: 14px;
+        }
+        .search-box input:focus {
+            outline: none;
+            border-color: #00d9ff;
+        }
+        .search-box input::placeholder {
+            color: rgba(255, 255, 255, 0.4);
+        }
+        .stats {
+            display: flex;
+            gap: 24px;
+            margin-bottom: 20px;
+        }
+        .stat-item {
+            background: rgba(0, 217, 255, 0.1);
+            padding: 16px 24px;
+            border-radius: 12px;
+            text-align: center;
+        }
+        .stat-value {
+            font-size: 2em;
+            font-weight: bold;
+            color: #00d9ff;
+        }
+        .stat-label {
+            font-size: 12px;
+            color: rgba(255, 255, 255, 0.6);
+            text-transform: uppercase;
+            letter-spacing: 1px;
+        }
+        .namespace-select {
+            font-size: 1.1em;
+            padding: 6px 10px;
+            border-radius: 8px;
+            margin-bottom: 6px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🧠 Memory Manager</h1>
+        
+        <div class="stats">
+            <div class="stat-item">
+                <div class="stat-value" id="totalMemories">-</div>
+                <div class="stat-label">Total Memories</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-value" id="selectedCount">0</div>
+                <div class="stat-label">Selected</div>
+            </div>
+            <div class="stat-item">
+                <select id="namespace" class="namespace-select" onchange="switchNamespace()">
+                    <option value="default">default</option>
+                </select>
+                <div class="stat-label">Namespace</div>
+            </div>
+        </div>
+        
+        <div class="card">
+            <h2>➕ Add New Memory</h2>
+            <div class="add-memory-form">
+                <textarea id="newMemory" placeholder="Enter a new memory to store... (e.g., coding preferences, patterns, knowledge)"></textarea>
+                <button class="btn btn-primary" onclick="addMemory()">Add Memory</button>
+            </div>
+        </div>
+        
+        <div class="card">
+            <h2>📚 Stored Memories</h2>
+            
+            <div class="search-box">
+                <input type="text" id="searchQuery" placeholder="Search memories..." oninput="filterMemories()">
+                <button class="btn btn-secondary" onclick="loadMemories()">🔄 Refresh</button>
+            </div>
+            
+            <div class="actions-bar">
+                <label class="select-all-container">
+                    <input type="checkbox" class="memory-checkbox" id="selectAll" onclick="toggleSelectAll()">
+                    Select All
+                </label>
+                <button class="btn btn-danger" onclick="deleteSelected()">🗑️ Delete Selected</button>
+            </div>
+            
+            <div id="memoryMessage">
+                <div class="loading">
+                    <div class="spinner"></div>
+                    Loading memories...
+                </div>
+            </div>
+            <div id="memoryList" class="memory-list" onscroll="renderWindow()">
+                <div id="memorySpacer" class="memory-spacer"></div>
+            </div>
+        </div>
+    </div>
+
+    <script>
+        // The list is windowed: only rows near the viewport are in the DOM, and
+        // rows are fetched from the server a page at a time as the user scrolls.
+        const ROW_HEIGHT = 110;  // px per row, gap included; rows have a fixed height
+        const PAGE_SIZE = 200;
+        const OVERSCAN = 10;     // rows rendered beyond each edge of the viewport
+        
+        let memories = new Map();  // id -> memory, for loaded rows
+        let order = [];            // loaded ids in listing order
+        let cursor = null;         // next server page; null once everything matching is loaded
+        let query = '';            // server-side filter of the list
+        let listVersion = 0;       // bumped on reload; page responses of older versions are dropped
+        let pageRequest = null;
+        const rendered = new Map(); // id -> row element in the DOM
+        let selectedIds = new Set();
+        // Position in the server's change feed; epoch is null while a full load runs
+        let feed = { epoch: null, seq: 0 };
+        let syncing = false;
+        let searchTimer = null;
+        const SYNC_INTERVAL_MS = 5000;
+        const SEARCH_DELAY_MS = 250;
+        
+        function currentNamespace() {
+            return document.getElementById('namespace').value || 'default';
+        }
+        
+        function withNamespace(url) {
+            return url + (url.includes('?') ? '&' : '?') + 'namespace=' + encodeURIComponent(currentNamespace());
+        }
+        
+        async function loadNamespaces() {
+            try {
+                const response = await fetch('api/namespaces');
+                const data = await response.json();
+                if (data.error) throw new Error(data.error);
+                const select = document.getElementById('namespace');
+                const current = currentNamespace();
+                const names = data.namespaces.map(n => n.namespace);
+                if (!names.includes(current)) names.unshift(current);
+                select.innerHTML = names.map(name =>
+                    `<option value="${escapeHtml(name)}" ${name === current ? 'selected' : ''}>${escapeHtml(name)}</option>`
+                ).join('');
+                const entry = data.namespaces.find(n => n.namespace === current);
+                document.getElementById('totalMemories').textContent = entry ? entry.memories : 0;
+            } catch (error) {
+                showToast('Error loading namespaces: ' + error.message, 'error');
+            }
+        }
+        
+        function switchNamespace() {
+            selectedIds.clear();
+            updateSelectedCount();
+            loadMemories();
+        }
+        
+        async function loadMemories() {
+            feed = { epoch: null, seq: 0 };
+            loadNamespaces();
+            try {
+                // Feed position first: changes made while the list loads are replayed after
+                const response = await fetch(withNamespace('api/memories/changes'));
+                const start = await response.json();
+                if (start.error) throw new Error(start.error);
+                await reloadList();
+                feed = { epoch: start.epoch, seq: start.seq };
+                syncChanges();
+            } catch (error) {
+                showListMessage('Error loading memories: ' + error.message);
+            }
+        }
+        
+        async function reloadList() {
+            listVersion++;
+            memories = new Map();
+            order = [];
+            cursor = null;
+            pageRequest = null;
+            rendered.forEach(row => row.remove());
+            rendered.clear();
+            document.getElementById('memoryList').scrollTop = 0;
+            showListMessage(null, true);
+            await loadPage(true);
+        }
+        
+        function loadPage(first) {
+            // One page request at a time; scrolling keeps asking until the list is loaded
+            if (pageRequest) return pageRequest;
+            const version = listVersion;
+            let url = `api/memories?limit=${PAGE_SIZE}`;
+            if (query) url += '&q=' + encodeURIComponent(query);
+            if (!first) url += '&cursor=' + encodeURIComponent(cursor);
+            pageRequest = (async () => {
+                try {
+                    const response = await fetch(withNamespace(url));
+                    const data = await response.json();
+                    if (version !== listVersion) return;
+                    if (data.error) throw new Error(data.error);
+                    for (const m of data.memories || []) {
+                        if (!memories.has(m.id)) {
+                            memories.set(m.id, m);
+                            order.push(m.id);
+                        }
+                    }
+                    cursor = data.next_cursor;
+                } catch (error) {
+                    if (version === listVersion) showListMessage('Error loading memories: ' + error.message);
+                    throw error;
+                } finally {
+                    if (version === listVersion) pageRequest = null;
+                }
+                renderWindow();
+            })();
+            return pageRequest;
+        }
+        
+        function showListMessage(message, loading) {
+            const el = document.getElementById('memoryMessage');
+            if (loading) {
+                el.innerHTML = '<div class="loading"><div class="spinner"></div>Loading memories...</div>';
+            } else if (message) {
+                el.innerHTML = '<div class="empty-state"></div>';
+                el.firstChild.textContent = message;
+            } else {
+                el.innerHTML = '';
+            }
+        }
+        
+        function renderWindow() {
+            // Bring the DOM in line with the rows in view; rows that stay in view are left alone
+            const listEl = document.getElementById('memoryList');
+            document.getElementById('memorySpacer').style.height = (order.length * ROW_HEIGHT) + 'px';
+            const first = Math.max(0, Math.floor(listEl.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            const last = Math.min(order.length, Math.ceil((listEl.scrollTop + listEl.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            const visible = new Set(order.slice(first, last));
+            
+            rendered.forEach((row, id) => {
+                if (!visible.has(id)) {
+                    row.remove();
+                    rendered.delete(id);
+                }
+            });
+            const spacer = document.getElementById('memorySpacer');
+            for (let i = first; i < last; i++) {
+                const id = order[i];
+                let row = rendered.get(id);
+                if (!row) {
+                    row = createRow(memories.get(id));
+                    rendered.set(id, row);
+                    spacer.appendChild(row);
+                }
+                const top = (i * ROW_HEIGHT) + 'px';
+                if (row.style.top !== top) row.style.top = top;
+            }
+            
+            if (order.length === 0 && cursor === null && !pageRequest) {
+                showListMessage(query ? 'No memories match your search' : 'No memories stored yet');
+            } else if (!pageRequest) {
+                showListMessage(null);
+            }
+            // Keep the next page ready before the user scrolls to the end
+            if (cursor !== null && last + OVERSCAN * 2 >= order.length) {
+                loadPage(false).catch(() => {});
+            }
+        }
+        
+        function createRow(m) {
+            const row = document.createElement('div');
+            row.className = 'memory-item';
+            row.dataset.id = m.id;
+            row.style.height = (ROW_HEIGHT - 12) + 'px';
+            row.innerHTML = `
+                <input type="checkbox" class="memory-checkbox">
+                <div class="memory-content">
+                    <div class="memory-text"></div>
+                    <div class="memory-meta">ID: <span class="memory-id"></span><span class="memory-date"></span></div>
+                </div>
+            `;
+            const checkbox = row.querySelector('.memory-checkbox');
+            checkbox.checked = selectedIds.has(m.id);
+            checkbox.onchange = () => toggleSelect(m.id, checkbox.checked);
+            fillRow(row, m);
+            return row;
+        }
+        
+        function fillRow(row, m) {
+            const text = row.querySelector('.memory-text');
+            text.textContent = m.memory || '';
+            text.title = m.memory || '';
+            row.querySelector('.memory-id').textContent = m.id || 'N/A';
+            row.querySelector('.memory-date').textContent = m.created_at ? ' • Created: ' + formatDate(m.created_at) : '';
+        }
+        
+        function matchesQuery(m) {
+            const needle = query.toLowerCase();
+            return !needle || (m.memory || '').toLowerCase().includes(needle) || m.id.toLowerCase().includes(needle);
+        }
+        
+        function removeLoaded(ids) {
+            // One pass over the loaded list for a whole batch of removals
+            let removed = false;
+            ids.forEach(id => {
+                if (memories.delete(id)) removed = true;
+                selectedIds.delete(id);
+                const row = rendered.get(id);
+                if (row) {
+                    row.remove();
+                    rendered.delete(id);
+                }
+            });
+            if (removed) order = order.filter(id => memories.has(id));
+            return removed;
+        }
+        
+        async function syncChanges() {
+            // Apply the add/update/delete events since our feed position
+            if (syncing || feed.epoch === null) return;
+            syncing = true;
+            const position = feed;
+            try {
+                const response = await fetch(withNamespace(
+                    `api/memories/changes?since=${position.seq}&epoch=${encodeURIComponent(position.epoch)}`));
+                const data = await response.json();
+                if (data.error) throw new Error(data.error);
+                // A reload (or namespace switch) replaced the feed meanwhile: this result is stale
+                if (feed !== position) return;
+                if (data.reset) {
+                    syncing = false;
+                    return loadMemories();
+                }
+                const deleted = new Set();
+                for (const change of data.events) {
+                    if (change.op === 'delete') {
+                        deleted.add(change.id);
+                    } else if (memories.has(change.id)) {
+                        memories.set(change.id, change.memory);
+                        const row = rendered.get(change.id);
+                        if (row) fillRow(row, change.memory);
+                    } else if (cursor === null && matchesQuery(change.memory)) {
+                        // New rows list last; with pages still unloaded they arrive with the last page
+                        memories.set(change.id, change.memory);
+                        order.push(change.id);
+                    }
+                }
+                removeLoaded(deleted);
+                feed = { epoch: data.epoch, seq: data.seq };
+                if (data.events.length) {
+                    renderWindow();
+                    updateSelectedCount();
+                    loadNamespaces();
+                }
+            } catch (error) {
+                showToast('Error syncing changes: ' + error.message, 'error');
+            } finally {
+                syncing = false;
+            }
+        }
+        
+        function filterMemories() {
+            // Search runs on the server over the whole namespace, not just the loaded rows
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const value = document.getElementById('searchQuery').value.trim();
+                if (value !== query) {
+                    query = value;
+                    reloadList().catch(() => {});
+                }
+            }, SEARCH_DELAY_MS);
+        }
+        
+        function toggleSelect(id, checked) {
+            if (checked) {
+                selectedIds.add(id);
+            } else {
+                selectedIds.delete(id);
+            }
+            updateSelectedCount();
+        }
+        
+        function toggleSelectAll() {
+            // Selects the loaded rows; only the checkboxes in the DOM need updating
+            const checked = document.getElementById('selectAll').checked;
+            if (checked) {
+                order.forEach(id => selectedIds.add(id));
+            } else {
+                selectedIds.clear();
+            }
+            rendered.forEach(row => { row.querySelector('.memory-checkbox').checked = checked; });
+            updateSelectedCount();
+        }
+        
+        function updateSelectedCount() {
+            document.getElementById('selectedCount').textContent = selectedIds.size;
+        }
+        
+        async function addMemory() {
+            const textarea = document.getElementById('newMemory');
+            const text = textarea.value.trim();
+            
+            if (!text) {
+                showToast('Please enter a memory to add', 'error');
+                return;
+            }
+            
+            try {
+                const response = await fetch(withNamespace('api/memories'), {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ text })
+                });
+                const data = await response.json();
+                
+                if (data.success) {
+                    showToast('Memory added successfully!', 'success');
+                    textarea.value = '';
+                    syncChanges();
+                } else {
+                    showToast('Error: ' + data.error, 'error');
+                }
+            } catch (error) {
+                showToast('Error adding memory: ' + error.message, 'error');
+            }
+        }
+        
+        async function deleteSelected() {
+            if (selectedIds.size === 0) {
+                showToast('No memories selected', 'error');
+                return;
+            }
+            
+            if (!confirm(`Are you sure you want to delete ${selectedIds.size} memory(ies)?`)) {
+                return;
+            }
+            
+            const btn = document.querySelector('.btn-danger');
+            const originalText = btn.innerHTML;
+            btn.innerHTML = 'Deleting...';
+            btn.disabled = true;
+            
+            try {
+                const response = await fetch(withNamespace('api/memories'), {
+                    method: 'DELETE',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ ids: Array.from(selectedIds) })
+                });
+                const data = await response.json();
+                
+                if (data.success) {
+                    // Remove deleted items from local state immediately
+                    removeLoaded(new Set(selectedIds));
+                    
+                    // Clear selection
+                    selectedIds.clear();
+                    document.getElementById('selectAll').checked = false;
+                    updateSelectedCount();
+                    
+                    // Re-render list
+                    renderWindow();
+                    
+                    showToast(`Deleted ${data.deleted} memory(ies)`, 'success');
+                    
+                    // Pick up the delete events (and anything else that changed)
+                    syncChanges();
+                } else {
+                    showToast('Error: ' + data.error, 'error');
+                }
+            } catch (error) {
+                showToast('Error deleting memories: ' + error.message, 'error');
+            } finally {
+                btn.innerHTML = originalText;
+                btn.disabled = false;
+            }
+        }
+        
+        function showToast(message, type) {
+            const toast = document.createElement('div');
+            toast.className = `toast ${type}`;
+            toast.textContent = message;
+            document.body.appendChild(toast);
+            setTimeout(() => toast.remove(), 3000);
+        }
+        
+        function escapeHtml(text) {
+            const div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
+        
+        function formatDate(dateStr) {
+            if (!dateStr) return '';
+            const date = new Date(dateStr);
+            return date.toLocaleDateString() + ' ' + date.toLocaleTimeString();
+        }
+        
+        // Load namespaces and memories on page load, then follow the change feed
+        loadMemories();
+        window.addEventListener('resize', renderWindow);
+        setInterval(() => { if (!document.hidden) syncChanges(); }, SYNC_INTERVAL_MS);
+    </script>
+</body>
+</html>
+"""
+
+
+# Responses smaller than this are not worth compressing
+GZIP_MINIMUM_SIZE = 1024
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.blake2b("\0".join(str(part) for part in parts).encode("utf-8"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def _coding(request: Request, size: int) -> str:
+    """Content coding GZipMiddleware applies to a body of this size"""
+    return "gzip" if _accepts_gzip(request) and size >= GZIP_MINIMUM_SIZE else "identity"
+
+
+def _codings(request: Request) -> tuple:
+    """Content codings a response to this request may be sent with"""
+    return ("gzip", "identity") if _accepts_gzip(request) else ("identity",)
+
+
+def _with_etag(response: Response, etag: str) -> Response:
+    # no-cache: browsers revalidate on every fetch, so reloading an unchanged page is a 304
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _not_modified_response(etag: str) -> Response:
+    return _with_etag(Response(status_code=304), etag)
+
+
+def create_manager_app(*, get_namespace, run_blocking, store_memory, delete_memories, namespace_sizes,
+                       search_memories):
+    """Starlette app with the manager UI at / and its REST API under /api.
+
+    The server's functions are passed in rather than imported, since main.py
+    usually runs as __main__:
+        get_namespace: namespace name -> Namespace (ValueError for bad names)
+        run_blocking: runs a blocking call on the server's mem0 worker pool
+        store_memory, delete_memories, namespace_sizes: main.py's shared write paths
+        search_memories: async (namespace, query, limit, min_score, metadata, after, before)
+            -> filtered semantic search results, coalesced with identical searches in flight
+    """
+
+    def request_namespace(request: Request):
+        return get_namespace(namespaces.validate(request.query_params.get("namespace")))
+
+    async def read_json(request: Request) -> dict:
+        try:
+            data = await request.json()
+        except ValueError:
+            raise ValueError("Request body must be JSON")
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        return data
+
+    # A strong ETag names exact bytes, so the compressed and identity forms differ
+    page_size = len(HTML_TEMPLATE.encode("utf-8"))
+    page_etags = {coding: _etag(HTML_TEMPLATE, coding) for coding in ("gzip", "identity")}
+
+    async def index(request: Request):
+        # Relative API URLs need the trailing slash (/manager -> /manager/)
+        if not request.url.path.endswith("/"):
+            return RedirectResponse(request.url.replace(path=request.url.path + "/"))
+        etag = page_etags[_coding(request, page_size)]
+        if _not_modified(request, etag):
+            return _not_modified_response(etag)
+        return _with_etag(HTMLResponse(HTML_TEMPLATE), etag)
+
+    async def get_namespaces(request: Request):
+        try:
+            return JSONResponse({"namespaces": await run_blocking(namespace_sizes)})
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, status_code=500)
+
+    async def get_memories(request: Request):
+        try:
+            namespace = request_namespace(request)
+            limit = int(request.query_params.get("limit", 100))
+            # Read the generation before the store: a write racing with the listing
+            # then only makes the ETag older than the body, never newer
+            version = (namespace.name, namespace.generation.current() or "0", request.url.query)
+            # Whether the body is big enough to be gzipped is only known once it is built;
+            # a cached copy in either coding is still current
+            for coding in _codings(request):
+                etag = _etag(*version, coding)
+                if _not_modified(request, etag):
+                    return _not_modified_response(etag)
+            client = await run_blocking(namespace.client)
+            memories, next_cursor = await run_blocking(
+                store_ops.list_page,
+                client,
+                namespace.user_id,
+                limit=limit,
+                cursor=request.query_params.get("cursor"),
+                fields=request.query_params.get("fields"),
+                contains=request.query_params.get("q", "").strip() or None,
+            )
+            response = JSONResponse({"memories": memories, "next_cursor": next_cursor})
+            return _with_etag(response, _etag(*version, _coding(request, len(response.body))))
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, status_code=500)
+
+    async def get_changes(request: Request):
+        try:
+            namespace = request_namespace(request)
+            log = namespace.change_log
+            # Writes by other processes only show up as a new store generation
+            log.observe(namespace.generation.current())
+            since = request.query_params.get("since")
+            if since is None:
+                # Starting point for a client that is about to load the list
+                return JSONResponse({"epoch": log.epoch, "seq": log.seq, "reset": False, "events": []})
+            latest, events, reset = log.since(int(since), request.query_params.get("epoch"))
+            # Only the last event per memory matters; payloads are read for surviving ids only
+            last = {}
+            for seq, op, memory_id in events:
+                last.pop(memory_id, None)
+                last[memory_id] = (seq, op)
+            upserted = [memory_id for memory_id, (_, op) in last.items() if op != DELETE]
+            found = {}
+            if upserted:
+                client = await run_blocking(namespace.client)
+                found = await run_blocking(store_ops.get_memories, client, upserted, request.query_params.get("fields"))
+            changes = []
+            for memory_id, (seq, op) in last.items():
+                change = {"seq": seq, "op": op, "id": memory_id}
+                if op != DELETE:
+                    # Gone already: a later write this feed could not describe removed it
+                    if memory_id not in found:
+                        continue
+                    change["memory"] = found[memory_id]
+                changes.append(change)
+            return JSONResponse({"epoch": log.epoch, "seq": latest, "reset": reset, "events": changes})
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, status_code=500)
+
+    async def add_memory(request: Request):
+        try:
+            data = await read_json(request)
+            text = str(data.get("text") or "").strip()
+            if not text:
+                return JSONResponse({"success": False, "error": "Text is required"}, status_code=400)
+            namespace = request_namespace(request)
+            outcome = await run_blocking(store_memory, namespace, text, data.get("raw"), False, data.get("metadata"))
+            return JSONResponse({"success": True, **outcome})
+        except ValueError as e:
+            return JSONResponse({"success": False, "error": str(e)}, status_code=400)
+        except Exception as e:
+            return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+    async def remove_memories(request: Request):
+        try:
+            data = await read_json(request)
+            ids = data.get("ids") or []
+            before = data.get("before")
+            metadata = data.get("metadata")
+            if not isinstance(ids, list) or not all(isinstance(memory_id, str) for memory_id in ids):
+                raise ValueError("ids must be a list of strings")
+            if metadata is not None and not isinstance(metadata, dict):
+                raise ValueError("metadata must be an object")
+            if not ids and not before and not metadata:
+                return JSONResponse({"success": False, "error": "No IDs or filter provided"}, status_code=400)
+            namespace = request_namespace(request)
+            deleted, missing = await run_blocking(delete_memories, namespace, ids, before, metadata)
+            return JSONResponse({
+                "success": True,
+                "deleted": deleted,
+                "errors": [f"{memory_id}: not found" for memory_id in missing],
+            })
+        except ValueError as e:
+            return JSONResponse({"success": False, "error": str(e)}, status_code=400)
+        except Exception as e:
+            return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+    async def search(request: Request):
+        try:
+            data = await read_json(request)
+            query = str(data.get("query") or "").strip()
+            if not query:
+                return JSONResponse({"error": "Query is required"}, status_code=400)
+            metadata = data.get("metadata")
+            if metadata is not None and not isinstance(metadata, dict):
+                raise ValueError("metadata must be an object")
+            limit, min_score = data.get("limit"), data.get("min_score")
+            results = await search_memories(
+                request_namespace(request),
+                query,
+                limit=int(limit) if limit is not None else None,
+                min_score=float(min_score) if min_score is not None else None,
+                metadata=metadata,
+                after=data.get("after"),
+                before=data.get("before"),
+            )
+            return JSONResponse({"memories": results})
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, status_code=500)
+
+    return Starlette(middleware=[Middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)], routes=[
+        Route("/", endpoint=index),
+        Route("/api/namespaces", endpoint=get_namespaces, methods=["GET"]),
+        Route("/api/memories", endpoint=get_memories, methods=["GET"]),
+        Route("/api/memories", endpoint=add_memory, methods=["POST"]),
+        Route("/api/memories", endpoint=remove_memories, methods=["DELETE"]),
+        Route("/api/memories/changes", endpoint=get_changes, methods=["GET"]),
+        Route("/api/memories/search", endpoint=search, methods=["POST"]),
+    ])
@@ -0,0 +1,76 @@
+"""
+Memory namespaces (per user, workspace or project).
+
+Every namespace is its own Chroma collection, so searching one namespace never
+scans another. The default namespace keeps the original `agent_memory`
+collection and `cursor_mcp` user id, so existing stores need no migration;
+namespace `foo` lives in `agent_memory__foo` with user id `foo`.
+"""
+
+import os
+import re
+
+DEFAULT_NAMESPACE = "default"
+DEFAULT_USER_ID = "cursor_mcp"
+COLLECTION_PREFIX = "agent_memory"
+_SEPARATOR = "__"
+
+# Chroma collection names: 3-512 chars of [a-zA-Z0-9._-]; keep namespaces short and simple
+_NAMESPACE_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,62}$")
+
+
+def validate(namespace: str | None) -> str:
+    """Normalized namespace name; None/empty means the default namespace"""
+    if not namespace:
+        return DEFAULT_NAMESPACE
+    namespace = namespace.strip()
+    if not _NAMESPACE_RE.match(namespace) or namespace.endswith((".", "-")):
+        raise ValueError(
+            f"invalid namespace {namespace!r}: use 1-63 letters, digits, '.', '_' or '-', "
+            "starting and ending with a letter or digit"
+        )
+    if namespace == DEFAULT_USER_ID:
+        # Its user id would be the default namespace's, so the two could not be told apart
+        raise ValueError(f"invalid namespace {namespace!r}: reserved for the default namespace")
+    return namespace
+
+
+def collection_name(namespace: str) -> str:
+    if namespace == DEFAULT_NAMESPACE:
+        return COLLECTION_PREFIX
+    return f"{COLLECTION_PREFIX}{_SEPARATOR}{namespace}"
+
+
+def namespace_of_collection(name: str) -> str | None:
+    """Inverse of collection_name; None for collections that are not memory namespaces"""
+    if name == COLLECTION_PREFIX:
+        return DEFAULT_NAMESPACE
+    if name.startswith(COLLECTION_PREFIX + _SEPARATOR):
+        return name[len(COLLECTION_PREFIX + _SEPARATOR):]
+    return None
+
+
+def user_id(namespace: str) -> str:
+    return DEFAULT_USER_ID if namespace == DEFAULT_NAMESPACE else namespace
+
+
+def namespace_of_user(user: str) -> str:
+    """Inverse of user_id (write-behind journals only record the user id)"""
+    return DEFAULT_NAMESPACE if not user or user == DEFAULT_USER_ID else user
+
+
+def generation_path(db_path: str, namespace: str) -> str:
+    """Write-generation marker file of a namespace (see recall_cache.StoreGeneration)"""
+    name = ".write_generation" if namespace == DEFAULT_NAMESPACE else f".write_generation{_SEPARATOR}{namespace}"
+    return os.path.join(db_path, name)
+
+
+def list_namespaces(chroma_client) -> list:
+    """Namespaces that exist in a Chroma client, sorted by name"""
+    found = []
+    for collection in chroma_client.list_collections():
+        # Depending on the chromadb version these are Collection objects or plain names
+        namespace = namespace_of_collection(getattr(collection, "name", collection))
+        if namespace is not None:
+            found.append(namespace)
+    return sorted(found)
@@ -0,0 +1,132 @@
+"""
+Recall result cache with write-generation invalidation.
+
+`StoreGeneration` is a write counter for the memory store. Every write path
+(remember, forget, the memory manager endpoints) bumps it, and it is mirrored
+to a small marker file so writes from another process are noticed too.
+`RecallCache` is an in-process LRU+TTL cache whose entries are only valid for
+the generation they were computed at. `SingleFlight` makes concurrent identical
+recalls share one search while the cache is still cold.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class StoreGeneration:
+    """Store write generation shared between processes through a marker file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def current(self) -> str:
+        """Opaque token that changes whenever any process writes to the store"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    def bump(self) -> str:
+        """Mark the store as changed and return the new token"""
+        token = uuid.uuid4().hex
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(token)
+            os.replace(tmp_path, self.path)
+        return token
+
+
+def normalize_query(query: str) -> str:
+    """Whitespace-insensitive form of a recall query (case is kept: embeddings see it)"""
+    return " ".join(query.split())
+
+
+class RecallCache:
+    """LRU+TTL cache of recall results, invalidated by store generation"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (generation, expires_at, value)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, user_id: str, *params) -> tuple:
+        return (normalize_query(query), user_id) + params
+
+    def get(self, key: tuple, generation: str):
+        """Cached value for key at this generation, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_generation, expires_at, value = entry
+                if entry_generation == generation and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, generation: str, value):
+        """Store a value computed at the given generation"""
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class SingleFlight:
+    """Coalesces concurrent identical async calls into one.
+
+    Callers of run() with the same key while a call is in flight await that
+    call's result instead of starting their own. Keys should include the store
+    generation, so a call never joins a search that started before a write.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.collapsed = 0
+        self._flights = {}  # key -> asyncio.Task
+
+    async def run(self, key: tuple, func):
+        """Result of await func(), shared with concurrent callers of the same key"""
+        task = self._flights.get(key)
+        if task is None:
+            self.calls += 1
+            task = self._flights[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.collapsed += 1
+        # One caller giving up (client disconnect) must not cancel the others' result
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "collapsed": self.collapsed, "in_flight": len(self._flights)}
@@ -0,0 +1,137 @@
+"""
+Buffered, rotating JSONL writer for the Gemini request log.
+
+Callers only put entries on an in-memory queue. A background thread writes them
+in batches, so LLM and embedding calls never wait on file I/O. The file is
+rotated by size and/or age (`gemini_log.jsonl` -> `.1` -> `.2` ...), and
+successful calls can be sampled; errors are always kept.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+
+class RequestLogWriter:
+    """Background JSONL log writer with batching, rotation and sampling"""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_seconds: float = 0,
+        backups: int = 3,
+        sample_rate: float = 1.0,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        log=print,
+    ):
+        """
+        Args:
+            path: JSONL file to append to
+            max_bytes: rotate once the file reaches this size (0 disables)
+            rotate_seconds: rotate once the file is this old (0 disables)
+            backups: number of rotated files to keep
+            sample_rate: fraction of successful calls to log (errors are always logged)
+            flush_interval: maximum seconds an entry waits in memory
+            max_queue: entries buffered before new ones are dropped
+            log: logging function for the writer's own errors
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backups = backups
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.log = log
+        self.written = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._opened_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="gemini-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, entry: dict):
+        """Queue an entry; never blocks the caller"""
+        if self.sample_rate < 1.0 and not entry.get("error") and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0):
+        """Flush everything queued so far and stop the writer thread"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                while True:
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._flush(batch)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flush(self, batch: list):
+        try:
+            self._maybe_rotate()
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+                self._opened_at = time.time()
+            self._file.write("".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in batch))
+            self._file.flush()
+            self.written += len(batch)
+        except Exception as e:
+            self.log(f"[GeminiLog] Error writing log: {e}")
+
+    def _maybe_rotate(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        too_big = self.max_bytes and size >= self.max_bytes
+        # Age counts from when this process opened the file
+        too_old = self.rotate_seconds and self._file is not None and time.time() - self._opened_at >= self.rotate_seconds
+        if not (too_big or too_old):
+            return
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
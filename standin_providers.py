@@ -0,0 +1,107 @@
+"""
+Deterministic offline stand-ins for the Gemini LLM and embedder.
+
+They let the server (and benchmarks/latency.py) run without network access or
+an API key, with a configurable artificial latency per call:
+
+- HashEmbedder: feature-hashed bag of words, L2-normalized, so texts sharing
+  words land close together and identical texts get identical vectors
+- CannedLLM: answers mem0's two prompts; fact extraction splits the input into
+  sentences, and the memory-update step ADDs every new fact
+
+mem0 validates provider names against its own list, so these are installed by
+replacing `client.llm` and `client.embedding_model` after `Memory.from_config`.
+"""
+
+import ast
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_UPDATE_FACTS_RE = re.compile(r"new retrieved facts are mentioned in the triple backticks.*?```\s*(.*?)\s*```", re.S)
+
+
+class _Config:
+    """Minimal stand-in for mem0's provider config objects"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _sleep_ms(latency_ms: float):
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000)
+
+
+class HashEmbedder:
+    """Deterministic hash-based embedder"""
+
+    def __init__(self, dims: int = 768, latency_ms: float = 0):
+        self.config = _Config(model="standin-hash", embedding_dims=dims)
+        self.dims = dims
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def embed(self, text, memory_action=None):
+        _sleep_ms(self.latency_ms)
+        self.calls += 1
+        vector = [0.0] * self.dims
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dims
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            vector[0] = 1.0
+            return vector
+        return [v / norm for v in vector]
+
+
+class CannedLLM:
+    """Canned responses for mem0's fact-extraction and memory-update prompts"""
+
+    def __init__(self, latency_ms: float = 0):
+        self.config = _Config(model="standin-canned", temperature=0, max_tokens=0, top_p=1)
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self._last_facts = threading.local()
+
+    def generate_response(self, messages, response_format=None, tools=None, tool_choice="auto"):
+        _sleep_ms(self.latency_ms)
+        self.calls += 1
+        if messages and messages[0].get("role") == "system":
+            return json.dumps({"facts": self._extract(messages[-1]["content"])})
+        return json.dumps({"memory": self._update(messages[-1]["content"])})
+
+    def _extract(self, prompt: str) -> list:
+        # mem0 sends "Input:\nuser: <text>\n"
+        text = prompt.split("Input:", 1)[-1]
+        text = "\n".join(line.split(":", 1)[1] if line.startswith(("user:", "assistant:", "system:")) else line
+                         for line in text.splitlines())
+        facts = [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence.strip()]
+        self._last_facts.value = facts
+        return facts
+
+    def _update(self, prompt: str) -> list:
+        facts = None
+        match = _UPDATE_FACTS_RE.search(prompt)
+        if match:
+            try:
+                facts = ast.literal_eval(match.group(1))
+            except (ValueError, SyntaxError):
+                facts = None
+        if not isinstance(facts, list):
+            facts = getattr(self._last_facts, "value", [])
+        return [{"id": str(i), "text": fact, "event": "ADD"} for i, fact in enumerate(facts)]
+
+
+def install_standin_providers(client, llm_latency_ms: float = 0, embed_latency_ms: float = 0, dims: int = 768):
+    """Replace a mem0 client's LLM and embedder with the offline stand-ins"""
+    client.llm = CannedLLM(latency_ms=llm_latency_ms)
+    client.embedding_model = HashEmbedder(dims=dims, latency_ms=embed_latency_ms)
+    return client
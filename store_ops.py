@@ -0,0 +1,349 @@
+"""
+Vector-store level operations that mem0's per-memory API makes slow.
+
+mem0's `Memory.delete` does a Chroma get, a Chroma delete and a history write
+for every single id, and `Memory.get_all` materializes the whole listing. These
+helpers work on the underlying Chroma collection in batches and pages instead,
+while keeping mem0's history table up to date.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+# Page size for server-side scans; bounds memory regardless of store size
+SCAN_PAGE_SIZE = 500
+# Numeric creation time (Unix seconds) stamped on every memory this server writes.
+# mem0's created_at is an ISO string, which Chroma `where` clauses cannot range over.
+CREATED_TS_KEY = "created_ts"
+# Payload keys that scope a memory to its owner; never accepted as metadata filters
+_SCOPE_KEYS = ("user_id", "agent_id", "run_id")
+
+
+def _collection(client):
+    return client.vector_store.collection
+
+
+def _add_delete_history(client, rows: list):
+    """Record DELETE events for (memory_id, old_text) rows in one transaction"""
+    db = client.db
+    if not rows:
+        return
+    if hasattr(db, "connection") and hasattr(db, "_lock"):
+        with db._lock, db.connection:
+            db.connection.executemany(
+                "INSERT INTO history (id, memory_id, old_memory, new_memory, event, created_at, updated_at, is_deleted)"
+                " VALUES (?, ?, ?, NULL, 'DELETE', NULL, NULL, 1)",
+                [(str(uuid.uuid4()), memory_id, old) for memory_id, old in rows],
+            )
+    else:
+        for memory_id, old in rows:
+            db.add_history(memory_id, old, None, "DELETE", is_deleted=1)
+
+
+def _delete_rows(client, ids: list, metadatas: list):
+    if not ids:
+        return
+    _collection(client).delete(ids=ids)
+    _add_delete_history(client, [(i, (m or {}).get("data")) for i, m in zip(ids, metadatas)])
+
+
+def delete_by_ids(client, memory_ids: list) -> tuple:
+    """Delete many memories with one Chroma get and one Chroma delete.
+
+    Returns:
+        (deleted_ids, missing_ids)
+    """
+    memory_ids = list(dict.fromkeys(memory_ids))
+    if not memory_ids:
+        return [], []
+    found = _collection(client).get(ids=memory_ids, include=["metadatas"])
+    _delete_rows(client, found["ids"], found["metadatas"])
+    found_ids = set(found["ids"])
+    return found["ids"], [i for i in memory_ids if i not in found_ids]
+
+
+def iter_memories(client, where: dict = None):
+    """Yield (memory_id, payload) for every memory, one metadata-only page at a time"""
+    collection = _collection(client)
+    offset = 0
+    while True:
+        page = collection.get(where=where, limit=SCAN_PAGE_SIZE, offset=offset, include=["metadatas"])
+        yield from zip(page["ids"], page["metadatas"])
+        if len(page["ids"]) < SCAN_PAGE_SIZE:
+            break
+        offset += len(page["ids"])
+
+
+def get_texts(client, memory_ids: list) -> dict:
+    """Map memory ids to their stored text (ids that no longer exist are left out)"""
+    if not memory_ids:
+        return {}
+    found = _collection(client).get(ids=list(memory_ids), include=["metadatas"])
+    return {memory_id: (meta or {}).get("data") for memory_id, meta in zip(found["ids"], found["metadatas"])}
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO date/datetime; naive values are taken as local time"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def check_metadata(metadata, reserved=_SCOPE_KEYS) -> dict:
+    """Validated metadata: string keys other than `reserved`, with string, number or boolean values"""
+    if metadata is None:
+        return {}
+    if not isinstance(metadata, dict):
+        raise ValueError("metadata must be an object of key/value pairs")
+    for key, value in metadata.items():
+        if not isinstance(key, str) or not key or key.startswith("$") or key in reserved:
+            raise ValueError(f"invalid or reserved metadata key {key!r}")
+        if not isinstance(value, (str, int, float, bool)):
+            raise ValueError(f"metadata value of {key!r} must be a string, number or boolean")
+    return dict(metadata)
+
+
+def check_write_metadata(metadata) -> dict:
+    """check_metadata for metadata stored with new memories (keys managed by mem0 or this server are reserved)"""
+    return check_metadata(metadata, _RESERVED_KEYS)
+
+
+def build_where(user_id: str, metadata: dict = None, after: str = None, before: str = None) -> dict:
+    """Chroma `where` clause for a user plus exact-match metadata and creation-date filters.
+
+    after/before are ISO dates/datetimes matched against CREATED_TS_KEY (after is
+    inclusive, before exclusive), so memories without it never match a date filter.
+    """
+    clauses = [{"user_id": user_id}]
+    for key, value in check_metadata(metadata).items():
+        clauses.append({key: value})
+    if after:
+        clauses.append({CREATED_TS_KEY: {"$gte": parse_timestamp(after).timestamp()}})
+    if before:
+        clauses.append({CREATED_TS_KEY: {"$lt": parse_timestamp(before).timestamp()}})
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def delete_by_filter(client, user_id: str, before: str = None, metadata: dict = None) -> int:
+    """Delete a user's memories matching metadata and/or created before a date.
+
+    Both filters are evaluated inside Chroma (the date against CREATED_TS_KEY, so
+    older memories must have been through backfill_created_ts). Matches are read
+    and deleted one page of ids and metadata at a time.
+
+    Returns:
+        Number of deleted memories.
+    """
+    where = build_where(user_id, metadata, before=before)
+    collection = _collection(client)
+    deleted = 0
+    while True:
+        # Every match on a page is deleted, so the next page starts at offset 0 again
+        page = collection.get(where=where, limit=SCAN_PAGE_SIZE, include=["metadatas"])
+        _delete_rows(client, page["ids"], page["metadatas"])
+        deleted += len(page["ids"])
+        if len(page["ids"]) < SCAN_PAGE_SIZE:
+            return deleted
+
+
+# ============== Pagination ==============
+# Fields a listed memory can be projected to; DEFAULT_FIELDS keeps listings compact
+LIST_FIELDS = ("id", "memory", "created_at", "updated_at", "hash", "metadata")
+DEFAULT_FIELDS = ("id", "memory", "created_at")
+MAX_PAGE_SIZE = 500
+# Rows one filtered page request may scan (see _filter_page)
+MAX_FILTER_SCAN = 5000
+
+# Payload keys managed by mem0; everything else is user metadata
+_RESERVED_KEYS = {"data", "hash", "created_at", "updated_at", "user_id", "agent_id", "run_id", "source_simhash",
+                  "source_key", CREATED_TS_KEY}
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded))["o"]
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("invalid cursor")
+    return offset
+
+
+def parse_fields(fields) -> tuple:
+    """Validate a field projection given as a list or comma-separated string"""
+    if not fields:
+        return DEFAULT_FIELDS
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(unknown)}; allowed: {', '.join(LIST_FIELDS)}")
+    return tuple(fields)
+
+
+def format_memory(memory_id: str, payload: dict, fields: tuple) -> dict:
+    """Project a Chroma id/payload pair onto the requested fields"""
+    payload = payload or {}
+    item = {}
+    for field in fields:
+        if field == "id":
+            item["id"] = memory_id
+        elif field == "memory":
+            item["memory"] = payload.get("data")
+        elif field == "metadata":
+            item["metadata"] = {k: v for k, v in payload.items() if k not in _RESERVED_KEYS}
+        else:
+            item[field] = payload.get(field)
+    return item
+
+
+def get_memories(client, memory_ids: list, fields=None, where: dict = None) -> dict:
+    """Map memory ids to listed memories (ids that no longer exist or fail `where` are left out)"""
+    if not memory_ids:
+        return {}
+    fields = parse_fields(fields)
+    found = _collection(client).get(ids=list(memory_ids), where=where, include=["metadatas"])
+    return {memory_id: format_memory(memory_id, meta, fields) for memory_id, meta in zip(found["ids"], found["metadatas"])}
+
+
+def list_page(client, user_id: str, limit: int = 100, cursor: str = None, fields=None, contains: str = None) -> tuple:
+    """Fetch one page of a user's memories straight from Chroma.
+
+    Only metadata is read (never embeddings), and only `limit` rows at a time.
+    The cursor is an opaque token; rows deleted between pages may shift it.
+    With `contains`, only memories whose text or id contains it (case-insensitive)
+    are listed; see _filter_page.
+
+    Returns:
+        (memories, next_cursor) where next_cursor is None on the last page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    offset = decode_cursor(cursor) if cursor else 0
+    fields = parse_fields(fields)
+    if contains:
+        return _filter_page(client, user_id, limit, offset, fields, contains.lower())
+    # Fetch one extra row to know whether another page exists
+    page = _collection(client).get(where={"user_id": user_id}, limit=limit + 1, offset=offset, include=["metadatas"])
+    ids, metadatas = page["ids"][:limit], page["metadatas"][:limit]
+    memories = [format_memory(memory_id, meta, fields) for memory_id, meta in zip(ids, metadatas)]
+    next_cursor = encode_cursor(offset + limit) if len(page["ids"]) > limit else None
+    return memories, next_cursor
+
+
+def _filter_page(client, user_id: str, limit: int, offset: int, fields: tuple, needle: str) -> tuple:
+    """Scan from offset for up to `limit` matches.
+
+    One request scans at most MAX_FILTER_SCAN rows; a short page with a cursor
+    then means "keep paging", so a rare needle never turns into one huge scan.
+    """
+    collection = _collection(client)
+    memories = []
+    position = offset
+    while position - offset < MAX_FILTER_SCAN:
+        page = collection.get(where={"user_id": user_id}, limit=SCAN_PAGE_SIZE, offset=position, include=["metadatas"])
+        for memory_id, meta in zip(page["ids"], page["metadatas"]):
+            if needle in ((meta or {}).get("data") or "").lower() or needle in memory_id.lower():
+                if len(memories) == limit:
+                    return memories, encode_cursor(position)
+                memories.append(format_memory(memory_id, meta, fields))
+            position += 1
+        if len(page["ids"]) < SCAN_PAGE_SIZE:
+            return memories, None
+    return memories, encode_cursor(position)
+
+
+# ============== Filtered Search ==============
+
+def similarity(distance: float, space: str = "l2") -> float:
+    """Chroma distance as a similarity score, 1 for an exact match.
+
+    For unit-length embeddings (Gemini's are) squared L2 distance is 2 - 2*cosine,
+    so every space maps to cosine similarity.
+    """
+    return 1.0 - distance / 2 if space == "l2" else 1.0 - distance
+
+
+def _distance_space(collection) -> str:
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        configuration = getattr(collection, "configuration_json", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def search(client, vector: list, where: dict, limit: int, min_score: float = None) -> list:
+    """Nearest memories to an embedding, filtered by `where` inside Chroma.
+
+    Returns:
+        [{"id", "memory", "score", "created_at"}] by descending score, without
+        matches scoring below min_score.
+    """
+    collection = _collection(client)
+    found = collection.query(query_embeddings=[vector], where=where, n_results=limit,
+                             include=["metadatas", "distances"])
+    space = _distance_space(collection)
+    results = []
+    for memory_id, meta, distance in zip(found["ids"][0], found["metadatas"][0], found["distances"][0]):
+        score = similarity(distance, space)
+        if min_score is not None and score < min_score:
+            break  # results come nearest first
+        meta = meta or {}
+        results.append({"id": memory_id, "memory": meta.get("data"), "score": round(score, 4),
+                        "created_at": meta.get("created_at")})
+    return results
+
+
+def _created_ts_updates(rows, force: bool = False) -> tuple:
+    """(ids, metadata updates) setting CREATED_TS_KEY from created_at for (memory_id, payload) rows"""
+    ids, updates = [], []
+    for memory_id, meta in rows:
+        meta = meta or {}
+        if (CREATED_TS_KEY in meta and not force) or not meta.get("created_at"):
+            continue
+        try:
+            created = parse_timestamp(meta["created_at"]).timestamp()
+        except ValueError:
+            continue
+        if meta.get(CREATED_TS_KEY) != created:
+            ids.append(memory_id)
+            updates.append({CREATED_TS_KEY: created})
+    return ids, updates
+
+
+def stamp_created_ts(client, memory_ids: list):
+    """Set CREATED_TS_KEY on memories written through Memory.add.
+
+    Done after the fact rather than through add's metadata: mem0 reuses that
+    metadata for UPDATE events, which keep the original created_at.
+    """
+    if not memory_ids:
+        return
+    found = _collection(client).get(ids=list(memory_ids), include=["metadatas"])
+    ids, updates = _created_ts_updates(zip(found["ids"], found["metadatas"]), force=True)
+    if ids:
+        _collection(client).update(ids=ids, metadatas=updates)
+
+
+def backfill_created_ts(client, user_id: str) -> int:
+    """Stamp CREATED_TS_KEY on a user's memories written before it existed.
+
+    Scans ids and metadata only, one page at a time; returns the number of memories updated.
+    """
+    collection = _collection(client)
+    stamped = 0
+    offset = 0
+    while True:
+        page = collection.get(where={"user_id": user_id}, limit=SCAN_PAGE_SIZE, offset=offset, include=["metadatas"])
+        ids, updates = _created_ts_updates(zip(page["ids"], page["metadatas"]))
+        if ids:
+            collection.update(ids=ids, metadatas=updates)
+            stamped += len(ids)
+        if len(page["ids"]) < SCAN_PAGE_SIZE:
+            return stamped
+        offset += len(page["ids"])
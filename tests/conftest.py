@@ -0,0 +1,25 @@
+"""
+Shared test setup: the offline stand-in providers and a throwaway store.
+
+main.py reads its configuration from the environment at import time, so the
+environment is set here, before any test module imports it.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_DIR = tempfile.mkdtemp(prefix="mem0-mcp-tests-")
+
+TEST_ENV = {
+    "MEM0_MCP_PROVIDERS": "standin",
+    "MEM0_MCP_DB_PATH": os.path.join(STORE_DIR, "db"),
+    "MEM0_MCP_LOG_FILE": os.path.join(STORE_DIR, "gemini_log.jsonl"),
+    "MEM0_MCP_EMBED_CACHE": os.path.join(STORE_DIR, "embedding_cache.sqlite3"),
+    "MEM0_DIR": os.path.join(STORE_DIR, "mem0"),
+    "MEM0_MCP_PREWARM": "0",
+    "MEM0_TELEMETRY": "False",
+}
+os.environ.update(TEST_ENV)
+sys.path.insert(0, ROOT)
@@ -0,0 +1,58 @@
+import pytest
+from starlette.testclient import TestClient
+
+import main
+from change_log import ADD, DELETE, RESET, UPDATE, ChangeLog
+
+
+def test_events_after_a_sequence_number():
+    log = ChangeLog()
+    log.record(None, "g1", added=["a", "b"])
+    log.record("g1", "g2", updated=["a"], removed=["b"])
+    assert log.since(0) == (4, [(1, ADD, "a"), (2, ADD, "b"), (3, UPDATE, "a"), (4, DELETE, "b")], False)
+    assert log.since(2, log.epoch) == (4, [(3, UPDATE, "a"), (4, DELETE, "b")], False)
+    assert log.since(4) == (4, [], False)
+
+
+@pytest.mark.parametrize("seq, epoch", [(0, "other-epoch"), (9, None)])
+def test_other_epoch_or_future_seq_resets(seq, epoch):
+    log = ChangeLog()
+    log.record(None, "g1", added=["a"])
+    assert log.since(seq, epoch) == (1, [], True)
+
+
+def test_falling_behind_the_retained_events_resets():
+    log = ChangeLog(max_events=2)
+    log.record(None, "g1", added=["a", "b", "c"])
+    assert log.since(0) == (3, [], True)
+    assert log.since(1) == (3, [(2, ADD, "b"), (3, ADD, "c")], False)
+
+
+def test_unknown_or_foreign_writes_reset():
+    log = ChangeLog()
+    log.record(None, "g1", added=["a"])
+    log.record("g1", "g2", known=False)
+    assert log.since(1) == (2, [], True)
+    # Another process moved the store on: the next recorded write no longer follows
+    log.record("g3", "g4", added=["b"])
+    assert log._events[-1][1] == RESET
+    log.observe("g5")
+    assert log.since(log.seq - 1) == (log.seq, [], True)
+    log.observe("g5")
+    assert log.since(log.seq) == (log.seq, [], False)
+
+
+def test_feed_coalesces_events_per_memory():
+    client = TestClient(main.create_starlette_app(main.mcp._mcp_server))
+    api = "/manager/api/memories"
+    query = "?namespace=change-feed-tests"
+    start = client.get(f"{api}/changes{query}").json()
+
+    kept = client.post(f"{api}{query}", json={"text": "Feed entries are coalesced", "raw": True}).json()["ids"][0]
+    gone = client.post(f"{api}{query}", json={"text": "This memory is deleted again", "raw": True}).json()["ids"][0]
+    client.request("DELETE", f"{api}{query}", json={"ids": [gone]})
+
+    feed = client.get(f"{api}/changes{query}&since={start['seq']}&epoch={start['epoch']}").json()
+    assert feed["reset"] is False
+    assert [(event["op"], event["id"]) for event in feed["events"]] == [(ADD, kept), (DELETE, gone)]
+    assert feed["events"][0]["memory"]["memory"] == "Feed entries are coalesced"
@@ -0,0 +1,75 @@
+import pytest
+
+from dedup_index import MIN_FEATURES, DedupIndex, content_key, hamming, simhash
+
+USER = "cursor_mcp"
+
+
+def index_with(*texts, max_distance=0):
+    index = DedupIndex(max_distance)
+    index.rebuild(((f"m{i}", text, USER, (), ()) for i, text in enumerate(texts)), "g1")
+    return index
+
+
+def test_exact_repeat_is_a_duplicate():
+    index = index_with("Always use tabs for indentation in this repo")
+    assert index.find("always use TABS for indentation, in this repo!", USER) == "m0"
+
+
+def test_duplicates_are_per_user():
+    index = index_with("Always use tabs for indentation in this repo")
+    assert index.find("Always use tabs for indentation in this repo", "someone_else") is None
+
+
+@pytest.mark.parametrize("stored, update", [
+    ("Always use tabs for indentation in this repo", "Never use tabs for indentation in this repo"),
+    ("The backend runs on Python 3.11", "The backend runs on Python 3.12"),
+])
+def test_corrections_reach_mem0_by_default(stored, update):
+    # Close enough to look alike, but mem0 has to see them to update the old memory
+    assert hamming(simhash(stored), simhash(update)) <= 8
+    assert index_with(stored).find(update, USER) is None
+
+
+def test_short_texts_never_match_fuzzily():
+    index = index_with("Always use tabs for indentation in this repo", max_distance=8)
+    assert index.find("Never use tabs for indentation in this repo", USER) is None
+
+
+def test_fuzzy_matching_is_opt_in_for_long_texts():
+    stored = " ".join(f"word{i}" for i in range(MIN_FEATURES)) + " final"
+    edited = stored.replace("final", "last")
+    assert hamming(simhash(stored), simhash(edited)) <= 8
+    assert index_with(stored, max_distance=8).find(edited, USER) == "m0"
+    assert index_with(stored).find(edited, USER) is None
+
+
+def test_source_text_and_removal():
+    index = index_with("User prefers tabs")
+    index.add_source("m0", "I really like tabs, please remember that")
+    assert index.find("I really like tabs; please remember that.", USER) == "m0"
+    index.remove("m0")
+    assert index.find("User prefers tabs", USER) is None
+
+
+def test_rebuild_uses_stored_source_keys():
+    source = "I really like tabs, please remember that"
+    index = DedupIndex()
+    index.rebuild([("m0", "User prefers tabs", USER, (simhash(source),), (content_key(source),))], "g1")
+    assert index.find(source, USER) == "m0"
+
+
+def test_remember_skips_repeats_but_not_corrections():
+    import asyncio
+    import main
+
+    async def scenario():
+        first = await main.remember("Always use tabs for indentation in this repo", raw=True, namespace="dedup-e2e")
+        repeat = await main.remember("always use tabs for indentation in this repo.", raw=True, namespace="dedup-e2e")
+        correction = await main.remember("Never use tabs for indentation in this repo", raw=True, namespace="dedup-e2e")
+        return first, repeat, correction
+
+    first, repeat, correction = asyncio.run(scenario())
+    assert first.startswith("Successfully")
+    assert repeat.startswith("Already remembered")
+    assert correction.startswith("Successfully")
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+import main
+from embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=10)
+    yield cache
+    cache.close()
+
+
+def last_used(cache, key):
+    with sqlite3.connect(cache.path) as conn:
+        return conn.execute("SELECT last_used FROM embeddings WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_round_trip_and_counters(cache):
+    assert cache.get("k") is None
+    cache.put("k", "model", [0.5, -1.0])
+    assert cache.get("k") == [0.5, -1.0]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_keys_depend_on_model_and_options():
+    key = EmbeddingCache.make_key("m", "text")
+    assert key == EmbeddingCache.make_key("m", "text", {})
+    assert key != EmbeddingCache.make_key("other", "text")
+    assert key != EmbeddingCache.make_key("m", "text", {"task_type": "retrieval_query"})
+
+
+def test_evicts_least_recently_used(cache):
+    for i in range(10):
+        cache.put(f"k{i}", "model", [float(i)])
+    assert cache.get("k0") == [0.0]
+    cache.put("k10", "model", [10.0])
+    # One over the cap evicts the overflow plus EVICT_FRACTION of the cap, oldest first
+    assert cache.get("k1") is None and cache.get("k2") is None
+    assert cache.get("k0") == [0.0]
+    assert cache.get("k3") == [3.0]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_hits_are_written_in_batches(cache):
+    cache.put("a", "model", [1.0])
+    cache.put("b", "model", [2.0])
+    before = last_used(cache, "a")
+    cache.get("a")
+    assert last_used(cache, "a") == before
+    cache.put("c", "model", [3.0])
+    assert last_used(cache, "a") > last_used(cache, "b")
+
+
+def test_many_hit_keys_flush_without_a_put(cache, monkeypatch):
+    monkeypatch.setattr(EmbeddingCache, "TOUCH_FLUSH_SIZE", 2)
+    cache.put("a", "model", [1.0])
+    cache.put("b", "model", [2.0])
+    before = last_used(cache, "a")
+    cache.get("a")
+    cache.get("a")
+    assert last_used(cache, "a") == before
+    cache.get("b")
+    assert last_used(cache, "a") > before
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = EmbeddingCache(path)
+    first.put("k", "model", [1.0, 2.0])
+    first.get("k")
+    first.close()
+    second = EmbeddingCache(path)
+    assert second.get("k") == [1.0, 2.0]
+    assert second.stats()["entries"] == 1
+    second.close()
+
+
+def test_batch_embeds_only_the_misses(tmp_path, monkeypatch):
+    genai = pytest.importorskip("google.generativeai")
+    calls = []
+
+    def embed_content(model, content, **kwargs):
+        calls.append(list(content))
+        return {"embedding": [[float(len(text))] for text in content]}
+
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(main, "embedding_cache", cache)
+    monkeypatch.setattr(genai, "embed_content", embed_content)
+    main._patch_embed_cache()
+
+    first = genai.embed_content(model="m", content=["a", "bb"])
+    second = genai.embed_content(model="m", content=["bb", "ccc", "a"])
+    cache.close()
+
+    assert first == {"embedding": [[1.0], [2.0]]}
+    assert second == {"embedding": [[2.0], [3.0], [1.0]]}
+    assert calls == [["a", "bb"], ["ccc"]]
@@ -0,0 +1,29 @@
+import asyncio
+
+import main
+
+NAMESPACE = "forget-tests"
+
+
+def test_forget_before_uses_created_ts_and_backfills_older_memories():
+    async def seed():
+        for text in ("Old fact about the build", "New fact about the build", "Another new fact"):
+            await main.remember(text, raw=True, namespace=NAMESPACE)
+    asyncio.run(seed())
+
+    # Rewrite one memory as if written before created_ts existed
+    collection = main.get_namespace(NAMESPACE).client().vector_store.collection
+    rows = collection.get(include=["metadatas", "embeddings"])
+    old = rows["metadatas"][[m["data"] for m in rows["metadatas"]].index("Old fact about the build")]
+    old_id = rows["ids"][rows["metadatas"].index(old)]
+    old_embedding = rows["embeddings"][rows["metadatas"].index(old)]
+    legacy = {k: v for k, v in old.items() if k != "created_ts"}
+    legacy["created_at"] = "2001-05-01T00:00:00-07:00"
+    collection.delete(ids=[old_id])
+    collection.add(ids=[old_id], embeddings=[old_embedding], metadatas=[legacy])
+
+    result = asyncio.run(main.forget(before="2010-01-01", namespace=NAMESPACE))
+    assert result.startswith("Successfully deleted 1 ")
+    remaining = sorted(m["data"] for m in collection.get(include=["metadatas"])["metadatas"])
+    assert remaining == ["Another new fact", "New fact about the build"]
+    assert all("created_ts" in m for m in collection.get(include=["metadatas"])["metadatas"])
@@ -0,0 +1,127 @@
+import email.utils
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from gemini_scheduler import GeminiScheduler, TokenBucket, parse_rates, retry_after_seconds
+
+
+class ApiError(Exception):
+    def __init__(self, code, message="", headers=None, details=None):
+        super().__init__(message)
+        self.code = code
+        self.response = SimpleNamespace(headers=headers or {})
+        self.details = details
+
+
+def scheduler(**kwargs):
+    sleeps = []
+    kwargs.setdefault("backoff_base", 1.0)
+    return GeminiScheduler(sleep=sleeps.append, **kwargs), sleeps
+
+
+def failing(*errors, result="ok"):
+    errors = list(errors)
+
+    def func():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return func
+
+
+def test_parse_rates():
+    assert parse_rates("gemini=60, models/embed=120") == {"gemini": 60.0, "models/embed": 120.0}
+    assert parse_rates("100") == {"*": 100.0}
+    assert parse_rates("") == {}
+
+
+@pytest.mark.parametrize("error, expected", [
+    (ApiError(429, headers={"Retry-After": "7"}), 7.0),
+    (ApiError(429, details=[SimpleNamespace(retry_delay=SimpleNamespace(seconds=3, nanos=500_000_000))]), 3.5),
+    (ApiError(429, "Quota exceeded. Please retry in 12.5s."), 12.5),
+    (ApiError(503, "unavailable"), None),
+])
+def test_retry_after_seconds(error, expected):
+    assert retry_after_seconds(error) == expected
+
+
+def test_retry_after_http_date():
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= retry_after_seconds(ApiError(429, headers={"Retry-After": date})) <= 30
+
+
+def test_retries_then_succeeds():
+    gemini, sleeps = scheduler()
+    assert gemini.call("m", failing(ApiError(503), ApiError(500))) == "ok"
+    assert len(sleeps) == 2
+    assert gemini.stats()["m"]["retries"] == 2
+    assert gemini.stats()["m"]["calls"] == 3
+
+
+def test_gives_up_after_max_retries():
+    gemini, sleeps = scheduler(max_retries=2)
+    with pytest.raises(ApiError):
+        gemini.call("m", failing(*(ApiError(503) for _ in range(5))))
+    assert len(sleeps) == 2
+    assert gemini.stats()["m"]["failures"] == 1
+
+
+def test_non_retryable_errors_raise_at_once():
+    gemini, sleeps = scheduler()
+    with pytest.raises(ApiError):
+        gemini.call("m", failing(ApiError(400)))
+    assert sleeps == []
+
+
+def test_throttle_pauses_the_bucket_for_every_caller():
+    gemini, sleeps = scheduler()
+    assert gemini.call("m", failing(ApiError(429, headers={"Retry-After": "5"}))) == "ok"
+    assert 4 < sleeps[0] <= 5
+    # The next call to the same model waits out the rest of the pause too
+    gemini.call("m", failing())
+    assert 4 < sleeps[1] <= 5
+    assert gemini.call("other", failing()) == "ok"
+    assert len(sleeps) == 2
+
+
+def test_backoff_beyond_the_wait_budget_fails_fast():
+    gemini, sleeps = scheduler(max_wait=10, backoff_base=100, backoff_max=100)
+    gemini.backoff = lambda attempt: 50.0
+    with pytest.raises(ApiError):
+        gemini.call("m", failing(ApiError(503)))
+    assert sleeps == []
+    assert gemini.stats()["m"]["failures"] == 1
+
+
+def test_paused_bucket_beyond_the_wait_budget_fails_fast():
+    gemini, sleeps = scheduler(max_wait=10)
+    with pytest.raises(ApiError):
+        gemini.call("m", failing(ApiError(429, headers={"Retry-After": "60"})))
+    assert sleeps == []
+    with pytest.raises(TimeoutError):
+        gemini.call("m", failing())
+    assert sleeps == []
+
+
+def test_wait_budget_is_shared_by_the_retries_of_one_call():
+    gemini, sleeps = scheduler(max_wait=10)
+    gemini.backoff = lambda attempt: 4.0
+    with pytest.raises(ApiError):
+        gemini.call("m", failing(*(ApiError(503) for _ in range(5))))
+    assert sleeps == [4.0, 4.0]
+
+
+def test_bucket_queues_beyond_its_burst():
+    bucket = TokenBucket(60, burst=1)  # one token per second
+    assert bucket.reserve() == 0.0
+    assert 0.9 < bucket.reserve() <= 1.0
+    # Refusing a token leaves the queue as it was
+    assert bucket.reserve(max_wait=0.5) is None
+    assert 1.9 < bucket.reserve() <= 2.0
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(0)
+    assert [bucket.reserve() for _ in range(100)] == [0.0] * 100
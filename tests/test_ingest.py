@@ -0,0 +1,64 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import ingest
+import main
+
+
+def fake_extract(client, text):
+    if text.startswith("bad"):
+        raise RuntimeError("extraction failed")
+    return [f"fact: {text}"]
+
+
+def test_extraction_failures_counted(monkeypatch):
+    monkeypatch.setattr(ingest, "extract_facts", fake_extract)
+    monkeypatch.setattr(ingest, "embed_batch", lambda client, facts: [[0.0]] * len(facts))
+    monkeypatch.setattr(ingest, "insert_memories", lambda client, facts, vectors, user_id, metadata=None: facts)
+
+    stats = ingest.ingest_texts(None, ["a", "bad 1", "b", "bad 2"], "u", batch_size=2)
+
+    assert stats["texts"] == 4
+    assert stats["failed"] == 2
+    assert stats["memories"] == 2
+
+
+@pytest.mark.parametrize("batch_size", [2, 4])
+def test_batch_failure_counts_each_text_once(monkeypatch, batch_size):
+    def fail_embed(client, facts):
+        raise RuntimeError("embedding failed")
+
+    monkeypatch.setattr(ingest, "extract_facts", fake_extract)
+    monkeypatch.setattr(ingest, "embed_batch", fail_embed)
+
+    stats = ingest.ingest_texts(None, ["a", "bad 1", "b", "bad 2"], "u", batch_size=batch_size)
+
+    assert stats["failed"] == 4
+    assert stats["memories"] == 0
+    assert any("embedding failed" in error for error in stats["errors"])
+
+
+def test_insert_memories_writes_in_batches(monkeypatch):
+    inserts, history = [], []
+    client = SimpleNamespace(
+        vector_store=SimpleNamespace(insert=lambda vectors, payloads, ids: inserts.append(len(ids))),
+        db=SimpleNamespace(add_history=lambda memory_id, old, new, event, created_at: history.append(memory_id)),
+    )
+    monkeypatch.setattr(ingest, "INSERT_BATCH_LIMIT", 2)
+
+    ids = ingest.insert_memories(client, ["a", "b", "c", "d", "e"], [[0.0]] * 5, "u", {"project": "x"})
+
+    assert inserts == [2, 2, 1]
+    assert history == ids and len(set(ids)) == 5
+
+
+def test_remember_batch_collapses_repeats():
+    result = asyncio.run(main.remember_batch(
+        ["Staging deploys need a ticket", "Staging deploys need a ticket", "staging deploys need a ticket!"],
+        raw=True, namespace="ingest-tests"))
+    stats = json.loads(result)
+    assert stats["memories"] == 1
+    assert stats["duplicates"] == 2
@@ -0,0 +1,82 @@
+import threading
+
+import main
+from lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+USER = "u"
+
+
+def build(texts, user_id=USER):
+    index = LexicalIndex()
+    index.rebuild(((f"m{i}", text, user_id) for i, text in enumerate(texts)), "g1")
+    return index
+
+
+def test_identifiers_are_kept_whole_and_split():
+    assert tokenize("Raise ERR_CONN_RESET from os.path.join") == [
+        "raise", "err_conn_reset", "err", "conn", "reset", "from", "os.path.join", "os", "path", "join",
+    ]
+    assert tokenize("getUserId") == ["getuserid", "get", "user", "id"]
+
+
+def test_exact_identifier_ranks_first():
+    index = build([
+        "The connection was reset by the peer",
+        "Retry when the client raises ERR_CONN_RESET",
+        "Reset the cache after deploys",
+    ])
+    assert [doc_id for doc_id, _ in index.search("ERR_CONN_RESET", USER)][0] == "m1"
+
+
+def test_search_is_limited_to_the_user():
+    index = build(["tabs in Makefiles"])
+    index.add("other", "tabs in Makefiles", "someone-else")
+    assert [doc_id for doc_id, _ in index.search("tabs", USER)] == ["m0"]
+
+
+def test_add_replaces_and_remove_forgets():
+    index = build(["tabs in Makefiles"])
+    index.add("m0", "spaces in Python", USER)
+    assert index.search("tabs", USER) == []
+    index.remove("m0")
+    assert index.search("spaces", USER) == [] and len(index) == 0
+
+
+def test_rebuild_replaces_contents():
+    index = build(["tabs in Makefiles"])
+    index.rebuild([("n0", "spaces in Python", USER)], "g2")
+    assert index.generation == "g2"
+    assert index.search("tabs", USER) == []
+    assert [doc_id for doc_id, _ in index.search("spaces", USER)] == ["n0"]
+
+
+def test_reciprocal_rank_fusion_prefers_agreement():
+    assert reciprocal_rank_fusion([["a", "b"], ["b", "c"]]) == ["b", "a", "c"]
+    assert reciprocal_rank_fusion([["a"], []]) == ["a"]
+
+
+def test_writes_are_not_blocked_by_a_rebuild():
+    namespace = main.get_namespace("lexical-sync-tests")
+    namespace.client()
+    namespace.generation.bump()
+    reading, release = threading.Event(), threading.Event()
+
+    def slow_rows(memories):
+        reading.set()
+        release.wait(5)
+        yield "m0", "tabs in Makefiles", namespace.user_id
+
+    rebuild = threading.Thread(target=main._sync_index,
+                               args=(namespace, namespace.lexical_index, slow_rows, "Lexical"))
+    rebuild.start()
+    assert reading.wait(5)
+    written = threading.Thread(target=main.record_write, args=(namespace,), kwargs={"added": [("m1", "spaces")]})
+    written.start()
+    written.join(2)
+    finished_during_rebuild = not written.is_alive()
+    release.set()
+    rebuild.join(5)
+
+    assert finished_during_rebuild
+    # The write landed after the rows were read, so the rebuilt index is already stale
+    assert namespace.lexical_index.generation != namespace.generation.current()
@@ -0,0 +1,64 @@
+import pytest
+from starlette.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(main.create_starlette_app(main.mcp._mcp_server))
+
+
+@pytest.mark.parametrize("body", [
+    {"metadata": ["project", "x"]},
+    {"metadata": "project=x"},
+    {"ids": "not-a-list"},
+    {"ids": [1, 2]},
+    {},
+])
+def test_delete_rejects_malformed_bodies(client, body):
+    response = client.request("DELETE", "/manager/api/memories?namespace=manager-tests", json=body)
+    assert response.status_code == 400
+    assert response.json()["success"] is False
+
+
+def test_search_rejects_malformed_metadata(client):
+    response = client.post("/manager/api/memories/search?namespace=manager-tests",
+                           json={"query": "tabs", "metadata": ["x"]})
+    assert response.status_code == 400
+
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def test_page_is_revalidated_per_content_coding(client):
+    gzipped = client.get("/manager/")
+    plain = client.get("/manager/", headers=IDENTITY)
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    assert client.get("/manager/", headers={"If-None-Match": gzipped.headers["etag"]}).status_code == 304
+    assert client.get("/manager/", headers={**IDENTITY, "If-None-Match": gzipped.headers["etag"]}).status_code == 200
+
+
+def test_small_listing_is_not_labelled_gzip(client):
+    url = "/manager/api/memories?namespace=etag-small-tests"
+    gzip_accepted = client.get(url)
+    plain = client.get(url, headers=IDENTITY)
+    # Below the gzip minimum size the body goes out uncompressed either way
+    assert "content-encoding" not in gzip_accepted.headers
+    assert gzip_accepted.headers["etag"] == plain.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": plain.headers["etag"]}).status_code == 304
+
+
+def test_listing_etag_follows_writes_and_coding(client):
+    url = "/manager/api/memories?namespace=etag-tests"
+    for i in range(20):
+        client.post(url, json={"text": f"Memory number {i} about compression and caching", "raw": True})
+    gzipped = client.get(url)
+    plain = client.get(url, headers=IDENTITY)
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": gzipped.headers["etag"]}).status_code == 304
+    client.post(url, json={"text": "One more memory", "raw": True})
+    assert client.get(url, headers={"If-None-Match": gzipped.headers["etag"]}).status_code == 200
@@ -0,0 +1,66 @@
+from starlette.testclient import TestClient
+
+import main
+from metrics import MetricsRegistry
+
+
+def test_counters_and_gauges():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ("tool",))
+    depth = registry.gauge("depth", "Queue depth")
+    calls.inc(tool="recall")
+    calls.inc(2, tool="recall")
+    calls.inc(tool="remember")
+    depth.set(1.5)
+
+    assert registry.render() == (
+        "# HELP calls_total Calls\n"
+        "# TYPE calls_total counter\n"
+        'calls_total{tool="recall"} 3\n'
+        'calls_total{tool="remember"} 1\n'
+        "# HELP depth Queue depth\n"
+        "# TYPE depth gauge\n"
+        "depth 1.5\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("tool",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, tool="recall")
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{tool="recall",le="0.1"} 1',
+        'latency_seconds_bucket{tool="recall",le="1"} 3',
+        'latency_seconds_bucket{tool="recall",le="+Inf"} 4',
+        'latency_seconds_sum{tool="recall"} 4.05',
+        'latency_seconds_count{tool="recall"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ("message",)).inc(message='bad "quote"\\\n')
+    assert 'errors_total{message="bad \\"quote\\"\\\\\\n"} 1' in registry.render()
+
+
+def test_callback_gauges_are_read_at_scrape_time():
+    registry = MetricsRegistry()
+    sizes = {("default",): 3}
+    registry.callback("store_memories", "Memories", lambda: sizes, ("namespace",))
+    registry.callback("pending", "Not ready yet", lambda: None)
+    registry.callback("broken", "Raises", lambda: 1 / 0)
+    assert 'store_memories{namespace="default"} 3' in registry.render()
+    sizes[("default",)] = 4
+    rendered = registry.render()
+    assert 'store_memories{namespace="default"} 4' in rendered
+    assert "pending" not in rendered and "broken" not in rendered
+
+
+def test_metrics_endpoint():
+    client = TestClient(main.create_starlette_app(main.mcp._mcp_server))
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MetricsRegistry.CONTENT_TYPE
+    assert "# TYPE mem0_mcp_tool_requests_total counter" in response.text
@@ -0,0 +1,24 @@
+import pytest
+
+import namespaces
+
+
+@pytest.mark.parametrize("name", [None, "", "default"])
+def test_default_namespace(name):
+    assert namespaces.validate(name) == namespaces.DEFAULT_NAMESPACE
+
+
+@pytest.mark.parametrize("name", ["bad$", "-x", "x.", "a" * 64, namespaces.DEFAULT_USER_ID])
+def test_invalid_names(name):
+    with pytest.raises(ValueError):
+        namespaces.validate(name)
+
+
+@pytest.mark.parametrize("name", ["default", "proj", "team.api-v2"])
+def test_user_id_round_trip(name):
+    assert namespaces.namespace_of_user(namespaces.user_id(name)) == name
+
+
+@pytest.mark.parametrize("name", ["default", "proj"])
+def test_collection_round_trip(name):
+    assert namespaces.namespace_of_collection(namespaces.collection_name(name)) == name
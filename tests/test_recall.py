@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+
+NAMESPACE = "recall-tests"
+TEXTS = [
+    "Use tabs for indentation in Makefiles",
+    "Indentation in Python files is four spaces",
+    "The deploy script exits with ERR_CODE_42 on timeouts",
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded():
+    async def seed():
+        for text in TEXTS:
+            await main.remember(text, raw=True, namespace=NAMESPACE)
+    asyncio.run(seed())
+
+
+def recall(query, **kwargs):
+    result = asyncio.run(main.recall(query, namespace=NAMESPACE, **kwargs))
+    assert not result.startswith("Error"), result
+    return json.loads(result)
+
+
+def test_results_carry_ids_and_scores():
+    results = recall("indentation", mode="vector")
+    assert {"id", "memory", "score", "created_at"} <= set(results[0])
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+
+def test_keyword_only_hits_have_no_score():
+    results = recall("ERR_CODE_42", mode="lexical")
+    assert [r["memory"] for r in results] == [TEXTS[2]]
+    assert results[0]["score"] is None
+
+
+@pytest.mark.parametrize("mode", ["hybrid", "vector"])
+def test_min_score_drops_unscored_and_low_scored_hits(mode):
+    everything = recall("indentation", mode=mode)
+    assert any(r["score"] is None or r["score"] < 0.99 for r in everything)
+    for result in recall("indentation", mode=mode, min_score=0.99):
+        assert result["score"] is not None and result["score"] >= 0.99
+
+
+def test_min_score_keeps_matches_above_it():
+    best = recall("Use tabs for indentation in Makefiles", mode="vector", limit=1)[0]
+    assert recall("Use tabs for indentation in Makefiles", min_score=best["score"])[0]["id"] == best["id"]
+
+
+def test_min_score_needs_semantic_mode():
+    result = asyncio.run(main.recall("indentation", mode="lexical", min_score=0.5, namespace=NAMESPACE))
+    assert result.startswith("Error")
+
+
+def test_limit():
+    assert len(recall("indentation", limit=1)) == 1
+
+
+def test_metadata_written_by_remember_can_be_filtered_and_forgotten():
+    async def scenario():
+        await main.remember("Deploys go through the staging cluster first", raw=True,
+                            namespace="metadata-tests", metadata={"project": "api", "pinned": True})
+        await main.remember("Deploys are frozen on Fridays", raw=True, namespace="metadata-tests",
+                            metadata={"project": "web"})
+        await main.remember_batch(["Deploy logs live in the ops bucket"], raw=True, namespace="metadata-tests",
+                                  metadata={"project": "api"})
+        api = json.loads(await main.recall("deploys", namespace="metadata-tests", metadata={"project": "api"}))
+        pinned = json.loads(await main.recall("deploys", namespace="metadata-tests", metadata={"pinned": True}))
+        forgotten = await main.forget(metadata={"project": "web"}, namespace="metadata-tests")
+        remaining = json.loads(await main.recall("deploys", namespace="metadata-tests", mode="vector"))
+        return api, pinned, forgotten, remaining
+
+    api, pinned, forgotten, remaining = asyncio.run(scenario())
+    assert sorted(r["memory"] for r in api) == ["Deploy logs live in the ops bucket",
+                                               "Deploys go through the staging cluster first"]
+    assert [r["memory"] for r in pinned] == ["Deploys go through the staging cluster first"]
+    assert forgotten.startswith("Successfully deleted 1")
+    assert "Deploys are frozen on Fridays" not in [r["memory"] for r in remaining]
+
+
+@pytest.mark.parametrize("metadata", [{"user_id": "x"}, {"created_ts": 1}, {"data": "x"}, {"tags": ["a"]}])
+def test_remember_rejects_reserved_or_nested_metadata(metadata):
+    result = asyncio.run(main.remember("something", raw=True, namespace="metadata-tests", metadata=metadata))
+    assert result.startswith("Error")
+
+
+def test_filtered_keyword_hits_do_not_take_result_slots():
+    async def scenario():
+        for text in ("Releases are tagged from the main branch", "Release notes are drafted in the wiki"):
+            await main.remember(text, raw=True, namespace="fusion-tests", metadata={"project": "api"})
+        for text in ("RELEASE_TOKEN rotates every month", "RELEASE_TOKEN is stored in the vault"):
+            await main.remember(text, raw=True, namespace="fusion-tests", metadata={"project": "web"})
+        return json.loads(await main.recall("RELEASE_TOKEN releases", namespace="fusion-tests", limit=2,
+                                            metadata={"project": "api"}))
+
+    results = asyncio.run(scenario())
+    assert sorted(r["memory"] for r in results) == ["Release notes are drafted in the wiki",
+                                                   "Releases are tagged from the main branch"]
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+from recall_cache import RecallCache, StoreGeneration, normalize_query
+
+
+def test_keys_ignore_spacing_but_not_case():
+    assert normalize_query("  user   id\n") == "user id"
+    assert RecallCache.make_key("user  id", "u") == RecallCache.make_key("user id", "u")
+    assert RecallCache.make_key("UserID", "u") != RecallCache.make_key("userid", "u")
+
+
+def test_entries_are_only_valid_for_their_generation():
+    cache = RecallCache()
+    cache.put(("q",), "g1", "result")
+    assert cache.get(("q",), "g1") == "result"
+    assert cache.get(("q",), "g2") is None
+    # A stale entry is dropped, not kept for the old generation
+    assert cache.get(("q",), "g1") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_expire(monkeypatch):
+    cache = RecallCache(ttl_seconds=10)
+    now = [100.0]
+    monkeypatch.setattr("recall_cache.time.monotonic", lambda: now[0])
+    cache.put(("q",), "g", "result")
+    now[0] += 11
+    assert cache.get(("q",), "g") is None
+
+
+def test_least_recently_used_entry_is_dropped():
+    cache = RecallCache(max_entries=2)
+    cache.put(("a",), "g", 1)
+    cache.put(("b",), "g", 2)
+    cache.get(("a",), "g")
+    cache.put(("c",), "g", 3)
+    assert cache.get(("b",), "g") is None
+    assert cache.get(("a",), "g") == 1
+
+
+def test_generation_changes_on_every_bump(tmp_path):
+    generation = StoreGeneration(str(tmp_path / "generation"))
+    assert generation.current() == ""
+    first = generation.bump()
+    assert generation.current() == first
+    assert generation.bump() != first
+
+
+def test_bump_in_another_process_is_seen(tmp_path):
+    path = str(tmp_path / "store" / "generation")
+    generation = StoreGeneration(path)
+    before = generation.bump()
+    subprocess.run([sys.executable, "-c",
+                    f"from recall_cache import StoreGeneration; StoreGeneration({path!r}).bump()"],
+                   cwd=ROOT, check=True)
+    assert generation.current() not in ("", before)
@@ -0,0 +1,89 @@
+import json
+import os
+import time
+
+import pytest
+
+import main
+from request_log import RequestLogWriter
+
+
+def wait_written(writer, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while writer.written < count:
+        assert time.monotonic() < deadline, writer.stats()
+        time.sleep(0.005)
+
+
+def read_entries(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_entries_are_written_on_close(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = RequestLogWriter(path, flush_interval=60)
+    for i in range(3):
+        writer.write({"n": i})
+    writer.close()
+    assert [e["n"] for e in read_entries(path)] == [0, 1, 2]
+    assert writer.stats()["written"] == 3
+
+
+def test_rotates_by_size_and_keeps_backups(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = RequestLogWriter(path, max_bytes=1, backups=2, flush_interval=0.01)
+    for i in range(4):
+        writer.write({"n": i})
+        wait_written(writer, i + 1)
+    writer.close()
+    assert [e["n"] for e in read_entries(path)] == [3]
+    assert [e["n"] for e in read_entries(path + ".1")] == [2]
+    assert [e["n"] for e in read_entries(path + ".2")] == [1]
+    assert not os.path.exists(path + ".3")
+
+
+def test_rotates_by_age(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = RequestLogWriter(path, max_bytes=0, rotate_seconds=0.05, flush_interval=0.01)
+    writer.write({"n": 0})
+    wait_written(writer, 1)
+    time.sleep(0.1)
+    writer.write({"n": 1})
+    writer.close()
+    assert [e["n"] for e in read_entries(path + ".1")] == [0]
+    assert [e["n"] for e in read_entries(path)] == [1]
+
+
+def test_sampling_always_keeps_errors(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = RequestLogWriter(path, sample_rate=0.0)
+    for i in range(5):
+        writer.write({"n": i, "error": None})
+    writer.write({"n": 5, "error": "quota exceeded"})
+    writer.close()
+    assert [e["n"] for e in read_entries(path)] == [5]
+    assert writer.stats()["sampled_out"] == 5
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    writer = RequestLogWriter(str(tmp_path / "log.jsonl"), max_queue=2, flush_interval=60)
+    writer._queue.put(None)  # stop the writer thread so nothing drains the queue
+    for i in range(5):
+        writer.write({"n": i})
+    assert writer.stats()["dropped"] >= 3
+    writer.close(timeout=0.1)
+
+
+def test_batched_embeddings_log_batch_size_and_dimension(monkeypatch):
+    genai = pytest.importorskip("google.generativeai")
+    entries = []
+    monkeypatch.setattr(main.gemini_log, "write", entries.append)
+    monkeypatch.setattr(genai, "embed_content",
+                        lambda model, content, **kwargs: {"embedding": [[0.0] * 8 for _ in content]})
+    main._patch_embed_logging()
+
+    genai.embed_content(model="m", content=["a", "b", "c"])
+
+    assert entries[-1]["output"] == {"batch_size": 3, "embedding_length": 8}
+    assert entries[-1]["bytes_out"] == 3 * 8 * 4
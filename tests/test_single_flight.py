@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from recall_cache import SingleFlight
+
+
+class Work:
+    """Async call that blocks until released and counts how often it ran"""
+
+    def __init__(self, result="result"):
+        self.result = result
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_identical_calls_share_one_run():
+    async def scenario():
+        flights, work = SingleFlight(), Work()
+        calls = [asyncio.ensure_future(flights.run(("q", "g1"), work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        work.release.set()
+        return flights, work, await asyncio.gather(*calls)
+
+    flights, work, results = asyncio.run(scenario())
+    assert results == ["result"] * 3
+    assert work.runs == 1
+    assert flights.stats() == {"calls": 1, "collapsed": 2, "in_flight": 0}
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flights, work = SingleFlight(), Work()
+        work.release.set()
+        await asyncio.gather(flights.run(("q", "g1"), work), flights.run(("q", "g2"), work))
+        # A finished flight is not reused
+        await flights.run(("q", "g1"), work)
+        return work
+
+    assert asyncio.run(scenario()).runs == 3
+
+
+def test_leader_cancellation_does_not_cancel_followers():
+    async def scenario():
+        flights, work = SingleFlight(), Work()
+        leader = asyncio.ensure_future(flights.run(("q",), work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.run(("q",), work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        work.release.set()
+        return work, await follower
+
+    work, result = asyncio.run(scenario())
+    assert result == "result"
+    assert work.runs == 1
+
+
+def test_errors_reach_every_caller():
+    async def scenario():
+        flights, work = SingleFlight(), Work(RuntimeError("search failed"))
+        calls = [asyncio.ensure_future(flights.run(("q",), work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        work.release.set()
+        return flights, await asyncio.gather(*calls, return_exceptions=True)
+
+    flights, results = asyncio.run(scenario())
+    assert [str(result) for result in results] == ["search failed"] * 2
+    assert flights.stats()["in_flight"] == 0
@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main
+from conftest import ROOT, TEST_ENV
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["--stdio"], True),
+    (["--transport", "stdio"], True),
+    (["--transport=stdio"], True),
+    (["--transport", "http"], False),
+    (["--namespace", "stdio"], False),
+    ([], False),
+])
+def test_stdio_requested(argv, expected):
+    assert main.stdio_requested(argv) is expected
+
+
+@pytest.mark.parametrize("flags", [["--stdio"], ["--transport", "stdio"]])
+def test_stdio_stdout_is_only_json_rpc(tmp_path, flags):
+    env = {**os.environ, **TEST_ENV, "MEM0_MCP_DB_PATH": str(tmp_path / "db"), "MEM0_DIR": str(tmp_path / "mem0"),
+           "MEM0_MCP_PREWARM": "1"}
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2025-03-26", "capabilities": {},
+            "clientInfo": {"name": "test", "version": "0"}}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        # Builds the mem0 client, which logs while initializing
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+         "params": {"name": "remember", "arguments": {"text": "I prefer tabs over spaces", "raw": True}}},
+    ]
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py"), *flags], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env, cwd=str(tmp_path))
+    try:
+        for message in messages:
+            process.stdin.write(json.dumps(message) + "\n")
+        process.stdin.flush()
+        responses = []
+        while len(responses) < 2:
+            line = process.stdout.readline()
+            assert line, "server exited early"
+            if line.strip():
+                responses.append(json.loads(line))  # a log line here fails to parse
+    finally:
+        process.kill()
+        process.wait()
+    assert [response.get("id") for response in responses] == [1, 2]
+    assert "Successfully" in responses[1]["result"]["content"][0]["text"]
@@ -0,0 +1,35 @@
+import pytest
+
+import store_ops
+
+
+def test_build_where_user_only():
+    assert store_ops.build_where("u") == {"user_id": "u"}
+
+
+def test_build_where_combines_metadata_and_dates():
+    where = store_ops.build_where("u", {"project": "x", "pinned": True}, after="2025-01-01T00:00:00+00:00")
+    assert where == {"$and": [
+        {"user_id": "u"},
+        {"project": "x"},
+        {"pinned": True},
+        {store_ops.CREATED_TS_KEY: {"$gte": 1735689600.0}},
+    ]}
+
+
+@pytest.mark.parametrize("metadata", [
+    ["project", "x"],
+    "project=x",
+    {"user_id": "someone_else"},
+    {"$or": "x"},
+    {"tags": ["a", "b"]},
+    {"nested": {"a": 1}},
+])
+def test_build_where_rejects_bad_metadata(metadata):
+    with pytest.raises(ValueError):
+        store_ops.build_where("u", metadata)
+
+
+def test_build_where_rejects_bad_dates():
+    with pytest.raises(ValueError):
+        store_ops.build_where("u", before="yesterday")
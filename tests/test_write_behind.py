@@ -0,0 +1,69 @@
+import json
+import threading
+import time
+
+from write_behind import WriteBehindQueue
+
+
+def run_jobs(path, jobs):
+    handled = []
+    done = threading.Event()
+
+    def handler(text, user_id, metadata):
+        handled.append((text, user_id, metadata))
+        if len(handled) == len(jobs):
+            done.set()
+
+    queue = WriteBehindQueue(str(path), handler, log=lambda *a: None)
+    queue.start()
+    ids = [queue.submit(*job) for job in jobs]
+    assert done.wait(5)
+    return queue, ids, handled
+
+
+def test_jobs_run_in_order_with_metadata(tmp_path):
+    queue, ids, handled = run_jobs(tmp_path / "journal.jsonl", [("a", "u", None), ("b", "u", {"project": "x"})])
+    queue.stop()
+    assert handled == [("a", "u", None), ("b", "u", {"project": "x"})]
+
+
+def test_pending_jobs_are_replayed_with_metadata(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text(json.dumps({"event": "queued", "job_id": "j1", "text": "a", "user_id": "u",
+                                "metadata": {"project": "x"}, "ts": "t"}) + "\n")
+    handled = []
+    done = threading.Event()
+    queue = WriteBehindQueue(str(path), lambda *job: (handled.append(job), done.set()), log=lambda *a: None)
+    queue.start()
+    assert done.wait(5)
+    queue.stop()
+    assert handled == [("a", "u", {"project": "x"})]
+
+
+def test_journal_is_compacted_while_running(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    handled = []
+    done = threading.Event()
+
+    def handler(text, user_id, metadata):
+        handled.append(text)
+        if len(handled) == 50:
+            done.set()
+
+    queue = WriteBehindQueue(str(path), handler, max_finished=3, log=lambda *a: None, compact_every=10)
+    queue.start()
+    for i in range(50):
+        queue.submit(f"text {i}", "u")
+    assert done.wait(5)
+    while queue.counts()["pending"]:
+        time.sleep(0.01)  # the last "done" record is written just after the handler returns
+    queue.stop()
+    # Pending jobs (none) + kept outcomes + records since the last compaction
+    assert len(path.read_text().splitlines()) <= 3 + 10
+
+    replayed = []
+    restarted = WriteBehindQueue(str(path), lambda *job: replayed.append(job), max_finished=3, log=lambda *a: None)
+    restarted.start()
+    restarted.stop()
+    assert replayed == []
+    assert restarted.counts()["done"] == 3
@@ -0,0 +1,203 @@
+"""
+Write-behind queue for `remember`.
+
+Accepted texts are appended to an on-disk JSONL journal (fsync'd) before the
+caller gets a job id back, and a single background worker drains them into mem0
+in submission order. On restart the journal is replayed, so jobs that were
+accepted but not finished are picked up again. Delivery is at-least-once: a
+crash between a successful mem0 write and its "done" record re-runs that job.
+The journal is compacted down to pending jobs and recent outcomes at startup and
+every `compact_every` records, so it stays small on a long-running server.
+"""
+
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class WriteBehindQueue:
+    """Journal-backed FIFO of pending `remember` jobs with a background worker"""
+
+    def __init__(self, journal_path: str, handler, max_finished: int = 1000, log=print,
+                 compact_every: int = 1000):
+        """
+        Args:
+            journal_path: JSONL file used to persist accepted jobs and their outcome
+            handler: callable(text, user_id, metadata) that performs the actual mem0 write
+            max_finished: number of finished jobs whose status is kept for lookups
+            log: logging function (main.py passes log_print)
+            compact_every: journal records to append before compacting it again
+        """
+        self.journal_path = journal_path
+        self.handler = handler
+        self.max_finished = max_finished
+        self.compact_every = max(1, compact_every)
+        self.log = log
+        self._jobs = OrderedDict()  # job_id -> status dict (without text)
+        self._pending = OrderedDict()  # job_id -> (text, user_id, metadata), for compaction
+        self._appended = 0  # records appended since the last compaction
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._journal = None
+
+    def start(self):
+        """Replay the journal, compact it and start the worker thread"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            pending = self._replay()
+            for job_id, *job in pending:
+                self._pending[job_id] = tuple(job)
+            self._compact()
+            for job in pending:
+                self._queue.put(job)
+            self._thread = threading.Thread(target=self._run, name="remember-write-behind", daemon=True)
+            self._thread.start()
+        if pending:
+            self.log(f"[WriteBehind] Resuming {len(pending)} pending job(s) from {self.journal_path}")
+
+    def stop(self):
+        """Stop the worker after the current job; pending jobs stay in the journal"""
+        self._stop.set()
+        self._queue.put(None)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def submit(self, text: str, user_id: str, metadata: dict = None) -> str:
+        """Durably enqueue a text (with optional metadata for its memories) and return its job id"""
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        with self._lock:
+            if self._journal is None:
+                raise RuntimeError("write-behind queue is not running")
+            self._append(self._queued_record(job_id, text, user_id, metadata, now))
+            self._jobs[job_id] = {"job_id": job_id, "status": PENDING, "queued_at": now}
+            self._pending[job_id] = (text, user_id, metadata)
+        self._queue.put((job_id, text, user_id, metadata))
+        return job_id
+
+    def status(self, job_id: str):
+        """Status dict for a job, or None if it is unknown (or long finished)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def counts(self) -> dict:
+        """Number of known jobs per status"""
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+        return counts
+
+    def _run(self):
+        while not self._stop.is_set():
+            item = self._queue.get()
+            if item is None:
+                break
+            job_id, text, user_id, metadata = item
+            try:
+                self.handler(text, user_id, metadata)
+                self._finish(job_id, DONE)
+            except Exception as e:
+                self.log(f"[WriteBehind] Job {job_id} failed: {e}")
+                self._finish(job_id, FAILED, error=str(e))
+
+    def _finish(self, job_id: str, status: str, error: str = None):
+        now = datetime.now().isoformat()
+        with self._lock:
+            if self._journal is None:
+                return  # stopped mid-job; the job stays pending in the journal
+            record = {"event": status, "job_id": job_id, "ts": now}
+            if error:
+                record["error"] = error
+            self._append(record)
+            job = self._jobs.setdefault(job_id, {"job_id": job_id})
+            job.update({"status": status, "finished_at": now})
+            if error:
+                job["error"] = error
+            self._jobs.move_to_end(job_id)
+            self._pending.pop(job_id, None)
+            self._trim()
+            if self._appended >= self.compact_every:
+                self._compact()
+
+    @staticmethod
+    def _queued_record(job_id: str, text: str, user_id: str, metadata: dict, ts: str) -> dict:
+        record = {"event": "queued", "job_id": job_id, "text": text, "user_id": user_id, "ts": ts}
+        if metadata:
+            record["metadata"] = metadata
+        return record
+
+    def _append(self, record: dict):
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._appended += 1
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] != PENDING]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _replay(self) -> list:
+        """Rebuild job state from the journal and return pending jobs in order"""
+        texts = OrderedDict()
+        if not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash mid-write
+                job_id = record.get("job_id")
+                event = record.get("event")
+                if event == "queued":
+                    texts[job_id] = (record["text"], record.get("user_id"), record.get("metadata"))
+                    self._jobs[job_id] = {"job_id": job_id, "status": PENDING, "queued_at": record.get("ts")}
+                elif event in (DONE, FAILED):
+                    texts.pop(job_id, None)
+                    job = self._jobs.setdefault(job_id, {"job_id": job_id})
+                    job.update({"status": event, "finished_at": record.get("ts")})
+                    if record.get("error"):
+                        job["error"] = record["error"]
+                    self._jobs.move_to_end(job_id)
+        self._trim()
+        return [(job_id, *job) for job_id, job in texts.items()]
+
+    def _compact(self):
+        """Rewrite the journal with only pending jobs and recent outcomes, and reopen it (lock held)"""
+        if self._journal is not None:
+            self._journal.close()
+        directory = os.path.dirname(os.path.abspath(self.journal_path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for job_id, (text, user_id, metadata) in self._pending.items():
+                record = self._queued_record(job_id, text, user_id, metadata, self._jobs[job_id].get("queued_at"))
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            for job_id, job in self._jobs.items():
+                if job_id in self._pending:
+                    continue
+                record = {"event": job["status"], "job_id": job_id, "ts": job.get("finished_at")}
+                if job.get("error"):
+                    record["error"] = job["error"]
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._appended = 0